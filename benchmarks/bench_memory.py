@@ -0,0 +1,58 @@
+"""Per-object memory of the slotted game dataclasses vs. plain dataclasses.
+
+Run with: PYTHONPATH=src python benchmarks/bench_memory.py
+"""
+from dataclasses import fields, make_dataclass
+import tracemalloc
+
+from codexrpg.events import EventType, WorldEvent
+from codexrpg.item import Item
+from codexrpg.quest import Quest
+from codexrpg.reputation import Faction, FactionReputation
+from codexrpg.skills import Skill
+
+N = 100_000
+
+SAMPLES = {
+    Item: lambda i: Item(f"item_{i}", "Thing"),
+    WorldEvent: lambda i: WorldEvent(f"event_{i}", EventType.FESTIVAL, "t", "d", "town"),
+    Quest: lambda i: Quest(f"quest_{i}", "t", "d", "npc", "o"),
+    Skill: lambda i: Skill(f"skill_{i}", "Skill"),
+    FactionReputation: lambda i: FactionReputation(Faction.ROYAL_GUARD),
+}
+
+
+def unslotted(cls):
+    """Same fields as ``cls`` but with a regular per-instance __dict__."""
+    return make_dataclass(cls.__name__ + "Dict", [(f.name, f.type) for f in fields(cls)])
+
+
+def bytes_per_object(factory) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(N)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return total / N
+
+
+def main():
+    print(f"{'class':<20}{'dict':>10}{'slots':>10}{'saved':>10}")
+    for cls, make in SAMPLES.items():
+        plain = unslotted(cls)
+        plain_make = lambda i, make=make, plain=plain: plain(
+            **{f.name: getattr(make(i), f.name) for f in fields(cls)}
+        )
+        slotted = bytes_per_object(make)
+        regular = bytes_per_object(plain_make)
+        print(f"{cls.__name__:<20}{regular:>10.0f}{slotted:>10.0f}{regular - slotted:>10.0f}")
+
+    # Interned prototypes cost nothing per copy held
+    potion = SAMPLES[Item](0)
+    print(f"{'Item (interned)':<20}{'':>10}{bytes_per_object(lambda i: potion):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
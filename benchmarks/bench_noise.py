@@ -0,0 +1,47 @@
+"""Noise engine throughput in pixels per second.
+
+Run with: PYTHONPATH=src python benchmarks/bench_noise.py [size]
+"""
+import sys
+import time
+
+from codexrpg import noise
+from codexrpg.worldgen import WorldGenerator
+
+OCTAVES = 4
+REPEATS = 3
+
+
+def best_of(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    pixels = size * size
+    xs, ys = noise.grid_points(size, size, 0, size, 4)
+    print(f"{size}x{size}, {OCTAVES} octaves")
+    print(f"{'variant':<28}{'Mpx/s':>10}{'ms':>10}")
+
+    def report(name, seconds):
+        print(f"{name:<28}{pixels / seconds / 1e6:>10.3f}{seconds * 1000:>10.1f}")
+
+    report("worldgen value (original)", best_of(
+        lambda: WorldGenerator(size, size, seed=1).elevation_map(octaves=OCTAVES)))
+    for name in noise.ENGINES:
+        engine = noise.make_engine(name, 1)
+        report(f"{name} single octave", best_of(lambda: engine.sample(xs, ys)))
+        for fractal in noise.FRACTALS:
+            report(f"{name} {fractal}", best_of(
+                lambda: noise.field(engine, xs, ys, OCTAVES, fractal=fractal)))
+        report(f"{name} fbm + warp", best_of(
+            lambda: noise.field(engine, xs, ys, OCTAVES, warp_strength=1.5)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,28 @@
 """CodexRPG package."""
 __version__ = "0.1.0"
-from .game import Game
+
+# Submodules load on first attribute access (PEP 562) so that importing
+# the package, or running a light CLI command, doesn't pull in every system.
+_LAZY = {
+    "Game": ".game",
+    "Player": ".player",
+    "World": ".world",
+    "WorldGenerator": ".worldgen",
+}
+
+__all__ = ["__version__", *_LAZY]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,99 @@
+"""Player actions shared by the web API's single and batch endpoints."""
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .item import get_item
+
+MAX_BATCH_ACTIONS = 100
+
+
+class ActionError(Exception):
+    """An action was rejected; the message is safe to show the player."""
+
+
+def _gather(player, params: dict) -> dict:
+    player.add_gold(10)
+    player.add_item(get_item('resource_gathered'))
+    return {'success': True, 'message': 'Gathered resources!', 'gold': player.gold}
+
+
+def _rest(player, params: dict) -> dict:
+    player.hp = player.max_hp
+    return {'success': True, 'message': 'Fully rested!', 'hp': player.hp}
+
+
+def _check_store_inventory(player, params: dict):
+    homestead_id = params.get('homestead_id')
+    if homestead_id and not player.homesteads.get_homestead(homestead_id):
+        raise ActionError(f'Unknown homestead {homestead_id!r}')
+
+
+def _store_inventory(player, params: dict) -> dict:
+    moved = player.store_inventory(params.get('homestead_id'))
+    return {'success': True, 'message': f'Stored {moved} items at home.', 'stored': moved}
+
+
+def _trigger_event(player, params: dict) -> dict:
+    event = player.events.random_event()
+    return {
+        'success': True,
+        'event': {
+            'title': event.title,
+            'description': event.description,
+            'reward': event.reward
+        }
+    }
+
+
+# action name -> handler(player, params) -> result; handlers never fail
+ACTIONS: Dict[str, Callable[..., dict]] = {
+    'gather': _gather,
+    'rest': _rest,
+    'store_inventory': _store_inventory,
+    'trigger_event': _trigger_event,
+}
+
+# action name -> check(player, params); raises ActionError if the action
+# would be rejected. Checks must not depend on earlier actions in a batch.
+CHECKS: Dict[str, Callable[..., None]] = {
+    'store_inventory': _check_store_inventory,
+}
+
+
+def _check(player, action: str, params: dict) -> Callable[..., dict]:
+    handler = ACTIONS.get(action)
+    if handler is None:
+        raise ActionError('Unknown action')
+    check = CHECKS.get(action)
+    if check is not None:
+        check(player, params)
+    return handler
+
+
+def perform_action(player, action: str, params: Optional[dict] = None) -> dict:
+    """Apply one action to ``player`` and return its result."""
+    params = params or {}
+    return _check(player, action, params)(player, params)
+
+
+def perform_batch(player, actions: List[dict]) -> Tuple[List[dict], Optional[int]]:
+    """Apply ``actions`` to ``player`` in order, all or nothing.
+
+    Each entry is ``{"action": name, **params}``. Every action is checked
+    before any is applied, and handlers cannot fail once checked, so the
+    live player is either changed by the whole batch or not at all.
+    Returns (results, failed_index); on failure nothing was applied and
+    the failing entry holds the error.
+    """
+    if len(actions) > MAX_BATCH_ACTIONS:
+        raise ActionError(f'At most {MAX_BATCH_ACTIONS} actions per batch')
+    steps = []
+    for index, entry in enumerate(actions):
+        try:
+            if not isinstance(entry, dict):
+                raise ActionError('Each action must be an object')
+            params = dict(entry)
+            steps.append((_check(player, params.pop('action', None), params), params))
+        except ActionError as e:
+            skipped = {'success': False, 'error': f'Not applied: action {index} was rejected'}
+            return [skipped] * index + [{'success': False, 'error': str(e)}], index
+    return [handler(player, params) for handler, params in steps], None
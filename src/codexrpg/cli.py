@@ -1,18 +1,9 @@
-import argparse
-from .game import Game
+"""Command line interface.
 
+Only argparse is imported up front; each subcommand imports the game
+modules it needs, so ``--help`` and simple listings start instantly.
+"""
 import argparse
-from .game import Game
-from .world import World
-from .player import Player
-from .item import Item, ItemType, ItemRarity
-from .character_class import list_classes, get_class_by_id
-from .npc import list_npcs, get_npc, NPCRole
-from .quest import Quest
-from .crafting import GatheringSystem, CraftingSystem, HEALING_RECIPE
-from .reputation import Faction
-from .events import EventType
-from .homestead import HomesteadType
 
 
 def main():
@@ -21,17 +12,28 @@ def main():
 
     start = sub.add_parser("start", help="Start the game")
     start.add_argument("--title", default="CodexRPG")
+    start.add_argument("--ticks", type=int, help="Run the simulation for this many ticks")
+    start.add_argument("--tick-rate", type=float, default=20.0)
 
     gen = sub.add_parser("gen-world", help="Generate a world")
     gen.add_argument("--width", type=int)
     gen.add_argument("--height", type=int)
     gen.add_argument("--seed")
+    gen.add_argument("--out", metavar="PATH",
+                     help="Write a noise-generated world file (memory-mapped, any size) instead of printing")
+    gen.add_argument("--noise", default="value", choices=("value", "gradient", "simplex"),
+                     help="Noise engine for --out")
+    gen.add_argument("--fractal", default="fbm", choices=("fbm", "ridged"))
+    gen.add_argument("--warp", type=float, default=0.0, help="Domain warp strength for --out")
+    gen.add_argument("--climate", action="store_true",
+                     help="Classify --out biomes by temperature and moisture too")
 
     classes = sub.add_parser("classes", help="List available character classes")
 
     player = sub.add_parser("create-player", help="Create a player")
     player.add_argument("name", nargs="?", default="Hero")
-    player.add_argument("--class", dest="character_class", choices=list(list_classes().keys()), default="warrior")
+    player.add_argument("--class", dest="character_class", default="warrior",
+                        help="warrior, mage, rogue, paladin or a content-pack class")
 
     npcs = sub.add_parser("npcs", help="List NPCs in the world")
 
@@ -66,27 +68,60 @@ def main():
     # New: Homes list
     homes = sub.add_parser("homes", help="List all homesteads")
 
+    shell = sub.add_parser("shell", help="Interactive session that keeps game state between commands")
+    shell.add_argument("--name", default="Hero")
+    shell.add_argument("--class", dest="character_class", default="warrior")
+    shell.add_argument("--seed")
+    shell.add_argument("--load", metavar="PATH", help="Resume from a save file")
+    shell.add_argument("--save", metavar="PATH", help="Save here on exit")
+    shell.add_argument("--script", metavar="FILE", help="Run commands from FILE ('-' for stdin)")
+    shell.add_argument("--echo", action="store_true", help="Echo script commands before their output")
+    shell.add_argument("--quiet", action="store_true", help="Suppress script output; print a summary")
+    shell.add_argument("--record", metavar="PATH", help="Record every command for later replay")
+
+    replay = sub.add_parser("replay", help="Re-run a recorded shell session headlessly")
+    replay.add_argument("path")
+    replay.add_argument("--stop", action="store_true", help="Stop at the first diverging command")
+
     save = sub.add_parser("save", help="Save a minimal game state")
     save.add_argument("path", nargs="?", default="save.json")
 
     args = parser.parse_args()
 
     if args.cmd == "start":
-        g = Game(args.title)
+        from .game import Game
+        g = Game(args.title, tick_rate=args.tick_rate)
         print(g.start())
+        if args.ticks:
+            from .player import Player
+            g.attach_player(Player())
+            g.run(max_ticks=args.ticks)
+            stats = g.get_stats()
+            print(f"Ran {stats['ticks']} ticks (avg {stats['tick_ms_avg']:.3f} ms, "
+                  f"max {stats['tick_ms_max']:.3f} ms, dropped {stats['dropped_ticks']})")
+    elif args.cmd == "gen-world" and args.out:
+        from .worldgen import WorldGenerator
+        width, height = args.width or 64, args.height or 64
+        WorldGenerator(width, height, seed=args.seed).generate_to(
+            args.out, noise=args.noise, fractal=args.fractal, warp=args.warp, climate=args.climate)
+        print(f"World {width}x{height} written to {args.out}")
     elif args.cmd == "gen-world":
+        from .world import World
         w = World(width=args.width, height=args.height)
         grid = w.generate(seed=args.seed)
         print("World generated:")
         for row in grid:
             print(" ".join(row))
     elif args.cmd == "classes":
+        from .character_class import list_classes
+        _load_packs()
         print("Available Character Classes:")
         for class_id, cls in list_classes().items():
             print(f"  {class_id.upper()}: {cls.name} - {cls.description}")
             print(f"    HP: {cls.base_hp}, DMG: {cls.base_damage}, DEF: {cls.base_defense}")
     elif args.cmd == "create-player":
-        char_class = get_class_by_id(args.character_class)
+        from .player import Player
+        char_class = _resolve_class(parser, args.character_class)
         p = Player(args.name, character_class=char_class)
         info = p.get_info()
         print(f"Player created: {p.name}")
@@ -94,11 +129,13 @@ def main():
         print(f"  HP: {p.max_hp}, DMG: {p.damage}, DEF: {p.defense}, Gold: {p.gold}")
         print(f"  Skills: {', '.join([s.name for s in p.skill_tree.list_skills()])}")
     elif args.cmd == "npcs":
+        from .npc import list_npcs
         print("NPCs in the world:")
         for npc_id, npc in list_npcs().items():
             print(f"  [{npc_id}] {npc.name} ({npc.role.value})")
             print(f"      Location: {npc.location} | {npc.dialogue}")
     elif args.cmd == "talk-npc":
+        from .npc import get_npc
         npc = get_npc(args.npc_id)
         if npc:
             print(f"{npc.name}: {npc.talk()}")
@@ -120,6 +157,7 @@ def main():
         print(f"Crafting {args.recipe_id}...")
         print("  Success! You crafted an item.")
     elif args.cmd == "reputation":
+        from .reputation import Faction
         print("Faction Reputation:")
         for faction in Faction:
             print(f"  {faction.value}: [Neutral]")
@@ -151,6 +189,19 @@ def main():
         print("Your Homesteads:")
         print("  1. Cozy Cottage (cottage) @ village - Level 1")
         print("  2. Mountain Tower (tower) @ mountains - Level 2")
+    elif args.cmd == "shell":
+        _run_shell(parser, args)
+    elif args.cmd == "replay":
+        from .replay import replay
+        _load_packs()  # recordings may use content-pack classes
+        result = replay(args.path, stop_on_mismatch=args.stop)
+        rate = result.commands / result.elapsed if result.elapsed else float("inf")
+        print(f"Replayed {result.commands} commands in {result.elapsed:.3f}s ({rate:.0f}/s)")
+        if result.ok:
+            print("All outputs match the recording.")
+        else:
+            print(f"{len(result.mismatches)} commands diverged, first at #{result.mismatches[0] + 1}")
+            raise SystemExit(1)
     elif args.cmd == "save":
         from .save import save_game
         state = {"note": "minimal save"}
@@ -160,5 +211,62 @@ def main():
         parser.print_help()
 
 
+def _load_packs():
+    """Apply content packs so their classes resolve like the built-in ones."""
+    from .content import load_content_packs
+    load_content_packs()
+
+
+def _resolve_class(parser, class_id: str):
+    from .character_class import get_class_by_id, list_classes
+    _load_packs()
+    char_class = get_class_by_id(class_id)
+    if char_class is None:
+        parser.error(f"unknown class {class_id!r} (choose from {', '.join(list_classes())})")
+    return char_class
+
+
+def _run_shell(parser, args):
+    import sys
+    import time
+    from .session import Session
+
+    if args.load:
+        if args.record:
+            parser.error("--record needs a fresh session, not --load")
+        _load_packs()  # the save may name a content-pack class
+        try:
+            session = Session.load(args.load)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"could not load {args.load}: {e}")
+    else:
+        char_class = _resolve_class(parser, args.character_class)
+        session = Session(seed=args.seed, name=args.name, character_class=char_class)
+    if args.save:
+        session.save_path = args.save
+    recording = None
+    if args.record:
+        from .replay import ActionRecorder
+        recording = open(args.record, "w", encoding="utf-8")
+        ActionRecorder.for_session(recording, session)
+
+    if args.script:
+        started = time.perf_counter()
+        if args.script == "-":
+            count = session.run_script(sys.stdin, echo=args.echo, out=None if args.quiet else print)
+        else:
+            with open(args.script, encoding="utf-8") as f:
+                count = session.run_script(f, echo=args.echo, out=None if args.quiet else print)
+        if args.quiet:
+            elapsed = time.perf_counter() - started
+            print(f"Ran {count} commands in {elapsed:.3f}s")
+    else:
+        session.interact()
+    if recording is not None:
+        recording.close()
+    if args.save:
+        print(session.cmd_save(args.save))
+
+
 if __name__ == "__main__":
     main()
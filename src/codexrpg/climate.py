@@ -0,0 +1,146 @@
+"""Biome classification through precomputed lookup tables.
+
+Each layer (elevation, temperature, moisture) is quantized to a small
+integer per tile and the integers are combined into one index into a
+flat table built once at import, so classifying a tile costs one
+quantization per layer and one lookup whatever the number of biomes.
+Adding biomes, or reshaping the diagram, only changes the tables.
+
+Elevation alone reproduces the original four threshold biomes. With
+climate, land is classified on a simplified Whittaker diagram of
+temperature against moisture, with temperature falling with altitude
+(the lapse is baked into the table per elevation level).
+"""
+from typing import List, Sequence, Tuple
+
+SEA_LEVEL = 0.25
+HIGHLAND = 0.45
+MOUNTAIN = 0.75
+ELEVATION_LEVELS = 100  # thresholds above are multiples of 1/ELEVATION_LEVELS
+CLIMATE_LEVELS = 20  # temperature and moisture bins each; diagram thresholds are multiples of 1/20
+LAPSE_RATE = 0.6  # temperature lost per unit of elevation above HIGHLAND
+LATITUDE_WEIGHT = 0.4  # share of temperature set by distance from the equator (middle row)
+CONTRAST = 1.8  # widens fbm output, which clusters around 0.5, to use the whole table
+
+BIOMES = ("water", "plains", "forest", "mountain")
+CLIMATE_BIOMES = ("water", "mountain", "snow", "tundra", "taiga", "plains", "forest", "swamp",
+                  "desert", "savanna", "rainforest")
+
+
+def classify_elevation(e: float) -> str:
+    if e < SEA_LEVEL:
+        return "water"
+    elif e < HIGHLAND:
+        return "plains"
+    elif e < MOUNTAIN:
+        return "forest"
+    return "mountain"
+
+
+def whittaker(t: float, m: float) -> str:
+    """Land biome for temperature and moisture in [0, 1]."""
+    if t < 0.15:
+        return "snow"
+    if t < 0.35:
+        return "tundra" if m < 0.4 else "taiga"
+    if t < 0.7:
+        if m < 0.15:
+            return "desert"
+        if m < 0.45:
+            return "plains"
+        return "forest" if m < 0.8 else "swamp"
+    if m < 0.3:
+        return "desert"
+    return "savanna" if m < 0.55 else "rainforest"
+
+
+def _classify_cooled(e: float, t: float, m: float) -> str:
+    if e < SEA_LEVEL:
+        return "water"
+    if e >= MOUNTAIN:
+        return "snow" if t < 0.15 else "mountain"
+    return whittaker(t, m)
+
+
+def classify_climate(e: float, t: float, m: float) -> str:
+    """Reference classifier for one tile; the climate table samples it per bin."""
+    if e > HIGHLAND:
+        t -= LAPSE_RATE * (e - HIGHLAND)
+    return _classify_cooled(e, t, m)
+
+
+_E = ELEVATION_LEVELS + 1  # int(e * ELEVATION_LEVELS) reaches ELEVATION_LEVELS at e == 1.0
+_C = CLIMATE_LEVELS
+
+# int(e * ELEVATION_LEVELS) -> index into BIOMES
+ELEVATION_LUT = bytes(BIOMES.index(classify_elevation(q / ELEVATION_LEVELS)) for q in range(_E))
+
+
+def _climate_entry(index: int) -> str:
+    eq, rest = divmod(index, _C * _C)
+    tq, mq = divmod(rest, _C)
+    # Lower bin edges, so every threshold falls exactly on a bin boundary
+    e = eq / ELEVATION_LEVELS
+    t = tq / CLIMATE_LEVELS
+    if e > HIGHLAND:
+        t -= LAPSE_RATE * (e - HIGHLAND)
+    return _classify_cooled(e, t, mq / CLIMATE_LEVELS)
+
+
+# (eq * _C + tq) * _C + mq -> index into CLIMATE_BIOMES
+CLIMATE_LUT = bytes(CLIMATE_BIOMES.index(_climate_entry(i)) for i in range(_E * _C * _C))
+
+_ELEVATION_BASES = tuple(eq * _C * _C for eq in range(_E))
+
+# The same tables resolved to biome names, for callers that want names per tile
+ELEVATION_NAMES = tuple(BIOMES[i] for i in ELEVATION_LUT)
+CLIMATE_NAMES = tuple(CLIMATE_BIOMES[i] for i in CLIMATE_LUT)
+
+
+def elevation_biomes(row: Sequence[float]) -> List[str]:
+    """Biomes for a row of elevations in [0, 1]."""
+    names, levels = ELEVATION_NAMES, ELEVATION_LEVELS
+    return [names[int(e * levels)] for e in row]
+
+
+def climate_biomes(elevation: Sequence[float], temperature: Sequence[int],
+                   moisture: Sequence[int]) -> List[str]:
+    """Biomes for one row: elevation in [0, 1], temperature and moisture as levels."""
+    names, bases, levels, n = CLIMATE_NAMES, _ELEVATION_BASES, ELEVATION_LEVELS, CLIMATE_LEVELS
+    return [names[bases[int(e * levels)] + t * n + m] for e, t, m in zip(elevation, temperature, moisture)]
+
+
+# Noise is quantized straight to levels: int(x * levels + _OFFSET) is
+# always positive for the stretched range, and _CLAMP folds the overflow
+# back to the end levels, so no per-tile min/max calls are needed.
+_OFFSET = 2 * CLIMATE_LEVELS
+_CLAMP = tuple(min(CLIMATE_LEVELS - 1, max(0, q - _OFFSET)) for q in range(5 * CLIMATE_LEVELS))
+
+
+def latitude(y: int, height: int) -> float:
+    """1.0 on the middle row (equator), 0.0 at the top and bottom edges."""
+    if height <= 1:
+        return 1.0
+    return 1.0 - abs(2.0 * y / (height - 1) - 1.0)
+
+
+def moisture_levels(noise_row: Sequence[float]) -> List[int]:
+    """Moisture levels for fbm noise in [0, 1], widened by CONTRAST."""
+    n, k = CLIMATE_LEVELS, CONTRAST
+    a, b = k * n, (0.5 - 0.5 * k) * n + _OFFSET
+    clamp = _CLAMP
+    return [clamp[int(v * a + b)] for v in noise_row]
+
+
+def temperature_levels(noise_row: Sequence[float], y: int, height: int) -> List[int]:
+    """Temperature levels: LATITUDE_WEIGHT from the row's latitude, the rest from noise."""
+    n, k = CLIMATE_LEVELS, CONTRAST
+    keep = 1.0 - LATITUDE_WEIGHT
+    warmth = latitude(y, height) * LATITUDE_WEIGHT
+    a, b = keep * k * n, (warmth + keep * (0.5 - 0.5 * k)) * n + _OFFSET
+    clamp = _CLAMP
+    return [clamp[int(v * a + b)] for v in noise_row]
+
+
+def palette_for(climate: bool) -> Tuple[str, ...]:
+    return CLIMATE_BIOMES if climate else BIOMES
@@ -1,3 +1,9 @@
+from typing import TYPE_CHECKING
+import os
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
 DEFAULT_CONFIG = {
     "world": {
         "width": 10,
@@ -8,3 +14,17 @@ DEFAULT_CONFIG = {
         "max_hp": 100
     }
 }
+
+
+def cache_dir() -> "Path":
+    """Directory for compiled content and other rebuildable caches.
+
+    ``CODEXRPG_CACHE_DIR`` overrides the default of ``$XDG_CACHE_HOME/codexrpg``.
+    """
+    from pathlib import Path  # deferred: keeps light imports of config fast
+
+    override = os.environ.get("CODEXRPG_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "codexrpg"
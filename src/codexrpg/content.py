@@ -0,0 +1,245 @@
+"""Data-driven content packs.
+
+A pack is a directory holding any of ``skills``, ``classes``, ``npcs``,
+``recipes`` and ``events`` as ``.json`` or ``.toml`` files. Packs are
+validated once and compiled into game objects, which are pickled into the
+cache directory under a hash of the pack's files. Later starts with
+unchanged files skip parsing and validation and just unpickle.
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import os
+import pickle
+
+from .character_class import CLASSES, CharacterClass
+from .config import cache_dir
+from .crafting import RECIPES, Recipe
+from .events import EVENT_DETAILS, EventType
+from .item import ITEMS
+from .npc import NPC, NPCS, NPCRole, register_npc
+from .reputation import Faction
+from .skills import Skill, WARRIOR_SKILLS, MAGE_SKILLS, ROGUE_SKILLS, PALADIN_SKILLS
+
+COMPILER_VERSION = 1  # bump when compiled output changes shape
+SECTIONS = ("skills", "classes", "npcs", "recipes", "events")
+PACKS_DIR = Path(__file__).resolve().parent / "data" / "packs"
+
+BUILTIN_SKILLS = {s.id: s for s in WARRIOR_SKILLS + MAGE_SKILLS + ROGUE_SKILLS + PALADIN_SKILLS}
+
+
+class ContentError(ValueError):
+    """Raised when a content pack fails validation."""
+
+
+@dataclass
+class ContentPack:
+    """Compiled, ready-to-apply content."""
+    name: str
+    digest: str
+    skills: Dict[str, Skill] = field(default_factory=dict)
+    classes: Dict[str, CharacterClass] = field(default_factory=dict)
+    npcs: Dict[str, NPC] = field(default_factory=dict)
+    recipes: Dict[str, Recipe] = field(default_factory=dict)
+    events: Dict[EventType, Tuple[str, str, int]] = field(default_factory=dict)
+
+
+def _section_files(path: Path) -> List[Path]:
+    files = []
+    for section in SECTIONS:
+        for ext in (".json", ".toml"):
+            candidate = path / (section + ext)
+            if candidate.is_file():
+                files.append(candidate)
+    return files
+
+
+def pack_digest(path: Path) -> str:
+    """Hash of the compiler version plus every section file's name and bytes."""
+    h = hashlib.sha256(f"codexrpg-content-{COMPILER_VERSION}".encode())
+    for file in _section_files(path):
+        h.update(file.name.encode())
+        h.update(file.read_bytes())
+    return h.hexdigest()
+
+
+def _read(file: Path) -> list:
+    if file.suffix == ".toml":
+        import tomllib
+
+        with open(file, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(file, encoding="utf-8") as f:
+            data = json.load(f)
+    entries = data.get(file.stem, []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ContentError(f"{file.name}: expected a list of {file.stem}")
+    return entries
+
+
+class _Validator:
+    def __init__(self, pack: str):
+        self.pack = pack
+        self.errors: List[str] = []
+
+    def require(self, section: str, entry: dict, *keys: str) -> bool:
+        missing = [k for k in keys if k not in entry]
+        if missing:
+            self.errors.append(f"{self.pack}/{section}: {entry.get('id', '?')} missing {', '.join(missing)}")
+        return not missing
+
+    def number(self, section: str, entry_id: str, entry: dict, key: str, default, kind=int):
+        try:
+            return kind(entry.get(key, default))
+        except (TypeError, ValueError):
+            self.errors.append(f"{self.pack}/{section}: {entry_id} has non-numeric {key} {entry[key]!r}")
+            return default
+
+    def enum(self, section: str, entry_id: str, enum_cls, value):
+        try:
+            return enum_cls(value)
+        except ValueError:
+            self.errors.append(f"{self.pack}/{section}: {entry_id} has unknown {enum_cls.__name__} {value!r}")
+            return None
+
+
+def compile_pack(path: Path) -> ContentPack:
+    """Parse and validate a pack directory; raises ContentError on problems."""
+    path = Path(path)
+    raw = {section: [] for section in SECTIONS}
+    for file in _section_files(path):
+        raw[file.stem].extend(_read(file))
+
+    pack = ContentPack(path.name, pack_digest(path))
+    check = _Validator(path.name)
+
+    for entry in raw["skills"]:
+        if check.require("skills", entry, "id", "name"):
+            damage, defense, cost = (check.number("skills", entry["id"], entry, key, 0)
+                                     for key in ("damage_bonus", "defense_bonus", "cost"))
+            pack.skills[entry["id"]] = Skill(
+                entry["id"], entry["name"], entry.get("description", ""), damage, defense, cost,
+            )
+
+    known_skills = {**BUILTIN_SKILLS, **pack.skills}
+    for entry in raw["classes"]:
+        if not check.require("classes", entry, "id", "name"):
+            continue
+        skills = []
+        for skill_id in entry.get("starting_skills", []):
+            if skill_id in known_skills:
+                skills.append(known_skills[skill_id])
+            else:
+                check.errors.append(f"{path.name}/classes: {entry['id']} references unknown skill {skill_id!r}")
+        pack.classes[entry["id"]] = CharacterClass(
+            entry["id"], entry["name"], entry.get("description", ""),
+            check.number("classes", entry["id"], entry, "base_hp", 100),
+            check.number("classes", entry["id"], entry, "base_damage", 10),
+            check.number("classes", entry["id"], entry, "base_defense", 5), skills,
+        )
+
+    for entry in raw["npcs"]:
+        if not check.require("npcs", entry, "id", "name", "role"):
+            continue
+        role = check.enum("npcs", entry["id"], NPCRole, entry["role"])
+        faction = check.enum("npcs", entry["id"], Faction, entry["faction"]) if "faction" in entry else None
+        if role is None:
+            continue
+        npc = NPC(
+            entry["id"], entry["name"], role,
+            location=entry.get("location", "town"),
+            dialogue=entry.get("dialogue", "Hello, traveler!"),
+            buy_prices=dict(entry.get("buy_prices", {})),
+            faction=faction,
+            position=tuple(entry["position"]) if "position" in entry else None,
+        )
+        for stock in entry.get("stock", []):
+            item = ITEMS.get(stock.get("item", ""))
+            if item is None:
+                check.errors.append(f"{path.name}/npcs: {entry['id']} stocks unknown item {stock.get('item')!r}")
+                continue
+            npc.stock_item(item, check.number("npcs", entry["id"], stock, "quantity", 1),
+                           restock_interval=check.number("npcs", entry["id"], stock, "restock_interval",
+                                                         3600.0, float))
+        pack.npcs[npc.id] = npc
+
+    for entry in raw["recipes"]:
+        if not check.require("recipes", entry, "id", "name", "ingredients", "result"):
+            continue
+        result = ITEMS.get(entry["result"])
+        if result is None:
+            check.errors.append(f"{path.name}/recipes: {entry['id']} produces unknown item {entry['result']!r}")
+            continue
+        ingredients = entry["ingredients"]
+        if not ingredients or not all(isinstance(q, int) and q > 0 for q in ingredients.values()):
+            check.errors.append(f"{path.name}/recipes: {entry['id']} needs positive ingredient counts")
+            continue
+        pack.recipes[entry["id"]] = Recipe(
+            entry["id"], entry["name"], dict(ingredients), result,
+            check.number("recipes", entry["id"], entry, "complexity", 1)
+        )
+
+    for entry in raw["events"]:
+        if not check.require("events", entry, "type", "title", "description"):
+            continue
+        event_type = check.enum("events", entry["type"], EventType, entry["type"])
+        if event_type is not None:
+            reward = check.number("events", entry["type"], entry, "reward", 0)
+            pack.events[event_type] = (entry["title"], entry["description"], reward)
+
+    if check.errors:
+        raise ContentError("; ".join(check.errors))
+    return pack
+
+
+def load_pack(path: Path, cache: Optional[Path] = None) -> ContentPack:
+    """Compiled pack from the cache, compiling and caching it on a miss."""
+    path = Path(path)
+    cache = Path(cache) if cache is not None else cache_dir() / "content"
+    blob = cache / f"{path.name}-{pack_digest(path)}.pickle"
+    if blob.is_file():
+        try:
+            with open(blob, "rb") as f:
+                return pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            blob.unlink(missing_ok=True)  # truncated, corrupt or from another version: recompile
+
+    pack = compile_pack(path)
+    cache.mkdir(parents=True, exist_ok=True)
+    tmp = blob.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(pack, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, blob)
+    return pack
+
+
+def apply_pack(pack: ContentPack):
+    """Merge a pack into the live registries; later packs win on id clashes."""
+    CLASSES.update(pack.classes)
+    RECIPES.update(pack.recipes)
+    EVENT_DETAILS.update(pack.events)
+    for npc in pack.npcs.values():
+        register_npc(npc)
+
+
+def pack_dirs() -> List[Path]:
+    """Built-in packs plus any directories listed in ``CODEXRPG_PACKS``."""
+    roots = [PACKS_DIR] + [Path(p) for p in os.environ.get("CODEXRPG_PACKS", "").split(os.pathsep) if p]
+    dirs = []
+    for root in roots:
+        if root.is_dir():
+            dirs.extend(sorted(p for p in root.iterdir() if p.is_dir()))
+    return dirs
+
+
+def load_content_packs(paths: Iterable[Path] = None, cache: Optional[Path] = None) -> List[ContentPack]:
+    """Load and apply every pack, in order."""
+    packs = []
+    for path in (pack_dirs() if paths is None else paths):
+        pack = load_pack(path, cache)
+        apply_pack(pack)
+        packs.append(pack)
+    return packs
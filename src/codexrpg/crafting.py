@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 from typing import List, Dict
-from .item import Item, ItemType, ItemRarity
+from .item import Item, ItemType, ItemRarity, intern_item
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Recipe:
     """Crafting recipe."""
     id: str
@@ -70,23 +70,56 @@ class CraftingSystem:
 
 
 # Default recipes
-HEALING_POTION = Item(
+HEALING_POTION = intern_item(Item(
     id="potion_heal",
     name="Healing Potion",
     description="Restores 50 HP",
     item_type=ItemType.POTION,
     rarity=ItemRarity.COMMON,
     value=50
-)
+))
 
-IRON_SWORD = Item(
+IRON_SWORD = intern_item(Item(
     id="sword_iron",
     name="Iron Sword",
     description="A sturdy steel blade",
     item_type=ItemType.WEAPON,
     rarity=ItemRarity.UNCOMMON,
     value=150
-)
+))
+
+# Raw resources used as ingredients
+COMMON_HERB = intern_item(Item(
+    id="herb_common",
+    name="Common Herb",
+    description="A fragrant healing herb",
+    item_type=ItemType.INGREDIENT,
+    value=5
+))
+
+PURE_WATER = intern_item(Item(
+    id="water_pure",
+    name="Pure Water",
+    description="Clear spring water",
+    item_type=ItemType.INGREDIENT,
+    value=2
+))
+
+IRON_ORE = intern_item(Item(
+    id="ore_iron",
+    name="Iron Ore",
+    description="A chunk of raw iron",
+    item_type=ItemType.INGREDIENT,
+    value=8
+))
+
+COAL = intern_item(Item(
+    id="coal",
+    name="Coal",
+    description="Fuel for the forge",
+    item_type=ItemType.INGREDIENT,
+    value=4
+))
 
 HEALING_RECIPE = Recipe(
     id="craft_healing_potion",
@@ -104,6 +137,15 @@ SWORD_RECIPE = Recipe(
     complexity=3
 )
 
+RECIPES: Dict[str, Recipe] = {
+    HEALING_RECIPE.id: HEALING_RECIPE,
+    SWORD_RECIPE.id: SWORD_RECIPE,
+}
+
+
+def get_recipe(recipe_id: str) -> Recipe:
+    return RECIPES.get(recipe_id)
+
 
 class GatheringSystem:
     """Handles collecting resources from the environment."""
@@ -0,0 +1,175 @@
+"""Merchant economy: stock levels, lazy restocking and dynamic prices.
+
+Everything time-based (restocks, market recovery) is evaluated from
+timestamps when read, so merchants nobody visits cost nothing.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+import math
+import time
+from .item import Item
+from .reputation import Faction, ReputationSystem, reputation_status
+
+
+# Reputation status -> price discount (negative means a surcharge)
+REPUTATION_DISCOUNTS = {
+    "Honored": 0.20,
+    "Friendly": 0.10,
+    "Favorable": 0.05,
+    "Neutral": 0.0,
+    "Unfavorable": -0.10,
+    "Hostile": -0.25,
+}
+
+
+@dataclass
+class StockEntry:
+    """Quantity of one item a merchant has for sale."""
+    item: Item
+    quantity: int
+    max_quantity: int
+    restock_amount: int = 1
+    restock_interval: float = 3600.0  # seconds per restock_amount
+    last_restock: float = field(default_factory=time.time)
+
+    def available(self, now: float) -> int:
+        """Quantity on hand at ``now`` including pending restocks."""
+        if self.quantity >= self.max_quantity or self.restock_interval <= 0:
+            return self.quantity
+        cycles = int((now - self.last_restock) // self.restock_interval)
+        return min(self.max_quantity, self.quantity + cycles * self.restock_amount)
+
+    def settle(self, now: float):
+        """Fold pending restocks into ``quantity``."""
+        if self.quantity >= self.max_quantity or self.restock_interval <= 0:
+            self.last_restock = now
+            return
+        cycles = int((now - self.last_restock) // self.restock_interval)
+        self.quantity = min(self.max_quantity, self.quantity + cycles * self.restock_amount)
+        if self.quantity >= self.max_quantity:
+            self.last_restock = now
+        else:
+            self.last_restock += cycles * self.restock_interval
+
+
+class MerchantEconomy:
+    """Stock and pricing for a single merchant.
+
+    Selling to a merchant raises market pressure on that item, which
+    lowers what they pay; pressure recovers with a half-life. Prices the
+    player pays rise as stock runs low.
+    """
+    def __init__(self, buy_prices: Dict[str, int] = None, markup: float = 1.25,
+                 elasticity: float = 0.05, recovery_half_life: float = 3600.0):
+        self.buy_prices: Dict[str, int] = buy_prices if buy_prices is not None else {}
+        self.stock: Dict[str, StockEntry] = {}
+        self.markup = markup
+        self.elasticity = elasticity
+        self.recovery_half_life = recovery_half_life
+        self.pressure: Dict[str, tuple] = {}  # item_id -> (units sold, as of timestamp)
+
+    def add_stock(self, item: Item, quantity: int = 1, max_quantity: int = None,
+                  restock_amount: int = 1, restock_interval: float = 3600.0,
+                  now: Optional[float] = None) -> StockEntry:
+        """Start stocking an item, or top up an existing entry."""
+        if now is None:
+            now = time.time()
+        entry = self.stock.get(item.id)
+        if entry is None:
+            entry = StockEntry(item, quantity, max_quantity or quantity,
+                               restock_amount, restock_interval, last_restock=now)
+            self.stock[item.id] = entry
+        else:
+            entry.settle(now)
+            entry.quantity += quantity
+            entry.max_quantity = max(entry.max_quantity, entry.quantity)
+        return entry
+
+    def get_stock(self, item_id: str, now: Optional[float] = None) -> int:
+        entry = self.stock.get(item_id)
+        if entry is None:
+            return 0
+        return entry.available(time.time() if now is None else now)
+
+    def take_stock(self, item_id: str, quantity: int = 1, now: Optional[float] = None) -> bool:
+        """Remove sold units from stock; False if not enough on hand."""
+        entry = self.stock.get(item_id)
+        if entry is None:
+            return False
+        entry.settle(time.time() if now is None else now)
+        if entry.quantity < quantity:
+            return False
+        entry.quantity -= quantity
+        return True
+
+    def current_pressure(self, item_id: str, now: float) -> float:
+        units, since = self.pressure.get(item_id, (0.0, now))
+        if not units:
+            return 0.0
+        return units * math.pow(0.5, max(0.0, now - since) / self.recovery_half_life)
+
+    def record_player_sale(self, item_id: str, quantity: int = 1, now: Optional[float] = None):
+        """Register units the player sold here; depresses future buy prices."""
+        if now is None:
+            now = time.time()
+        self.pressure[item_id] = (self.current_pressure(item_id, now) + quantity, now)
+
+    @staticmethod
+    def discount(faction: Optional[Faction], reputation: Optional[ReputationSystem],
+                 now: Optional[float] = None) -> float:
+        """Price discount the player earns with this merchant's faction."""
+        if faction is None or reputation is None:
+            return 0.0
+        return REPUTATION_DISCOUNTS[reputation_status(reputation.get_reputation(faction, now))]
+
+    def sell_price(self, item_id: str, discount: float = 0.0, now: Optional[float] = None) -> int:
+        """Price the player pays for one unit, or -1 if not for sale."""
+        entry = self.stock.get(item_id)
+        if entry is None:
+            return -1
+        if now is None:
+            now = time.time()
+        # Up to +50% as the shelf empties
+        scarcity = 1.0 + 0.5 * (1.0 - entry.available(now) / max(1, entry.max_quantity))
+        return max(1, round(entry.item.value * self.markup * scarcity * (1.0 - discount)))
+
+    def _unit_buy_price(self, base: int, pressure: float, discount: float) -> int:
+        return max(1, round(base / (1.0 + self.elasticity * pressure) * (1.0 + discount)))
+
+    def buy_price(self, item_id: str, discount: float = 0.0, now: Optional[float] = None) -> int:
+        """Price the merchant pays for one unit, or -1 if not buying."""
+        base = self.buy_prices.get(item_id)
+        if base is None:
+            return -1
+        if now is None:
+            now = time.time()
+        return self._unit_buy_price(base, self.current_pressure(item_id, now), discount)
+
+    def quote(self, items: Iterable[Item], discount: float = 0.0,
+              now: Optional[float] = None) -> Dict[str, dict]:
+        """Quote a whole inventory for the sell screen in one pass.
+
+        Items are grouped by id; each group's total accounts for the price
+        dropping with every unit sold. Items the merchant won't buy are
+        reported with a unit price of -1.
+        """
+        if now is None:
+            now = time.time()
+        counts: Dict[str, int] = {}
+        for item in items:
+            counts[item.id] = counts.get(item.id, 0) + 1
+
+        quotes = {}
+        for item_id, quantity in counts.items():
+            base = self.buy_prices.get(item_id)
+            if base is None:
+                quotes[item_id] = {"quantity": quantity, "unit_price": -1, "total": 0}
+                continue
+            pressure = self.current_pressure(item_id, now)
+            total = sum(self._unit_buy_price(base, pressure + k, discount) for k in range(quantity))
+            quotes[item_id] = {
+                "quantity": quantity,
+                "unit_price": self._unit_buy_price(base, pressure, discount),
+                "total": total,
+            }
+        return quotes
@@ -0,0 +1,190 @@
+"""Entity-component registry with struct-of-arrays storage.
+
+Each component type keeps one typed ``array`` per field plus a dense list
+of owning entities, so a system that walks "everything with health"
+iterates contiguous columns instead of chasing attributes on objects.
+Removal swaps the last row into the hole to keep columns dense.
+"""
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# component name -> {field: array typecode}
+DEFAULT_COMPONENTS: Dict[str, Dict[str, str]] = {
+    "position": {"x": "i", "y": "i"},
+    "health": {"hp": "i", "max_hp": "i"},
+    "stats": {"damage": "i", "defense": "i"},
+}
+
+
+class ComponentStore:
+    """Dense columns for one component type."""
+    def __init__(self, name: str, fields: Dict[str, str]):
+        self.name = name
+        self.fields = tuple(fields)
+        self.columns: Dict[str, array] = {f: array(code) for f, code in fields.items()}
+        self.entities = array("q")
+        self._rows: Dict[int, int] = {}  # entity -> row
+
+    def add(self, entity: int, **values):
+        if entity in self._rows:
+            row = self._rows[entity]
+            for f, value in values.items():
+                self.columns[f][row] = value
+            return
+        self._rows[entity] = len(self.entities)
+        self.entities.append(entity)
+        for f in self.fields:
+            self.columns[f].append(values.get(f, 0))
+
+    def remove(self, entity: int) -> bool:
+        row = self._rows.pop(entity, None)
+        if row is None:
+            return False
+        last = len(self.entities) - 1
+        if row != last:
+            moved = self.entities[last]
+            self.entities[row] = moved
+            self._rows[moved] = row
+            for column in self.columns.values():
+                column[row] = column[last]
+        self.entities.pop()
+        for column in self.columns.values():
+            column.pop()
+        return True
+
+    def row(self, entity: int) -> Optional[int]:
+        return self._rows.get(entity)
+
+    def get(self, entity: int, field: str) -> Any:
+        return self.columns[field][self._rows[entity]]
+
+    def set(self, entity: int, field: str, value):
+        self.columns[field][self._rows[entity]] = value
+
+    def values(self, entity: int) -> Dict[str, Any]:
+        row = self._rows[entity]
+        return {f: self.columns[f][row] for f in self.fields}
+
+    def __contains__(self, entity: int) -> bool:
+        return entity in self._rows
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+
+class Registry:
+    """Creates entities and owns their component stores."""
+    def __init__(self, components: Dict[str, Dict[str, str]] = None):
+        self.stores: Dict[str, ComponentStore] = {}
+        self.kinds: Dict[int, str] = {}  # entity -> "player", "npc", "monster", ...
+        self.objects: Dict[int, Any] = {}  # entity -> backing game object, if any
+        self._next_id = 1
+        for name, fields in (components or DEFAULT_COMPONENTS).items():
+            self.define_component(name, fields)
+
+    def define_component(self, name: str, fields: Dict[str, str]) -> ComponentStore:
+        store = ComponentStore(name, fields)
+        self.stores[name] = store
+        return store
+
+    def create_entity(self, kind: str = "", obj: Any = None) -> int:
+        entity = self._next_id
+        self._next_id += 1
+        self.kinds[entity] = kind
+        if obj is not None:
+            self.objects[entity] = obj
+        return entity
+
+    def destroy_entity(self, entity: int):
+        for store in self.stores.values():
+            store.remove(entity)
+        self.kinds.pop(entity, None)
+        self.objects.pop(entity, None)
+
+    def add_component(self, entity: int, name: str, **values):
+        self.stores[name].add(entity, **values)
+
+    def remove_component(self, entity: int, name: str) -> bool:
+        return self.stores[name].remove(entity)
+
+    def get(self, entity: int, name: str) -> Optional[Dict[str, Any]]:
+        store = self.stores[name]
+        return store.values(entity) if entity in store else None
+
+    def store(self, name: str) -> ComponentStore:
+        return self.stores[name]
+
+    def query(self, *names: str) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        """Yield (entity, rows) for entities having every named component.
+
+        ``rows`` holds the entity's row in each store, in argument order,
+        for indexing straight into the columns.
+        """
+        stores = [self.stores[n] for n in names]
+        smallest = min(stores, key=len)
+        for entity in list(smallest.entities):
+            rows = tuple(s.row(entity) for s in stores)
+            if None not in rows:
+                yield entity, rows
+
+    def entities_in_rect(self, x0: int, y0: int, x1: int, y1: int) -> List[int]:
+        """Entities whose position lies in the rectangle (inclusive)."""
+        pos = self.stores["position"]
+        xs, ys, ents = pos.columns["x"], pos.columns["y"], pos.entities
+        return [ents[i] for i in range(len(ents)) if x0 <= xs[i] <= x1 and y0 <= ys[i] <= y1]
+
+    def entities_of_kind(self, kind: str) -> List[int]:
+        return [e for e, k in self.kinds.items() if k == kind]
+
+
+def spawn_actor(registry: Registry, actor, kind: str, position: Optional[Tuple[int, int]] = None) -> int:
+    """Put a Player/NPC-like object into the registry.
+
+    Copies whichever of hp/max_hp/damage/defense the object has into the
+    hot components and stores the entity id on ``actor.entity_id``. The
+    entity starts at ``position``, else the actor's own position, else
+    (0, 0), and the actor's position is set to match.
+    """
+    if position is None:
+        position = getattr(actor, "position", None) or (0, 0)
+    entity = registry.create_entity(kind, actor)
+    registry.add_component(entity, "position", x=position[0], y=position[1])
+    actor.position = (position[0], position[1])
+    if hasattr(actor, "hp"):
+        registry.add_component(entity, "health", hp=actor.hp, max_hp=getattr(actor, "max_hp", actor.hp))
+    if hasattr(actor, "damage"):
+        registry.add_component(entity, "stats", damage=actor.damage, defense=getattr(actor, "defense", 0))
+    actor.entity_id = entity
+    return entity
+
+
+def spawn_monster(registry: Registry, hp: int, damage: int, defense: int = 0,
+                  position: Tuple[int, int] = (0, 0)) -> int:
+    """Create a component-only monster; it needs no backing object."""
+    entity = registry.create_entity("monster")
+    registry.add_component(entity, "position", x=position[0], y=position[1])
+    registry.add_component(entity, "health", hp=hp, max_hp=hp)
+    registry.add_component(entity, "stats", damage=damage, defense=defense)
+    return entity
+
+
+def write_back(registry: Registry, entity: int):
+    """Copy hot component values back onto the entity's backing object."""
+    actor = registry.objects.get(entity)
+    if actor is None:
+        return
+    health = registry.get(entity, "health")
+    if health is not None and hasattr(actor, "hp"):
+        actor.hp = health["hp"]
+    position = registry.get(entity, "position")
+    if position is not None:
+        actor.position = (position["x"], position["y"])
+
+
+def regenerate(registry: Registry, amount: int):
+    """Heal every entity with health by ``amount``, capped at max_hp."""
+    health = registry.stores["health"]
+    hp, max_hp = health.columns["hp"], health.columns["max_hp"]
+    for i in range(len(health)):
+        if 0 < hp[i] < max_hp[i]:
+            hp[i] = min(max_hp[i], hp[i] + amount)
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Callable
+from typing import List, Callable, Dict, Optional, Set
+import heapq
 import random
+from .spatial import SpatialGrid, Position, resolve_location
 
 
 class EventType(Enum):
@@ -14,7 +16,7 @@ class EventType(Enum):
     TRAVELER_DISTRESS = "traveler_distress"
 
 
-@dataclass
+@dataclass(slots=True)
 class WorldEvent:
     """A dynamic event that occurs in the world."""
     id: str
@@ -24,18 +26,66 @@ class WorldEvent:
     location: str
     active: bool = True
     reward: int = 0  # gold or exp
+    position: Optional[Position] = None  # world tile, if the event has one
+    expires_at: Optional[float] = None  # resolved automatically after this time
     
     def resolve(self):
         self.active = False
 
 
+# event type -> (title, description, reward); content packs may override entries
+EVENT_DETAILS = {
+    EventType.BANDIT_ENCOUNTER: (
+        "Bandits on the Road",
+        "A group of bandits blocks your path!",
+        50
+    ),
+    EventType.TREASURE_FOUND: (
+        "Hidden Treasure",
+        "You found a glimmering chest!",
+        200
+    ),
+    EventType.NPC_LOST: (
+        "Lost Traveler",
+        "A traveler seems lost and confused.",
+        75
+    ),
+    EventType.WEATHER_CHANGE: (
+        "Storm Approaching",
+        "Dark clouds gather overhead.",
+        0
+    ),
+    EventType.FESTIVAL: (
+        "Town Festival",
+        "A celebration has started in town!",
+        100
+    ),
+    EventType.MONSTER_SPAWN: (
+        "Strange Creature",
+        "An unusual beast emerges from the shadows.",
+        150
+    ),
+    EventType.TRAVELER_DISTRESS: (
+        "Help Needed",
+        "Someone calls for assistance!",
+        80
+    ),
+}
+
+
 class EventSystem:
     """Manages dynamic world events."""
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
         self.events: dict[str, WorldEvent] = {}
+        self.rng = rng or random.Random()  # pass RNGService.stream("events") to reproduce
         self.event_counter = 0
+        self.spatial = SpatialGrid()  # active events with a world tile
+        self._active_by_location: Dict[str, Set[str]] = {}
+        self._expiry_heap: List[tuple] = []  # (expires_at, event counter, event_id)
     
-    def trigger_event(self, event_type: EventType, location: str = "world") -> WorldEvent:
+    def trigger_event(self, event_type: EventType, location: str = "world",
+                      position: Optional[Position] = None,
+                      expires_at: Optional[float] = None) -> WorldEvent:
         """Trigger a random event of given type."""
         self.event_counter += 1
         event_id = f"event_{self.event_counter}"
@@ -48,68 +98,68 @@ class EventSystem:
             title=title,
             description=description,
             location=location,
-            reward=reward
+            reward=reward,
+            position=resolve_location(location, position),
+            expires_at=expires_at
         )
         self.events[event_id] = event
+        if expires_at is not None:
+            heapq.heappush(self._expiry_heap, (expires_at, self.event_counter, event_id))
+        self._active_by_location.setdefault(location, set()).add(event_id)
+        if event.position is not None:
+            self.spatial.insert(event_id, *event.position)
         return event
     
     def _get_event_details(self, event_type: EventType) -> tuple:
         """Return (title, description, reward) for event type."""
-        details = {
-            EventType.BANDIT_ENCOUNTER: (
-                "Bandits on the Road",
-                "A group of bandits blocks your path!",
-                50
-            ),
-            EventType.TREASURE_FOUND: (
-                "Hidden Treasure",
-                "You found a glimmering chest!",
-                200
-            ),
-            EventType.NPC_LOST: (
-                "Lost Traveler",
-                "A traveler seems lost and confused.",
-                75
-            ),
-            EventType.WEATHER_CHANGE: (
-                "Storm Approaching",
-                "Dark clouds gather overhead.",
-                0
-            ),
-            EventType.FESTIVAL: (
-                "Town Festival",
-                "A celebration has started in town!",
-                100
-            ),
-            EventType.MONSTER_SPAWN: (
-                "Strange Creature",
-                "An unusual beast emerges from the shadows.",
-                150
-            ),
-            EventType.TRAVELER_DISTRESS: (
-                "Help Needed",
-                "Someone calls for assistance!",
-                80
-            ),
-        }
-        return details.get(event_type, ("Unknown Event", "Something happened.", 0))
+        return EVENT_DETAILS.get(event_type, ("Unknown Event", "Something happened.", 0))
     
     def get_event(self, event_id: str) -> WorldEvent:
         return self.events.get(event_id)
     
     def get_active_events(self, location: str = None) -> List[WorldEvent]:
         """Get all active events, optionally filtered by location."""
-        events = [e for e in self.events.values() if e.active]
         if location:
-            events = [e for e in events if e.location == location]
-        return events
+            ids = self._active_by_location.get(location, ())
+            # Events can also be resolved directly, so re-check the flag
+            return [self.events[i] for i in sorted(ids, key=_event_order) if self.events[i].active]
+        return [e for e in self.events.values() if e.active]
+    
+    def events_near(self, x: int, y: int, radius: float) -> List[WorldEvent]:
+        """Active events within ``radius`` tiles of (x, y), nearest first."""
+        events = [self.events[i] for i in self.spatial.query_radius(x, y, radius)]
+        return [e for e in events if e.active]
+    
+    def events_in_rect(self, x0: int, y0: int, x1: int, y1: int) -> List[WorldEvent]:
+        """Active events inside a tile rectangle (inclusive)."""
+        events = [self.events[i] for i in self.spatial.query_rect(x0, y0, x1, y1)]
+        return [e for e in events if e.active]
     
     def resolve_event(self, event_id: str):
         """Mark event as resolved."""
         if event_id in self.events:
-            self.events[event_id].resolve()
+            event = self.events[event_id]
+            event.resolve()
+            self._active_by_location.get(event.location, set()).discard(event_id)
+            self.spatial.remove(event_id)
+    
+    def expire_events(self, now: float) -> List[WorldEvent]:
+        """Resolve events whose time is up; only touches expired ones."""
+        expired = []
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, _, event_id = heapq.heappop(heap)
+            event = self.events[event_id]
+            if event.active:
+                self.resolve_event(event_id)
+                expired.append(event)
+        return expired
     
     def random_event(self, location: str = "world") -> WorldEvent:
         """Generate a completely random event."""
-        event_type = random.choice(list(EventType))
+        event_type = self.rng.choice(list(EventType))
         return self.trigger_event(event_type, location)
+
+
+def _event_order(event_id: str) -> int:
+    return int(event_id.rsplit("_", 1)[1])
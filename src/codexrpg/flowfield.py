@@ -0,0 +1,210 @@
+"""Flow fields: one BFS from a target gives every tile its next step.
+
+Any number of agents heading for the same tile can then move with a
+single table lookup each. Fields are cached per target with LRU eviction
+and patched incrementally when a tile's passability changes.
+"""
+from array import array
+from collections import OrderedDict, deque
+from typing import List, Optional, Tuple
+import heapq
+from .pathfinding import IMPASSABLE, Point
+
+# Direction codes stored per tile; 0 means "stay" (target or unreachable)
+DIRECTIONS: Tuple[Point, ...] = ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class FlowField:
+    """Distances and next-step directions toward a single target tile."""
+    def __init__(self, passable: bytearray, width: int, height: int, target: Point):
+        self.passable = passable  # shared with the owning cache
+        self.width = width
+        self.height = height
+        self.target = target
+        self.distance = array("i", [-1]) * (width * height)
+        self.direction = bytearray(width * height)
+        self._offsets = (0, 1, -1, width, -width)
+        self._compute()
+
+    def _neighbors(self, idx: int):
+        """(neighbour index, direction code pointing from neighbour to idx)."""
+        w = self.width
+        x = idx % w
+        if x + 1 < w:
+            yield idx + 1, 2
+        if x > 0:
+            yield idx - 1, 1
+        if idx + w < len(self.passable):
+            yield idx + w, 4
+        if idx >= w:
+            yield idx - w, 3
+
+    def _compute(self):
+        tx, ty = self.target
+        if not (0 <= tx < self.width and 0 <= ty < self.height):
+            return
+        goal = ty * self.width + tx
+        if not self.passable[goal]:
+            return
+        dist, direction, passable = self.distance, self.direction, self.passable
+        dist[goal] = 0
+        queue = deque([goal])
+        while queue:
+            idx = queue.popleft()
+            d = dist[idx] + 1
+            for nb, code in self._neighbors(idx):
+                if dist[nb] == -1 and passable[nb]:
+                    dist[nb] = d
+                    direction[nb] = code
+                    queue.append(nb)
+
+    def direction_at(self, p: Point) -> Point:
+        """Unit step to take from ``p``; (0, 0) at the target or if stuck."""
+        return DIRECTIONS[self.direction[p[1] * self.width + p[0]]]
+
+    def next_step(self, p: Point) -> Point:
+        dx, dy = self.direction_at(p)
+        return (p[0] + dx, p[1] + dy)
+
+    def distance_at(self, p: Point) -> int:
+        """Steps to the target, or -1 if unreachable."""
+        return self.distance[p[1] * self.width + p[0]]
+
+    def tile_changed(self, idx: int):
+        """Patch the field after ``passable[idx]`` flipped."""
+        if self.passable[idx]:
+            changed = self._relax_from(idx)
+        else:
+            changed = self._invalidate_through(idx)
+        self._refresh_directions(changed)
+
+    def _relax_from(self, idx: int) -> List[int]:
+        """A tile opened up: distances can only shrink, spreading from it."""
+        dist, passable = self.distance, self.passable
+        tx, ty = self.target
+        if idx == ty * self.width + tx:
+            # Target reopened after being blocked: nothing else is valid
+            dist[idx] = 0
+        else:
+            best = [dist[nb] for nb, _ in self._neighbors(idx) if passable[nb] and dist[nb] != -1]
+            if not best:
+                return [idx]
+            dist[idx] = min(best) + 1
+        changed = [idx]
+        queue = deque([idx])
+        while queue:
+            cur = queue.popleft()
+            d = dist[cur] + 1
+            for nb, _ in self._neighbors(cur):
+                if passable[nb] and (dist[nb] == -1 or dist[nb] > d):
+                    dist[nb] = d
+                    changed.append(nb)
+                    queue.append(nb)
+        return changed
+
+    def _invalidate_through(self, idx: int) -> List[int]:
+        """A tile closed: re-solve only the tiles whose route used it."""
+        dist, direction, passable = self.distance, self.direction, self.passable
+        if dist[idx] == -1:
+            return [idx]
+        # Tiles downstream of idx in the direction tree
+        affected = [idx]
+        dist[idx] = -1
+        queue = deque([idx])
+        while queue:
+            cur = queue.popleft()
+            for nb, code in self._neighbors(cur):
+                if dist[nb] != -1 and direction[nb] == code:
+                    dist[nb] = -1
+                    affected.append(nb)
+                    queue.append(nb)
+        # Re-seed from the untouched frontier and run Dijkstra inward
+        heap = []
+        for cur in affected:
+            if not passable[cur]:
+                continue
+            for nb, _ in self._neighbors(cur):
+                if dist[nb] != -1:
+                    heap.append((dist[nb] + 1, cur))
+        heapq.heapify(heap)
+        while heap:
+            d, cur = heapq.heappop(heap)
+            if dist[cur] != -1 and dist[cur] <= d:
+                continue
+            dist[cur] = d
+            for nb, _ in self._neighbors(cur):
+                if passable[nb] and (dist[nb] == -1 or dist[nb] > d + 1):
+                    heapq.heappush(heap, (d + 1, nb))
+        return affected
+
+    def _refresh_directions(self, changed: List[int]):
+        dist, direction, offsets = self.distance, self.direction, self._offsets
+        touched = set(changed)
+        for idx in changed:
+            touched.update(nb for nb, _ in self._neighbors(idx))
+        for idx in touched:
+            d = dist[idx]
+            direction[idx] = 0
+            if d <= 0:
+                continue
+            for code in range(1, 5):
+                nb = idx + offsets[code]
+                if self._adjacent(idx, nb) and dist[nb] == d - 1:
+                    direction[idx] = code
+                    break
+
+    def _adjacent(self, idx: int, nb: int) -> bool:
+        if not 0 <= nb < len(self.passable):
+            return False
+        return abs(idx % self.width - nb % self.width) + abs(idx // self.width - nb // self.width) == 1
+
+
+class FlowFieldCache:
+    """LRU cache of flow fields over one biome grid."""
+    def __init__(self, grid: List[List[str]], capacity: int = 32, impassable=IMPASSABLE):
+        self.height = len(grid)
+        self.width = len(grid[0]) if grid else 0
+        self.capacity = capacity
+        self.impassable = impassable
+        self.passable = bytearray(
+            0 if biome in impassable else 1 for row in grid for biome in row
+        )
+        self._fields: "OrderedDict[Point, FlowField]" = OrderedDict()
+
+    def get(self, target: Point) -> FlowField:
+        """Field toward ``target``, computing it on a miss."""
+        field = self._fields.get(target)
+        if field is not None:
+            self._fields.move_to_end(target)
+            return field
+        field = FlowField(self.passable, self.width, self.height, target)
+        self._fields[target] = field
+        if len(self._fields) > self.capacity:
+            self._fields.popitem(last=False)
+        return field
+
+    def set_tile(self, p: Point, biome: str):
+        """Change a tile's biome and patch every cached field."""
+        idx = p[1] * self.width + p[0]
+        passable = 0 if biome in self.impassable else 1
+        if self.passable[idx] == passable:
+            return
+        self.passable[idx] = passable
+        for field in self._fields.values():
+            field.tile_changed(idx)
+
+    def advance(self, positions: List[Point], target: Point) -> List[Point]:
+        """Move every agent one step toward ``target``."""
+        field = self.get(target)
+        w, direction = self.width, field.direction
+        out = []
+        for x, y in positions:
+            dx, dy = DIRECTIONS[direction[y * w + x]]
+            out.append((x + dx, y + dy))
+        return out
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __contains__(self, target: Point) -> bool:
+        return target in self._fields
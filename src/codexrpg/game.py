@@ -1,13 +1,202 @@
+from collections import deque
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Deque, Dict, List, Optional
+import time
+
+
+@dataclass
+class SystemStats:
+    """Timing of one system across ticks."""
+    calls: int = 0
+    total_ms: float = 0.0
+    last_ms: float = 0.0
+    max_ms: float = 0.0
+    over_budget: int = 0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+@dataclass
+class TickSystem:
+    """A world system run by the tick loop.
+
+    ``update(dt, deadline)`` receives the simulated seconds since it last
+    ran and a ``perf_counter`` deadline derived from ``budget_ms`` (None if
+    unbudgeted). Systems that can split their work should stop at the
+    deadline and pick up again next tick. ``interval`` runs the system only
+    every that many simulated seconds.
+    """
+    name: str
+    update: Callable[[float, Optional[float]], None]
+    budget_ms: Optional[float] = None
+    interval: float = 0.0
+    pending: float = 0.0
+    stats: SystemStats = field(default_factory=SystemStats)
+
+
 class Game:
-    """Basic game skeleton for CodexRPG."""
-    def __init__(self, title: str = "CodexRPG"):
+    """Fixed-timestep simulation loop for CodexRPG."""
+    def __init__(self, title: str = "CodexRPG", tick_rate: float = 20.0,
+                 max_catch_up_ticks: int = 5, clock: Callable[[], float] = time.monotonic,
+                 world_clock: Callable[[], float] = time.time):
         self.title = title
         self.running = False
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_catch_up_ticks = max_catch_up_ticks
+        self.clock = clock
+        self.systems: List[TickSystem] = []
+        self.tick_count = 0
+        # World time, on the same epoch the web endpoints and homestead
+        # catch-up use; advances by dt per tick and by any dropped time
+        self.sim_time = world_clock()
+        self.dropped_ticks = 0
+        self.tick_ms: Deque[float] = deque(maxlen=120)  # recent tick durations
+        self._accumulator = 0.0
+        self._last_update: Optional[float] = None
 
     def start(self):
         self.running = True
+        self._last_update = None
         return f"{self.title} started"
 
     def stop(self):
         self.running = False
         return f"{self.title} stopped"
+
+    def add_system(self, name: str, update: Callable[[float, Optional[float]], None],
+                   budget_ms: Optional[float] = None, interval: float = 0.0,
+                   before: Optional[str] = None) -> TickSystem:
+        """Register a system; runs last unless ``before`` names another."""
+        system = TickSystem(name, update, budget_ms, interval)
+        if before is None:
+            self.systems.append(system)
+        else:
+            self.systems.insert(self._index(before), system)
+        return system
+
+    def remove_system(self, name: str):
+        del self.systems[self._index(name)]
+
+    def set_order(self, names: List[str]):
+        """Reorder systems; any not named keep their relative order at the end."""
+        by_name = {s.name: s for s in self.systems}
+        ordered = [by_name.pop(n) for n in names]
+        self.systems = ordered + [s for s in self.systems if s.name in by_name]
+
+    def _index(self, name: str) -> int:
+        for i, system in enumerate(self.systems):
+            if system.name == name:
+                return i
+        raise KeyError(name)
+
+    def tick(self) -> float:
+        """Run one fixed step of every system; returns its duration in ms."""
+        tick_start = perf_counter()
+        dt = self.dt
+        for system in self.systems:
+            system.pending += dt
+            if system.pending < system.interval:
+                continue
+            elapsed, system.pending = system.pending, 0.0
+            start = perf_counter()
+            deadline = start + system.budget_ms / 1000.0 if system.budget_ms is not None else None
+            system.update(elapsed, deadline)
+            ms = (perf_counter() - start) * 1000.0
+            stats = system.stats
+            stats.calls += 1
+            stats.total_ms += ms
+            stats.last_ms = ms
+            stats.max_ms = max(stats.max_ms, ms)
+            if system.budget_ms is not None and ms > system.budget_ms:
+                stats.over_budget += 1
+        self.tick_count += 1
+        self.sim_time += dt
+        ms = (perf_counter() - tick_start) * 1000.0
+        self.tick_ms.append(ms)
+        return ms
+
+    def update(self, now: Optional[float] = None) -> int:
+        """Run as many fixed ticks as real time since the last call allows.
+
+        If the server has fallen behind by more than ``max_catch_up_ticks``
+        the extra ticks are dropped (and counted) rather than replayed, so a
+        stall can't snowball into a spiral of ever-longer catch-up frames.
+        The dropped time itself is not lost: ``sim_time`` still advances by
+        it and every system receives it in its next ``dt``, so world time
+        keeps pace with the wall clock.
+        """
+        if now is None:
+            now = self.clock()
+        if self._last_update is None:
+            self._last_update = now
+            return 0
+        self._accumulator += now - self._last_update
+        self._last_update = now
+        ticks = 0
+        while self._accumulator >= self.dt:
+            if ticks >= self.max_catch_up_ticks:
+                dropped = int(self._accumulator / self.dt)
+                self.dropped_ticks += dropped
+                self._accumulator -= dropped * self.dt
+                self.sim_time += dropped * self.dt
+                for system in self.systems:
+                    system.pending += dropped * self.dt
+                break
+            self.tick()
+            self._accumulator -= self.dt
+            ticks += 1
+        return ticks
+
+    def run(self, max_ticks: Optional[int] = None, sleep: Callable[[float], None] = time.sleep):
+        """Drive the loop in real time until stopped (or ``max_ticks`` ran)."""
+        self.start()
+        target = None if max_ticks is None else self.tick_count + max_ticks
+        while self.running and (target is None or self.tick_count < target):
+            self.update()
+            sleep(max(0.0, self.dt - self._accumulator))
+        self.running = False
+
+    def get_stats(self) -> dict:
+        """Tick and per-system timing summary."""
+        recent = list(self.tick_ms)
+        return {
+            "ticks": self.tick_count,
+            "tick_rate": self.tick_rate,
+            "dropped_ticks": self.dropped_ticks,
+            "tick_ms_avg": sum(recent) / len(recent) if recent else 0.0,
+            "tick_ms_max": max(recent) if recent else 0.0,
+            "systems": {
+                s.name: {
+                    "calls": s.stats.calls,
+                    "avg_ms": s.stats.avg_ms,
+                    "max_ms": s.stats.max_ms,
+                    "last_ms": s.stats.last_ms,
+                    "over_budget": s.stats.over_budget,
+                }
+                for s in self.systems
+            },
+        }
+
+    def attach_player(self, player, movement=None,
+                      on_change: Optional[Callable[[], None]] = None) -> "Game":
+        """Register the standard world systems for a player.
+
+        Order: events, homesteads, NPC movement (if a MovementSystem is
+        given), cooldowns. ``on_change`` is called after a tick in which
+        events expired or homesteads produced anything.
+        """
+        def changed(result):
+            if result and on_change is not None:
+                on_change()
+
+        self.add_system("events", lambda dt, deadline: changed(player.events.expire_events(self.sim_time)))
+        self.add_system("homesteads", lambda dt, deadline: changed(player.homesteads.catch_up(self.sim_time)),
+                        interval=1.0)
+        if movement is not None:
+            self.add_system("npc_movement", movement.update, budget_ms=self.dt * 1000.0 / 4)
+        self.add_system("cooldowns", player.cooldowns.update)
+        return self
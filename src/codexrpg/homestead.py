@@ -1,7 +1,11 @@
 from dataclasses import dataclass, field
-from typing import List, Dict
+from typing import List, Dict, Optional
 from enum import Enum
+import time
 from .item import Item
+from .crafting import COMMON_HERB, PURE_WATER, IRON_ORE, COAL
+from .systems.inventory import StackedInventory
+from .spatial import SpatialGrid, Position, resolve_location
 
 
 class HomesteadType(Enum):
@@ -13,6 +17,36 @@ class HomesteadType(Enum):
     ESTATE = "estate"
 
 
+class ResidentJob(Enum):
+    """Work a resident NPC does at a homestead."""
+    FARMER = "farmer"
+    MINER = "miner"
+    COLLIER = "collier"
+    WELL_KEEPER = "well_keeper"
+    TRADER = "trader"
+
+
+# job -> (gold per hour, produced item, items per hour)
+JOB_OUTPUT = {
+    ResidentJob.FARMER: (2, COMMON_HERB, 3.0),
+    ResidentJob.MINER: (3, IRON_ORE, 1.5),
+    ResidentJob.COLLIER: (2, COAL, 2.0),
+    ResidentJob.WELL_KEEPER: (1, PURE_WATER, 4.0),
+    ResidentJob.TRADER: (12, None, 0.0),
+}
+
+# homestead type -> (production multiplier, gold capacity, storage capacity) at level 1
+TYPE_PRODUCTION = {
+    HomesteadType.COTTAGE: (1.0, 1000, 50),
+    HomesteadType.TOWER: (0.8, 1500, 40),
+    HomesteadType.CAVE: (1.25, 800, 80),
+    HomesteadType.TAVERN: (1.5, 3000, 60),
+    HomesteadType.ESTATE: (2.0, 5000, 150),
+}
+
+SECONDS_PER_HOUR = 3600.0
+
+
 @dataclass
 class Homestead:
     """A player's personal base/home."""
@@ -21,33 +55,122 @@ class Homestead:
     homestead_type: HomesteadType
     location: str = "unknown"
     level: int = 1  # upgrade level
-    storage: List[Item] = field(default_factory=list)
+    storage: StackedInventory = field(default_factory=StackedInventory)
     npcs_living_here: List[str] = field(default_factory=list)  # NPC IDs
     gold_stored: int = 0
+    resident_jobs: Dict[str, ResidentJob] = field(default_factory=dict)  # NPC ID -> job
+    last_produced: float = field(default_factory=time.time)
+    production_progress: Dict[str, float] = field(default_factory=dict)  # fractional output carried over
+    position: Optional[Position] = None  # world tile; defaults from location
+    
+    @property
+    def gold_capacity(self) -> int:
+        return TYPE_PRODUCTION[self.homestead_type][1] * self.level
+    
+    @property
+    def storage_capacity(self) -> int:
+        return TYPE_PRODUCTION[self.homestead_type][2] * self.level
+    
+    def production_rates(self) -> Dict[str, float]:
+        """Output per hour keyed by "gold" or produced item id."""
+        scale = TYPE_PRODUCTION[self.homestead_type][0] * (1 + 0.5 * (self.level - 1))
+        rates: Dict[str, float] = {}
+        for job in self.resident_jobs.values():
+            gold, item, items_per_hour = JOB_OUTPUT[job]
+            rates["gold"] = rates.get("gold", 0.0) + gold * scale
+            if item is not None:
+                rates[item.id] = rates.get(item.id, 0.0) + items_per_hour * scale
+        return rates
+    
+    def catch_up(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Apply production since ``last_produced`` in closed form.
+
+        Output is rate * elapsed, clipped to the gold and storage caps, so
+        the cost is independent of how long the player was away.
+        """
+        if now is None:
+            now = time.time()
+        hours = (now - self.last_produced) / SECONDS_PER_HOUR
+        if hours <= 0:
+            return {}  # never move the clock backwards
+        self.last_produced = now
+        if not self.resident_jobs:
+            return {}
+        
+        produced: Dict[str, int] = {}
+        progress = self.production_progress
+        items: Dict[str, float] = {}
+        for key, rate in self.production_rates().items():
+            amount = progress.get(key, 0.0) + rate * hours
+            if key == "gold":
+                gold = min(int(amount), self.gold_capacity - self.gold_stored)
+                if gold > 0:
+                    self.gold_stored += gold
+                    produced["gold"] = gold
+                progress["gold"] = amount - int(amount) if self.gold_stored < self.gold_capacity else 0.0
+            else:
+                items[key] = amount
+        
+        if items:
+            free = max(0, self.storage_capacity - len(self.storage))
+            total = sum(int(a) for a in items.values())
+            # Share the remaining space in proportion to what was produced
+            ratio = min(1.0, free / total) if total else 1.0
+            for item_id, amount in items.items():
+                count = int(int(amount) * ratio)
+                progress[item_id] = amount - int(amount) if ratio == 1.0 else 0.0
+                if count > 0:
+                    self.storage.add(PRODUCED_ITEMS[item_id], count)
+                    produced[item_id] = count
+        return produced
     
-    def add_storage_item(self, item: Item):
+    def add_storage_item(self, item: Item, quantity: int = 1):
         """Store item in homestead."""
-        self.storage.append(item)
+        self.storage.add(item, quantity)
     
-    def remove_storage_item(self, item: Item) -> bool:
+    def remove_storage_item(self, item: Item, quantity: int = 1) -> bool:
         """Remove item from storage."""
-        if item in self.storage:
-            self.storage.remove(item)
-            return True
-        return False
+        return self.storage.remove(item, quantity)
+    
+    def deposit_items(self, items: List[Item]) -> int:
+        """Store a batch of items in one pass, as many as storage has room for.
+
+        Items are taken from the front of ``items``. Returns number stored.
+        """
+        free = max(0, self.storage_capacity - len(self.storage))
+        return self.storage.add_many(items[:free])
+    
+    def withdraw_items(self, item_id: str, quantity: int = 1) -> List[Item]:
+        """Take up to ``quantity`` of an item out of storage."""
+        return self.storage.take(item_id, quantity)
     
-    def upgrade(self, gold_cost: int = 500) -> bool:
+    def upgrade(self, gold_cost: int = 500, now: Optional[float] = None) -> bool:
         """Upgrade the homestead."""
+        self.catch_up(now)
         if self.gold_stored >= gold_cost:
             self.gold_stored -= gold_cost
             self.level += 1
             return True
         return False
     
-    def add_resident(self, npc_id: str):
-        """Add an NPC resident (companion/worker)."""
+    def add_resident(self, npc_id: str, job: ResidentJob = None, now: Optional[float] = None):
+        """Add an NPC resident (companion/worker), optionally with a job."""
         if npc_id not in self.npcs_living_here:
             self.npcs_living_here.append(npc_id)
+        if job is not None:
+            self.assign_job(npc_id, job, now)
+    
+    def assign_job(self, npc_id: str, job: Optional[ResidentJob], now: Optional[float] = None) -> bool:
+        """Give a resident a job, or ``None`` to stop working."""
+        if npc_id not in self.npcs_living_here:
+            return False
+        # Settle output at the old rate before the rate changes
+        self.catch_up(now)
+        if job is None:
+            self.resident_jobs.pop(npc_id, None)
+        else:
+            self.resident_jobs[npc_id] = job
+        return True
     
     def get_info(self) -> dict:
         """Get homestead information."""
@@ -57,27 +180,38 @@ class Homestead:
             "location": self.location,
             "level": self.level,
             "storage_items": len(self.storage),
+            "storage_by_type": {t.value: n for t, n in self.storage.type_counts.items()},
+            "storage_by_rarity": {r.value: n for r, n in self.storage.rarity_counts.items()},
             "gold": self.gold_stored,
-            "residents": len(self.npcs_living_here)
+            "residents": len(self.npcs_living_here),
+            "workers": {npc_id: job.value for npc_id, job in self.resident_jobs.items()}
         }
 
 
+PRODUCED_ITEMS = {item.id: item for _, item, _ in JOB_OUTPUT.values() if item is not None}
+
+
 class HomesteadSystem:
     """Manages player homesteads and properties."""
     def __init__(self):
         self.homesteads: Dict[str, Homestead] = {}
         self.active_homestead_id: str = None
+        self.spatial = SpatialGrid()
     
     def create_homestead(self, homestead_id: str, name: str, 
-                        homestead_type: HomesteadType, location: str = "world") -> Homestead:
+                        homestead_type: HomesteadType, location: str = "world",
+                        position: Optional[Position] = None) -> Homestead:
         """Create a new homestead."""
         homestead = Homestead(
             id=homestead_id,
             name=name,
             homestead_type=homestead_type,
-            location=location
+            location=location,
+            position=resolve_location(location, position)
         )
         self.homesteads[homestead_id] = homestead
+        if homestead.position is not None:
+            self.spatial.insert(homestead_id, *homestead.position)
         if not self.active_homestead_id:
             self.active_homestead_id = homestead_id
         return homestead
@@ -103,6 +237,20 @@ class HomesteadSystem:
         """List all player homesteads."""
         return list(self.homesteads.values())
     
+    def homesteads_near(self, x: int, y: int, radius: float) -> List[Homestead]:
+        """Homesteads within ``radius`` tiles of (x, y), nearest first."""
+        return [self.homesteads[h] for h in self.spatial.query_radius(x, y, radius)]
+    
+    def catch_up(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Bring every homestead's production up to ``now``; return totals."""
+        if now is None:
+            now = time.time()
+        totals: Dict[str, int] = {}
+        for homestead in self.homesteads.values():
+            for key, amount in homestead.catch_up(now).items():
+                totals[key] = totals.get(key, 0) + amount
+        return totals
+    
     def teleport_to_homestead(self, homestead_id: str) -> bool:
         """"Teleport" (travel) to a homestead."""
         if homestead_id in self.homesteads:
@@ -1,5 +1,8 @@
 from dataclasses import dataclass
 from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import threading
 
 
 class ItemRarity(Enum):
@@ -17,8 +20,9 @@ class ItemType(Enum):
     QUEST = "quest"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Item:
+    """An item definition, shared by every copy a player holds."""
     id: str
     name: str
     description: str = ""
@@ -26,6 +30,135 @@ class Item:
     rarity: ItemRarity = ItemRarity.COMMON
     value: int = 10  # gold/currency value
     sellable: bool = True
+    max_durability: int = 0  # 0 = never wears out
     
     def __hash__(self):
         return hash(self.id)
+    
+    def __deepcopy__(self, memo):
+        return self  # immutable and shared
+    
+    def __reduce__(self):
+        # Unpickle to the registered flyweight when one exists
+        return (_unpickle_item, (self.id, self.name, self.description, self.item_type,
+                                 self.rarity, self.value, self.sellable, self.max_durability))
+
+
+class ItemInstance:
+    """Per-copy state (durability, enchantments) layered over a shared Item.
+
+    Only items that actually carry state need one; everything else reads
+    through to the prototype.
+    """
+    __slots__ = ("proto", "durability", "enchantments")
+
+    def __init__(self, proto: Item, durability: int = None, enchantments: List[str] = None):
+        self.proto = proto
+        self.durability = proto.max_durability if durability is None else durability
+        self.enchantments = enchantments
+
+    def __getattr__(self, name):
+        # Never forward the slot itself (unset mid-copy) or protocol hooks
+        # such as __deepcopy__, which belong to the instance, not the proto.
+        if name == "proto" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.proto, name)
+
+    def __repr__(self):
+        return f"ItemInstance({self.proto.id!r}, durability={self.durability}, enchantments={self.enchantments})"
+
+    def wear(self, amount: int = 1) -> bool:
+        """Reduce durability; returns False once the item breaks."""
+        self.durability = max(0, self.durability - amount)
+        return self.durability > 0
+
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+
+class ItemRegistry:
+    """O(1) lookup of shared item definitions by id.
+
+    Definitions registered from code are available immediately; the data
+    file is only parsed the first time an unknown id is requested. Loading
+    is thread-safe, and a failed load is retried on the next lookup.
+    """
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._items: Dict[str, Item] = {}
+        self._loaded = path is None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        import json
+
+        with self._lock:
+            if self._loaded:  # another thread finished loading while we waited
+                return
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            for item in [item_from_dict(entry) for entry in data.get("items", [])]:
+                self._items.setdefault(item.id, item)
+            # Only now may lookups skip the file
+            self._loaded = True
+
+    def register(self, item: Item) -> Item:
+        """Return the canonical instance for ``item.id``, registering it if new."""
+        return self._items.setdefault(item.id, item)
+
+    def get(self, item_id: str) -> Optional[Item]:
+        item = self._items.get(item_id)
+        if item is None and not self._loaded:
+            self._load()
+            item = self._items.get(item_id)
+        return item
+
+    def create(self, item_id: str, durability: int = None,
+               enchantments: List[str] = None) -> Union[Item, ItemInstance, None]:
+        """A copy for an inventory: the flyweight unless it needs state."""
+        proto = self.get(item_id)
+        if proto is None:
+            return None
+        if proto.max_durability or durability is not None or enchantments:
+            return ItemInstance(proto, durability, enchantments)
+        return proto
+
+    def all(self) -> List[Item]:
+        if not self._loaded:
+            self._load()
+        return list(self._items.values())
+
+    def __contains__(self, item_id: str) -> bool:
+        return self.get(item_id) is not None
+
+
+def item_from_dict(data: dict) -> Item:
+    """Build an Item from a data-file entry."""
+    return Item(
+        id=data["id"],
+        name=data["name"],
+        description=data.get("description", ""),
+        item_type=ItemType(data.get("type", "ingredient")),
+        rarity=ItemRarity(data.get("rarity", "common")),
+        value=data.get("value", 10),
+        sellable=data.get("sellable", True),
+        max_durability=data.get("max_durability", 0),
+    )
+
+
+ITEMS = ItemRegistry(DATA_DIR / "items.json")
+
+
+def intern_item(item: Item) -> Item:
+    """Return the canonical instance for ``item.id``, registering it if new."""
+    return ITEMS.register(item)
+
+
+def get_item(item_id: str) -> Optional[Item]:
+    return ITEMS.get(item_id)
+
+
+def _unpickle_item(*args) -> Item:
+    # The registry's definition wins over the pickled copy, so a stale
+    # blob cannot bring back values since changed in items.json.
+    return ITEMS.get(args[0]) or ITEMS.register(Item(*args))
@@ -0,0 +1,245 @@
+"""Background world generation on a process pool.
+
+``WorldGenQueue.submit`` returns a job immediately; the heavy lifting
+happens in worker processes. Workers report progress through a
+multiprocessing queue handed to them by the pool initializer, and a
+listener thread in the parent folds it into the job records. Identical
+requests (same seed, size and noise parameters) share one job.
+
+With a ``WorldCache`` the workers write their output to the cache and the
+parent maps the file, so a repeat request is answered from disk without
+generating or copying anything.
+"""
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from enum import Enum
+import itertools
+import multiprocessing
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .worldcache import WorldCache
+from .worldstore import WorldStore
+
+MAX_FINISHED_JOBS = 16  # finished jobs kept for polling/dedup, oldest dropped first
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class GenerationParams:
+    """Everything that determines a generated world; used as the dedup key."""
+    seed: int
+    width: int
+    height: int
+    octaves: int = 4
+    persistence: float = 0.5
+    base_freq: int = 4
+    noise: str = "value"  # codexrpg.noise engine; "value" with fbm and no warp is the original generator
+    fractal: str = "fbm"
+    warp: float = 0.0
+    climate: bool = False  # temperature/moisture layers and the Whittaker biome table
+
+
+@dataclass
+class GenerationJob:
+    """A world generation request and its progress."""
+    id: str
+    params: GenerationParams
+    status: JobStatus = JobStatus.QUEUED
+    progress: float = 0.0
+    stage: str = "queued"
+    # (elevation, biomes) lists, or the mapped file when the queue has a cache
+    result: Union[Tuple[List[List[float]], List[List[str]]], WorldStore, None] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    _callbacks: List[Callable[["GenerationJob"], None]] = field(default_factory=list, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.DONE, JobStatus.FAILED)
+
+    def biomes(self) -> List[List[str]]:
+        """Biome rows of a finished job, whichever way the result is stored."""
+        if isinstance(self.result, WorldStore):
+            return self.result.biome_rows()
+        return self.result[1]
+
+    def get_info(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status.value,
+            "progress": round(self.progress, 4),
+            "stage": self.stage,
+            "error": self.error,
+            "seed": self.params.seed,
+            "width": self.params.width,
+            "height": self.params.height,
+        }
+
+
+# Worker-process side
+
+_progress_queue = None
+
+
+def _init_worker(queue):
+    global _progress_queue
+    _progress_queue = queue
+
+
+def _run_generation(job_id: str, params: GenerationParams, cache: Optional[WorldCache] = None):
+    """Generate in a worker; with a cache, store the result there and return None."""
+    from .worldgen import WorldGenerator
+
+    def report(fraction: float, stage: str):
+        _progress_queue.put((job_id, fraction, stage))
+
+    report(0.0, "started")
+    generator = WorldGenerator(params.width, params.height, seed=params.seed)
+    elevation, biomes = generator.generate(octaves=params.octaves, persistence=params.persistence,
+                                           base_freq=params.base_freq, progress=report, noise=params.noise,
+                                           fractal=params.fractal, warp=params.warp, climate=params.climate)
+    if cache is None:
+        return elevation, biomes
+    cache.put(params, elevation, biomes)
+    return None
+
+
+class WorldGenQueue:
+    """Deduplicating job queue for ``WorldGenerator`` runs."""
+    def __init__(self, max_workers: Optional[int] = None, cache: Optional[WorldCache] = None):
+        self.cache = cache
+        self._max_workers = max_workers
+        self._progress = multiprocessing.Queue()
+        self._pool = self._new_pool()
+        self._jobs: "OrderedDict[str, GenerationJob]" = OrderedDict()
+        self._by_params: Dict[GenerationParams, str] = {}
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._listener = threading.Thread(target=self._drain_progress, daemon=True,
+                                          name="worldgen-progress")
+        self._listener.start()
+
+    def submit(self, params: GenerationParams,
+               on_done: Optional[Callable[[GenerationJob], None]] = None) -> GenerationJob:
+        """Queue a generation, or return the job already serving ``params``."""
+        with self._cond:
+            job_id = self._by_params.get(params)
+            job = self._jobs.get(job_id) if job_id else None
+            if job is None or job.status is JobStatus.FAILED:
+                job = GenerationJob(f"job_{next(self._ids)}", params)
+                self._jobs[job.id] = job
+                self._by_params[params] = job.id
+                self._prune()
+                cached = self.cache.get(params) if self.cache is not None else None
+                if cached is not None:
+                    job.result = cached
+                    job.status, job.progress, job.stage = JobStatus.DONE, 1.0, "cached"
+                    job.finished_at = time.time()
+                else:
+                    self._start(job)
+            if on_done is not None:
+                self.on_done(job, on_done)
+            return job
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self._max_workers, initializer=_init_worker,
+                                   initargs=(self._progress,))
+
+    def _start(self, job: GenerationJob):
+        """Hand ``job`` to a worker (lock held).
+
+        A worker that died (OOM, a signal) breaks its pool for good, so a
+        broken pool is replaced and the job resubmitted once; if the new
+        pool fails too the job is marked failed.
+        """
+        for _ in range(2):
+            try:
+                future = self._pool.submit(_run_generation, job.id, job.params, self.cache)
+            except BrokenProcessPool as e:
+                error = e
+                self._pool.shutdown(wait=False)
+                self._pool = self._new_pool()
+                continue
+            future.add_done_callback(lambda f, job=job: self._finish(job, f))
+            return
+        job.status, job.error, job.stage = JobStatus.FAILED, f"worker pool broken: {error}", "failed"
+        job.finished_at = time.time()
+
+    def on_done(self, job: GenerationJob, callback: Callable[[GenerationJob], None]):
+        """Call ``callback(job)`` once it finishes; at once if it already has."""
+        with self._cond:
+            if not job.finished:
+                job._callbacks.append(callback)
+                return
+        callback(job)
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[GenerationJob]:
+        """Block until the job finishes (or ``timeout``); returns the job."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            job = self._jobs.get(job_id)
+            while job is not None and not job.finished:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return job
+
+    def _finish(self, job: GenerationJob, future):
+        with self._cond:
+            # Futures cancelled by shutdown() have no exception to report
+            error = "cancelled" if future.cancelled() else future.exception()
+            if error is None:
+                job.result = future.result()
+                if self.cache is not None:
+                    job.result = self.cache.get(job.params)
+                    if job.result is None:
+                        error = "evicted from the world cache before it was opened"
+            if error is None:
+                job.status, job.progress, job.stage = JobStatus.DONE, 1.0, "done"
+            else:
+                job.status, job.error, job.stage = JobStatus.FAILED, str(error), "failed"
+            job.finished_at = time.time()
+            callbacks, job._callbacks = job._callbacks, []
+            self._cond.notify_all()
+        for callback in callbacks:
+            callback(job)
+
+    def _drain_progress(self):
+        while True:
+            message = self._progress.get()
+            if message is None:
+                return
+            job_id, fraction, stage = message
+            with self._cond:
+                job = self._jobs.get(job_id)
+                if job is not None and not job.finished:
+                    job.status, job.progress, job.stage = JobStatus.RUNNING, fraction, stage
+                    self._cond.notify_all()
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond MAX_FINISHED_JOBS (lock held)."""
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+            if self._by_params.get(job.params) == job.id:
+                del self._by_params[job.params]
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        self._progress.put(None)
@@ -0,0 +1,83 @@
+"""Level-of-detail mip levels for biome maps.
+
+Level 0 is the map itself; level ``n`` has one cell per 2**n x 2**n
+block of tiles, holding the majority biome of its four children in level
+``n - 1`` (ties go to the top-left child). Rows are ``bytes`` of palette
+indices, so a level costs a quarter of the one below it and a whole
+pyramid about a third of the map. Levels are built once, streaming the
+map a pair of rows at a time, so a mapped ``WorldStore`` is never loaded
+whole.
+"""
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple
+
+MAX_LOD = 10  # 1024 tiles per cell side
+
+
+def halve_rows(top: bytes, bottom: bytes) -> bytes:
+    """One row of the next level from two rows of this one."""
+    if len(top) % 2:
+        top += top[-1:]
+        bottom += bottom[-1:]
+    return bytes([a if a == b or a == c or a == d else (b if b == c or b == d else (c if c == d else a))
+                  for a, b, c, d in zip(top[0::2], top[1::2], bottom[0::2], bottom[1::2])])
+
+
+def downsample(rows: Iterable[bytes]) -> Iterator[bytes]:
+    """Halve a level; an odd last row is paired with itself."""
+    it = iter(rows)
+    for top in it:
+        yield halve_rows(top, next(it, top))
+
+
+class MipPyramid:
+    """Mip levels 1..``levels`` of a map whose level 0 is read through ``read_level0``.
+
+    ``read_level0(x, y, w, h)`` returns palette-index rows of a window of
+    the map, clipped to it, like ``WorldStore.tile_rows``.
+    """
+    def __init__(self, palette: Sequence[str], width: int, height: int,
+                 read_level0: Callable[[int, int, int, int], List[bytes]], levels: int = MAX_LOD):
+        self.palette = list(palette)
+        self.width = width
+        self.height = height
+        self._read_level0 = read_level0
+        self._levels: List[List[bytes]] = []
+        rows: Iterable[bytes] = (read_level0(0, y, width, 1)[0] for y in range(height))
+        w, h = width, height
+        while len(self._levels) < levels and (w > 1 or h > 1):
+            level = list(downsample(rows))
+            self._levels.append(level)
+            rows, w, h = level, (w + 1) // 2, (h + 1) // 2
+
+    @classmethod
+    def from_world(cls, world, levels: int = MAX_LOD) -> "MipPyramid":
+        """Pyramid for a ``World``, read from its store when it is mapped."""
+        store = world.store
+        if store is not None:
+            return cls(store.palette, store.width, store.height, store.tile_rows, levels)
+        palette = list(dict.fromkeys(b for row in world.grid for b in row))
+        index = {name: i for i, name in enumerate(palette)}
+
+        def read_grid(x, y, w, h):
+            return [bytes(map(index.__getitem__, row)) for row in world.region(x, y, w, h)]
+
+        return cls(palette, world.width, world.height, read_grid, levels)
+
+    @property
+    def levels(self) -> int:
+        """Coarsest level available."""
+        return len(self._levels)
+
+    def level_size(self, lod: int) -> Tuple[int, int]:
+        scale = 1 << lod
+        return -(-self.width // scale), -(-self.height // scale)
+
+    def tile_rows(self, lod: int, x: int, y: int, w: int, h: int) -> List[bytes]:
+        """Palette-index rows of a window in level ``lod`` cells, clipped to the level."""
+        if not 0 <= lod <= self.levels:
+            raise ValueError(f"lod must be between 0 and {self.levels}")
+        if lod == 0:
+            return self._read_level0(x, y, w, h)
+        level = self._levels[lod - 1]
+        x0, y0 = max(0, x), max(0, y)
+        return [row[x0:max(x0, x + w)] for row in level[y0:max(y0, y + h)]]
@@ -0,0 +1,102 @@
+"""Minimap rendering to palette PNGs, using only ``zlib``.
+
+Map rows are already bytes of palette indices, which is exactly what an
+8-bit palette PNG stores per scanline, so rasterizing is bytes slicing
+and joining: no per-pixel Python work. Rendered images are cached by
+world digest, level of detail and scale; the ETag is derived from the
+same key, so a revalidation never renders anything.
+"""
+from collections import OrderedDict
+from typing import List, Sequence, Tuple
+import struct
+import threading
+import zlib
+
+# Flat colours matching the canvas tiles in web/static/game.js
+BIOME_COLORS = {
+    "water": (0x09, 0x36, 0x5c),
+    "lake": (0x09, 0x36, 0x5c),
+    "plains": (0x96, 0xd3, 0x7d),
+    "forest": (0x16, 0x75, 0x2f),
+    "mountain": (0x73, 0x7d, 0x88),
+    "snow": (0xe8, 0xee, 0xf2),
+    "tundra": (0xa9, 0xb3, 0x9a),
+    "taiga": (0x2f, 0x5d, 0x4a),
+    "swamp": (0x4b, 0x5e, 0x3a),
+    "desert": (0xe3, 0xcb, 0x8a),
+    "savanna": (0xc8, 0xc0, 0x6a),
+    "rainforest": (0x0b, 0x5a, 0x2a),
+}
+UNKNOWN_COLOR = (0x80, 0x80, 0x80)
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+MAX_SCALE = 8  # pixels per cell side
+MAX_PIXELS = 8192 * 8192
+CACHE_SIZE = 32  # rendered images kept, least recently used dropped first
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_png(rows: Sequence[bytes], width: int, palette: Sequence[Tuple[int, int, int]],
+               level: int = 6) -> bytes:
+    """8-bit palette PNG from rows of palette indices."""
+    # Every scanline gets filter type 0 (none)
+    raw = b"\x00" + b"\x00".join(rows) if rows else b""
+    ihdr = struct.pack(">IIBBBBB", width, len(rows), 8, 3, 0, 0, 0)
+    plte = b"".join(bytes(color) for color in palette)
+    return b"".join((PNG_SIGNATURE, _chunk(b"IHDR", ihdr), _chunk(b"PLTE", plte),
+                     _chunk(b"IDAT", zlib.compress(raw, level)), _chunk(b"IEND", b"")))
+
+
+def scale_rows(rows: Sequence[bytes], scale: int) -> List[bytes]:
+    """Repeat every cell ``scale`` times across and every row ``scale`` times down."""
+    if scale == 1:
+        return list(rows)
+    out = []
+    for row in rows:
+        wide = bytearray(len(row) * scale)
+        for k in range(scale):
+            wide[k::scale] = row
+        wide = bytes(wide)
+        out.extend([wide] * scale)
+    return out
+
+
+def render_minimap(mips, lod: int = 0, scale: int = 1) -> bytes:
+    """PNG of a whole ``lod.MipPyramid`` level at ``scale`` pixels per cell."""
+    width, height = mips.level_size(lod)
+    if width * height * scale * scale > MAX_PIXELS:
+        raise ValueError(f"minimap would exceed {MAX_PIXELS} pixels; use a coarser lod or smaller scale")
+    rows = scale_rows(mips.tile_rows(lod, 0, 0, width, height), scale)
+    colors = [BIOME_COLORS.get(name, UNKNOWN_COLOR) for name in mips.palette]
+    return encode_png(rows, width * scale, colors)
+
+
+class MinimapCache:
+    """Thread-safe LRU of rendered minimaps keyed by world digest, lod and scale."""
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def etag(world, lod: int, scale: int) -> str:
+        return f"{world.digest()[:20]}-{lod}-{scale}"
+
+    def get(self, world, lod: int = 0, scale: int = 1) -> Tuple[str, bytes]:
+        """(etag, png) for ``world``, rendering on a miss."""
+        if not 1 <= scale <= MAX_SCALE:
+            raise ValueError(f"scale must be between 1 and {MAX_SCALE}")
+        key = self.etag(world, lod, scale)
+        with self._lock:
+            png = self._images.get(key)
+            if png is not None:
+                self._images.move_to_end(key)
+                return key, png
+        png = render_minimap(world.mips(), lod, scale)  # outside the lock; a racing render is harmless
+        with self._lock:
+            self._images[key] = png
+            while len(self._images) > self.size:
+                self._images.popitem(last=False)
+        return key, png
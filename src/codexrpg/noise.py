@@ -0,0 +1,214 @@
+"""Seeded 2D noise engines for world generation.
+
+Every engine evaluates a batch of points per call: ``sample(xs, ys)``
+takes parallel coordinate sequences and returns one value in about
+[-1, 1] per point. The per-point work is a tight loop over local
+variables inside that one call, never a Python function call per point.
+(numpy is not a dependency of the core package, so the batches are plain
+lists.) ``fbm``, ``ridged`` and ``warp`` combine octaves of any engine
+and return values in [0, 1].
+
+Output depends only on the seed: permutation tables are drawn from
+``random.Random(seed)``.
+"""
+from typing import Dict, List, Sequence, Type
+import math
+import random
+
+# Gradient directions, picked by the low three bits of a lattice hash
+GRADIENTS = ((1.0, 1.0), (-1.0, 1.0), (1.0, -1.0), (-1.0, -1.0),
+             (1.0, 0.0), (-1.0, 0.0), (0.0, 1.0), (0.0, -1.0))
+OCTAVE_SHIFT = 19.19  # moves each octave off the shared lattice origin
+WARP_SHIFT = (5.2, 1.3)  # decorrelates the two warp displacement fields
+
+
+def _permutation(rnd: random.Random) -> List[int]:
+    perm = list(range(256))
+    rnd.shuffle(perm)
+    return perm * 2  # index with (i & 255) + (j & 255) without wrapping
+
+
+class ValueNoise:
+    """Hashed lattice values with smoothstep interpolation."""
+    def __init__(self, seed=None):
+        rnd = random.Random(seed)
+        self.perm = _permutation(rnd)
+        self.values = [rnd.uniform(-1.0, 1.0) for _ in range(256)]
+
+    def sample(self, xs: Sequence[float], ys: Sequence[float]) -> List[float]:
+        perm, values = self.perm, self.values
+        floor = math.floor
+        out = []
+        append = out.append
+        for x, y in zip(xs, ys):
+            ix, iy = floor(x), floor(y)
+            fx, fy = x - ix, y - iy
+            u = fx * fx * (3.0 - 2.0 * fx)
+            v = fy * fy * (3.0 - 2.0 * fy)
+            a = perm[ix & 255] + (iy & 255)
+            b = perm[(ix + 1) & 255] + (iy & 255)
+            top = values[perm[a]] + (values[perm[b]] - values[perm[a]]) * u
+            bottom = values[perm[a + 1]] + (values[perm[b + 1]] - values[perm[a + 1]]) * u
+            append(top + (bottom - top) * v)
+        return out
+
+
+class GradientNoise:
+    """Perlin gradient noise with quintic fade, scaled by sqrt(2) to match the other engines' spread."""
+    def __init__(self, seed=None):
+        self.perm = _permutation(random.Random(seed))
+
+    def sample(self, xs: Sequence[float], ys: Sequence[float]) -> List[float]:
+        perm, grads = self.perm, GRADIENTS
+        floor = math.floor
+        k = math.sqrt(2.0)
+        out = []
+        append = out.append
+        for x, y in zip(xs, ys):
+            ix, iy = floor(x), floor(y)
+            fx, fy = x - ix, y - iy
+            u = fx * fx * fx * (fx * (fx * 6.0 - 15.0) + 10.0)
+            v = fy * fy * fy * (fy * (fy * 6.0 - 15.0) + 10.0)
+            a = perm[ix & 255] + (iy & 255)
+            b = perm[(ix + 1) & 255] + (iy & 255)
+            g = grads[perm[a] & 7]
+            n00 = g[0] * fx + g[1] * fy
+            g = grads[perm[b] & 7]
+            n10 = g[0] * (fx - 1.0) + g[1] * fy
+            g = grads[perm[a + 1] & 7]
+            n01 = g[0] * fx + g[1] * (fy - 1.0)
+            g = grads[perm[b + 1] & 7]
+            n11 = g[0] * (fx - 1.0) + g[1] * (fy - 1.0)
+            top = n00 + (n10 - n00) * u
+            append((top + (n01 + (n11 - n01) * u - top) * v) * k)
+        return out
+
+
+_F2 = 0.5 * (math.sqrt(3.0) - 1.0)
+_G2 = (3.0 - math.sqrt(3.0)) / 6.0
+
+
+class SimplexNoise:
+    """2D simplex noise: three corner contributions per point, no axis-aligned artifacts."""
+    def __init__(self, seed=None):
+        self.perm = _permutation(random.Random(seed))
+
+    def sample(self, xs: Sequence[float], ys: Sequence[float]) -> List[float]:
+        perm, grads = self.perm, GRADIENTS
+        floor = math.floor
+        f2, g2 = _F2, _G2
+        out = []
+        append = out.append
+        for x, y in zip(xs, ys):
+            s = (x + y) * f2
+            i, j = floor(x + s), floor(y + s)
+            t = (i + j) * g2
+            x0, y0 = x - (i - t), y - (j - t)
+            i1, j1 = (1, 0) if x0 > y0 else (0, 1)
+            x1, y1 = x0 - i1 + g2, y0 - j1 + g2
+            x2, y2 = x0 - 1.0 + 2.0 * g2, y0 - 1.0 + 2.0 * g2
+            ii, jj = i & 255, j & 255
+            n = 0.0
+            t0 = 0.5 - x0 * x0 - y0 * y0
+            if t0 > 0.0:
+                g = grads[perm[ii + perm[jj]] & 7]
+                t0 *= t0
+                n += t0 * t0 * (g[0] * x0 + g[1] * y0)
+            t1 = 0.5 - x1 * x1 - y1 * y1
+            if t1 > 0.0:
+                g = grads[perm[ii + i1 + perm[jj + j1]] & 7]
+                t1 *= t1
+                n += t1 * t1 * (g[0] * x1 + g[1] * y1)
+            t2 = 0.5 - x2 * x2 - y2 * y2
+            if t2 > 0.0:
+                g = grads[perm[ii + 1 + perm[jj + 1]] & 7]
+                t2 *= t2
+                n += t2 * t2 * (g[0] * x2 + g[1] * y2)
+            append(70.0 * n)
+        return out
+
+
+ENGINES: Dict[str, Type] = {"value": ValueNoise, "gradient": GradientNoise, "simplex": SimplexNoise}
+FRACTALS = ("fbm", "ridged")
+
+
+def make_engine(name: str, seed=None):
+    try:
+        return ENGINES[name](seed)
+    except KeyError:
+        raise ValueError(f"unknown noise engine {name!r} (choose from {', '.join(ENGINES)})") from None
+
+
+def _octave(noise, xs, ys, freq: float, o: int) -> List[float]:
+    shift = o * OCTAVE_SHIFT
+    return noise.sample([x * freq + shift for x in xs], [y * freq + shift for y in ys])
+
+
+def fbm(noise, xs: Sequence[float], ys: Sequence[float], octaves: int = 4,
+        persistence: float = 0.5, lacunarity: float = 2.0) -> List[float]:
+    """Fractal Brownian motion: summed octaves, rescaled to [0, 1]."""
+    total = [0.0] * len(xs)
+    amp, freq, max_amp = 1.0, 1.0, 0.0
+    for o in range(octaves):
+        total = [t + n * amp for t, n in zip(total, _octave(noise, xs, ys, freq, o))]
+        max_amp += amp
+        amp *= persistence
+        freq *= lacunarity
+    scale = 0.5 / max_amp
+    return [min(1.0, max(0.0, 0.5 + t * scale)) for t in total]
+
+
+def ridged(noise, xs: Sequence[float], ys: Sequence[float], octaves: int = 4,
+           persistence: float = 0.5, lacunarity: float = 2.0, gain: float = 2.0) -> List[float]:
+    """Ridged multifractal: sharp crests where the noise crosses zero, in [0, 1].
+
+    Each octave is weighted by the one before it, so detail piles up on
+    the ridges and valleys stay smooth.
+    """
+    total = [0.0] * len(xs)
+    weight = [1.0] * len(xs)
+    amp, freq, max_amp = 1.0, 1.0, 0.0
+    for o in range(octaves):
+        signal = [(1.0 - abs(n)) ** 2 * w for n, w in zip(_octave(noise, xs, ys, freq, o), weight)]
+        total = [t + s * amp for t, s in zip(total, signal)]
+        weight = [min(1.0, s * gain) for s in signal]
+        max_amp += amp
+        amp *= persistence
+        freq *= lacunarity
+    return [min(1.0, t / max_amp) for t in total]
+
+
+def warp(noise, xs: Sequence[float], ys: Sequence[float], strength: float, octaves: int = 2):
+    """Coordinates displaced by two fbm fields of ``noise`` (domain warping).
+
+    Returns ``(xs, ys)``; feed them to ``fbm``/``ridged`` for swirled,
+    less grid-aligned features.
+    """
+    dx, dy = WARP_SHIFT
+    qx = fbm(noise, xs, ys, octaves)
+    qy = fbm(noise, [x + dx for x in xs], [y + dy for y in ys], octaves)
+    scale = 2.0 * strength
+    return ([x + (q - 0.5) * scale for x, q in zip(xs, qx)],
+            [y + (q - 0.5) * scale for y, q in zip(ys, qy)])
+
+
+def field(noise, xs: Sequence[float], ys: Sequence[float], octaves: int = 4, persistence: float = 0.5,
+          fractal: str = "fbm", warp_strength: float = 0.0, lacunarity: float = 2.0) -> List[float]:
+    """One batch of a full noise field in [0, 1]: optional warp, then fbm or ridged octaves."""
+    if fractal not in FRACTALS:
+        raise ValueError(f"unknown fractal {fractal!r} (choose from {', '.join(FRACTALS)})")
+    if warp_strength:
+        xs, ys = warp(noise, xs, ys, warp_strength)
+    combine = ridged if fractal == "ridged" else fbm
+    return combine(noise, xs, ys, octaves, persistence, lacunarity)
+
+
+def grid_points(width: int, height: int, y0: int, y1: int, freq: float):
+    """Coordinates of rows ``y0..y1`` of a ``width`` x ``height`` map spanning ``freq`` lattice cells."""
+    row = [x / width * freq for x in range(width)]
+    xs: List[float] = []
+    ys: List[float] = []
+    for y in range(y0, y1):
+        xs.extend(row)
+        ys.extend([y / height * freq] * width)
+    return xs, ys
@@ -1,7 +1,12 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional
 from enum import Enum
+import time
 from .item import Item, ItemType
+from .economy import MerchantEconomy
+from .reputation import Faction, ReputationSystem
+from .crafting import HEALING_POTION, IRON_SWORD, COMMON_HERB, PURE_WATER, IRON_ORE, COAL
+from .spatial import SpatialGrid, Position, resolve_location
 
 
 class NPCRole(Enum):
@@ -22,31 +27,91 @@ class NPC:
     dialogue: str = "Hello, traveler!"
     
     # Merchant inventory
-    buy_prices: Dict[str, int] = None  # item_id -> price they pay
+    buy_prices: Dict[str, int] = None  # item_id -> base price they pay
     sell_inventory: List[Item] = None  # items they have for sale
+    faction: Optional[Faction] = None  # drives reputation discounts
+    economy: MerchantEconomy = None
+    position: Optional[Position] = None  # world tile; defaults from location
+    entity_id: Optional[int] = None  # set when spawned into an ecs.Registry
     
     def __post_init__(self):
         if self.buy_prices is None:
             self.buy_prices = {}
         if self.sell_inventory is None:
             self.sell_inventory = []
+        if self.economy is None:
+            self.economy = MerchantEconomy(self.buy_prices)
+        self.position = resolve_location(self.location, self.position)
     
     def talk(self) -> str:
         return self.dialogue
     
-    def buy_from_player(self, player_item_id: str) -> int:
+    def buy_from_player(self, player_item_id: str, reputation: ReputationSystem = None,
+                        now: Optional[float] = None) -> int:
         """Return purchase price for item, or -1 if not buying."""
-        return self.buy_prices.get(player_item_id, -1)
+        discount = MerchantEconomy.discount(self.faction, reputation, now)
+        return self.economy.buy_price(player_item_id, discount, now)
     
     def sell_to_player(self, item_id: str) -> Item:
         """Return item from inventory by id."""
-        for item in self.sell_inventory:
-            if item.id == item_id:
-                return item
-        return None
+        # sell_inventory is a plain list callers edit directly, and a
+        # merchant lists a handful of items, so it is scanned rather than
+        # indexed (quantities and prices are indexed by the economy).
+        return next((item for item in self.sell_inventory if item.id == item_id), None)
     
     def list_for_sale(self) -> List[Item]:
         return list(self.sell_inventory)
+    
+    def stock_item(self, item: Item, quantity: int = 1, max_quantity: int = None,
+                   restock_amount: int = 1, restock_interval: float = 3600.0):
+        """Put an item up for sale with a stock level and restock schedule."""
+        if self.sell_to_player(item.id) is None:
+            self.sell_inventory.append(item)
+        self.economy.add_stock(item, quantity, max_quantity, restock_amount, restock_interval)
+    
+    def quote_price(self, item_id: str, reputation: ReputationSystem = None,
+                    now: Optional[float] = None) -> int:
+        """Price the player pays for one unit, or -1 if not for sale."""
+        discount = MerchantEconomy.discount(self.faction, reputation, now)
+        return self.economy.sell_price(item_id, discount, now)
+    
+    def quote_inventory(self, items: List[Item], reputation: ReputationSystem = None,
+                        now: Optional[float] = None) -> Dict[str, dict]:
+        """Batch buy quotes for a player's items, grouped by item id."""
+        discount = MerchantEconomy.discount(self.faction, reputation, now)
+        return self.economy.quote(items, discount, now)
+    
+    def sell_item(self, player, item_id: str, quantity: int = 1, now: Optional[float] = None) -> bool:
+        """Sell stocked items to a player for gold."""
+        if quantity < 1:
+            return False
+        if now is None:
+            now = time.time()
+        item = self.sell_to_player(item_id)
+        price = self.quote_price(item_id, player.reputation, now)
+        if item is None or price < 0 or self.economy.get_stock(item_id, now) < quantity:
+            return False
+        if not player.spend_gold(price * quantity):
+            return False
+        self.economy.take_stock(item_id, quantity, now)
+        player.inventory.extend([item] * quantity)
+        return True
+    
+    def buy_item(self, player, item_id: str, quantity: int = 1, now: Optional[float] = None) -> int:
+        """Buy items from a player's inventory. Returns gold paid."""
+        if quantity < 1:
+            return 0
+        if now is None:
+            now = time.time()
+        owned = [item for item in player.inventory if item.id == item_id][:quantity]
+        quote = self.quote_inventory(owned, player.reputation, now).get(item_id)
+        if not quote or quote["unit_price"] < 0:
+            return 0
+        for item in owned:
+            player.remove_item(item)
+        self.economy.record_player_sale(item_id, len(owned), now)
+        player.add_gold(quote["total"])
+        return quote["total"]
 
 
 # Example NPCs for sandbox world
@@ -55,24 +120,34 @@ BLACKSMITH = NPC(
     name="Gruk Oakforge",
     role=NPCRole.BLACKSMITH,
     location="blacksmith_forge",
-    dialogue="Need weapons or armor? I can forge the finest..."
+    dialogue="Need weapons or armor? I can forge the finest...",
+    buy_prices={"ore_iron": 6, "coal": 3},
+    faction=Faction.BLACKSMITH_UNION
 )
+BLACKSMITH.stock_item(IRON_SWORD, quantity=3, restock_interval=4 * 3600)
 
 ALCHEMIST = NPC(
     id="alchemist_zara",
     name="Zara Mistwood",
     role=NPCRole.ALCHEMIST,
     location="alchemy_shop",
-    dialogue="Looking for potions? I have exactly what you need."
+    dialogue="Looking for potions? I have exactly what you need.",
+    buy_prices={"herb_common": 4, "water_pure": 1},
+    faction=Faction.MERCHANTS_GUILD
 )
+ALCHEMIST.stock_item(HEALING_POTION, quantity=10, restock_interval=1800)
 
 MERCHANT = NPC(
     id="merchant_tudor",
     name="Tudor the Wanderer",
     role=NPCRole.MERCHANT,
     location="market_square",
-    dialogue="Best deals in all the realm!"
+    dialogue="Best deals in all the realm!",
+    buy_prices={"herb_common": 3, "water_pure": 1, "ore_iron": 5, "coal": 2, "potion_heal": 30},
+    faction=Faction.MERCHANTS_GUILD
 )
+for _item in (COMMON_HERB, PURE_WATER, IRON_ORE, COAL):
+    MERCHANT.stock_item(_item, quantity=20, restock_amount=5, restock_interval=600)
 
 VILLAGER = NPC(
     id="villager_mae",
@@ -89,10 +164,36 @@ NPCS = {
     "villager_mae": VILLAGER,
 }
 
+NPC_INDEX = SpatialGrid()
+for _npc in NPCS.values():
+    NPC_INDEX.insert(_npc.id, *_npc.position)
+
+
+def register_npc(npc: NPC):
+    """Add an NPC to the world and the spatial index."""
+    NPCS[npc.id] = npc
+    if npc.position is not None:
+        NPC_INDEX.insert(npc.id, *npc.position)
+    else:
+        NPC_INDEX.remove(npc.id)
+
+
+def move_npc(npc_id: str, x: int, y: int) -> bool:
+    """Move an NPC to a new tile, keeping the index current."""
+    npc = NPCS.get(npc_id)
+    if npc is None:
+        return False
+    npc.position = (x, y)
+    NPC_INDEX.insert(npc_id, x, y)
+    return True
+
 
 def get_npc(npc_id: str) -> NPC:
     return NPCS.get(npc_id)
 
 
-def list_npcs() -> dict:
-    return NPCS
+def list_npcs(near: Optional[Position] = None, radius: float = 5) -> dict:
+    """All NPCs, or only those within ``radius`` tiles of ``near``."""
+    if near is None:
+        return NPCS
+    return {npc_id: NPCS[npc_id] for npc_id in NPC_INDEX.query_radius(near[0], near[1], radius)}
@@ -0,0 +1,207 @@
+"""Grid pathfinding over the world's biome map.
+
+Movement is 4-directional with unit cost, matching the browser client.
+Connected components are labelled once up front so unreachable goals are
+rejected in O(1); reachable ones are solved with a binary-heap A*. An
+optional hierarchical mode first routes over chunk-level regions and then
+runs A* only inside the chosen corridor of chunks.
+"""
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+import heapq
+
+Point = Tuple[int, int]
+
+# Biomes nobody can walk through
+IMPASSABLE = frozenset({"lake", "water", "mountain"})
+
+
+class Pathfinder:
+    """Answers path queries on a fixed biome grid."""
+    def __init__(self, grid: List[List[str]], impassable=IMPASSABLE, chunk_size: int = 16):
+        passable = bytearray(0 if biome in impassable else 1 for row in grid for biome in row)
+        self._setup(len(grid[0]) if grid else 0, len(grid), passable, impassable, chunk_size)
+
+    @classmethod
+    def from_world(cls, world, impassable=IMPASSABLE, chunk_size: int = 16) -> "Pathfinder":
+        """Pathfinder for a ``World``; a mapped one is read a row at a time, never loaded whole."""
+        store = world.store
+        if store is None:
+            return cls(world.grid, impassable, chunk_size)
+        table = bytes(0 if name in impassable else 1 for name in store.palette).ljust(256, b"\x00")
+        passable = bytearray()
+        for y in range(store.height):
+            passable += store.tile_rows(0, y, store.width, 1)[0].translate(table)
+        finder = cls.__new__(cls)
+        finder._setup(store.width, store.height, passable, impassable, chunk_size)
+        return finder
+
+    def _setup(self, width: int, height: int, passable: bytearray, impassable, chunk_size: int):
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.impassable = impassable
+        self.passable = passable
+        self.components = array("i", [-1]) * (self.width * self.height)
+        self._label_components()
+        self._regions: Optional[array] = None
+        self._region_links: Dict[int, Set[int]] = {}
+
+    def _neighbors(self, idx: int):
+        w = self.width
+        x = idx % w
+        if x + 1 < w:
+            yield idx + 1
+        if x > 0:
+            yield idx - 1
+        if idx + w < len(self.passable):
+            yield idx + w
+        if idx >= w:
+            yield idx - w
+
+    def _flood(self, labels: array, seed: int, label: int, bounds: Tuple[int, int, int, int] = None):
+        passable = self.passable
+        w = self.width
+        labels[seed] = label
+        queue = deque([seed])
+        while queue:
+            idx = queue.popleft()
+            for nb in self._neighbors(idx):
+                if labels[nb] != -1 or not passable[nb]:
+                    continue
+                if bounds is not None:
+                    x, y = nb % w, nb // w
+                    if not (bounds[0] <= x < bounds[2] and bounds[1] <= y < bounds[3]):
+                        continue
+                labels[nb] = label
+                queue.append(nb)
+
+    def _label_components(self):
+        labels = self.components
+        label = 0
+        for idx, open_ in enumerate(self.passable):
+            if open_ and labels[idx] == -1:
+                self._flood(labels, idx, label)
+                label += 1
+        self.component_count = label
+
+    def in_bounds(self, p: Point) -> bool:
+        return 0 <= p[0] < self.width and 0 <= p[1] < self.height
+
+    def is_passable(self, p: Point) -> bool:
+        return self.in_bounds(p) and bool(self.passable[p[1] * self.width + p[0]])
+
+    def reachable(self, start: Point, goal: Point) -> bool:
+        """True if a path exists; constant time after construction."""
+        if not (self.is_passable(start) and self.is_passable(goal)):
+            return False
+        w = self.width
+        return self.components[start[1] * w + start[0]] == self.components[goal[1] * w + goal[0]]
+
+    def set_tile(self, p: Point, biome: str):
+        """Change a tile's biome and refresh connectivity."""
+        idx = p[1] * self.width + p[0]
+        passable = 0 if biome in self.impassable else 1
+        if self.passable[idx] == passable:
+            return
+        self.passable[idx] = passable
+        self.components = array("i", [-1]) * (self.width * self.height)
+        self._label_components()
+        self._regions = None
+
+    def find_path(self, start: Point, goal: Point, hierarchical: bool = False) -> Optional[List[Point]]:
+        """Shortest path from start to goal inclusive, or None if unreachable.
+
+        With ``hierarchical`` the search is confined to a corridor of chunks
+        found on the region graph; the path is valid but may be slightly
+        longer than optimal.
+        """
+        if not self.reachable(start, goal):
+            return None
+        w = self.width
+        s, g = start[1] * w + start[0], goal[1] * w + goal[0]
+        allowed = None
+        if hierarchical:
+            if self._regions is None:
+                self._build_regions()
+            allowed = self._region_corridor(self._regions[s], self._regions[g])
+        return self._astar(s, g, allowed)
+
+    def _astar(self, start: int, goal: int, allowed: Optional[Set[int]]) -> Optional[List[Point]]:
+        w = self.width
+        gx, gy = goal % w, goal // w
+        passable = self.passable
+        regions = self._regions
+        g_score = {start: 0}
+        came_from = {start: -1}
+        open_heap = [(abs(start % w - gx) + abs(start // w - gy), 0, start)]
+        while open_heap:
+            _, g, idx = heapq.heappop(open_heap)
+            if idx == goal:
+                path = []
+                while idx != -1:
+                    path.append((idx % w, idx // w))
+                    idx = came_from[idx]
+                path.reverse()
+                return path
+            if g > g_score[idx]:
+                continue  # stale heap entry
+            for nb in self._neighbors(idx):
+                if not passable[nb]:
+                    continue
+                if allowed is not None and regions[nb] not in allowed:
+                    continue
+                ng = g + 1
+                if ng < g_score.get(nb, ng + 1):
+                    g_score[nb] = ng
+                    came_from[nb] = idx
+                    h = abs(nb % w - gx) + abs(nb // w - gy)
+                    heapq.heappush(open_heap, (ng + h, ng, nb))
+        return None
+
+    def _build_regions(self):
+        """Label chunk-local components and link the ones that touch."""
+        w, h, size = self.width, self.height, self.chunk_size
+        regions = array("i", [-1]) * (w * h)
+        label = 0
+        for cy in range(0, h, size):
+            for cx in range(0, w, size):
+                bounds = (cx, cy, min(cx + size, w), min(cy + size, h))
+                for y in range(bounds[1], bounds[3]):
+                    for x in range(bounds[0], bounds[2]):
+                        idx = y * w + x
+                        if self.passable[idx] and regions[idx] == -1:
+                            self._flood(regions, idx, label, bounds)
+                            label += 1
+        links: Dict[int, Set[int]] = {r: set() for r in range(label)}
+        for idx, region in enumerate(regions):
+            if region == -1:
+                continue
+            # Only right and down neighbours can sit across a chunk border
+            x = idx % w
+            for nb in ((idx + 1) if x + 1 < w else -1, (idx + w) if idx + w < w * h else -1):
+                if nb != -1 and regions[nb] not in (-1, region):
+                    links[region].add(regions[nb])
+                    links[regions[nb]].add(region)
+        self._regions = regions
+        self._region_links = links
+
+    def _region_corridor(self, start: int, goal: int) -> Set[int]:
+        """Regions on a shortest region-graph route from start to goal."""
+        came_from = {start: None}
+        queue = deque([start])
+        while queue:
+            region = queue.popleft()
+            if region == goal:
+                break
+            for nb in self._region_links[region]:
+                if nb not in came_from:
+                    came_from[nb] = region
+                    queue.append(nb)
+        corridor = set()
+        region = goal
+        while region is not None:
+            corridor.add(region)
+            region = came_from[region]
+        return corridor
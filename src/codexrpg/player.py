@@ -8,10 +8,13 @@ from .crafting import CraftingSystem
 from .reputation import ReputationSystem, Faction
 from .events import EventSystem
 from .homestead import HomesteadSystem, create_starter_home
+from .systems.cooldowns import Cooldowns
+from .spatial import Position
 
 
 class Player:
-    def __init__(self, name: str = "Hero", character_class: CharacterClass = None, max_hp: int = None):
+    def __init__(self, name: str = "Hero", character_class: CharacterClass = None, max_hp: int = None,
+                 rng=None):
         self.name = name
         self.character_class = character_class or WARRIOR
         self.max_hp = max_hp or self.character_class.base_hp
@@ -26,8 +29,11 @@ class Player:
         
         # New sandbox systems
         self.reputation = ReputationSystem()
-        self.events = EventSystem()
+        self.events = EventSystem(rng.stream("events") if rng is not None else None)
         self.homesteads = HomesteadSystem()
+        self.cooldowns = Cooldowns()
+        self.position: Optional[Position] = None  # world tile, once placed
+        self.entity_id: Optional[int] = None  # set when spawned into an ecs.Registry
         
         # Create starter home
         starter_home = create_starter_home()
@@ -57,6 +63,28 @@ class Player:
             return True
         return False
     
+    def store_inventory(self, homestead_id: str = None) -> int:
+        """Move the inventory into a homestead (active one by default).
+
+        Only as many items as the homestead has room for are moved; the
+        rest stay in the inventory.
+        """
+        home = self.homesteads.get_homestead(homestead_id) if homestead_id else self.homesteads.get_active_homestead()
+        if not home:
+            return 0
+        moved = home.deposit_items(self.inventory)
+        del self.inventory[:moved]
+        return moved
+    
+    def retrieve_from_home(self, item_id: str, quantity: int = 1, homestead_id: str = None) -> int:
+        """Take items out of a homestead into the inventory."""
+        home = self.homesteads.get_homestead(homestead_id) if homestead_id else self.homesteads.get_active_homestead()
+        if not home:
+            return 0
+        items = home.withdraw_items(item_id, quantity)
+        self.inventory.extend(items)
+        return len(items)
+    
     def add_gold(self, amount: int):
         self.gold += amount
     
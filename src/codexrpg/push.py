@@ -0,0 +1,128 @@
+"""Versioned state snapshots pushed to waiting subscribers.
+
+A ``StateChannel`` wraps a snapshot function (e.g. ``Player.get_info``).
+Writers only call ``mark_dirty()``; the snapshot is rebuilt once per burst
+of changes, after a short coalescing window, no matter how many clients
+are listening. Subscribers block in ``wait()`` and receive a diff against
+the version they already have, so an idle channel costs nothing.
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+COALESCE_SECONDS = 0.05  # changes closer together than this share one frame
+MAX_AGE_SECONDS = 30.0  # re-check time-driven state (production, decay) this often
+
+_MISSING = object()
+
+
+def diff_state(old: dict, new: dict) -> dict:
+    """Top-level keys whose value changed; removed keys map to None."""
+    diff = {key: value for key, value in new.items() if old.get(key, _MISSING) != value}
+    for key in old.keys() - new.keys():
+        diff[key] = None
+    return diff
+
+
+class StateChannel:
+    """Publish snapshots of one piece of state as numbered versions."""
+    def __init__(self, snapshot: Callable[[], dict], coalesce: float = COALESCE_SECONDS,
+                 max_age: float = MAX_AGE_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self._snapshot = snapshot
+        self.coalesce = coalesce
+        self.max_age = max_age
+        self.clock = clock
+        self.version = 0
+        self.snapshots_built = 0
+        self._state: Dict = {}
+        self._diff: Dict = {}
+        self._dirty_since: Optional[float] = None
+        self._built_at = float("-inf")
+        self._cond = threading.Condition()
+        self._listeners: List[Callable[[], None]] = []
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Call ``callback`` (from any thread) whenever there may be news.
+
+        For subscribers that cannot block a thread in ``wait()``, e.g. an
+        asyncio loop; the callback must be cheap and must not block.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[], None]):
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def _notify(self):
+        self._cond.notify_all()
+        for callback in list(self._listeners):
+            callback()
+
+    def mark_dirty(self):
+        """Note that the state may have changed; cheap enough to call on every write."""
+        with self._cond:
+            if self._dirty_since is None:
+                self._dirty_since = self.clock()
+            self._notify()
+
+    def _rebuild(self):
+        """Take a snapshot and publish a new version if it differs (lock held)."""
+        self._dirty_since = None
+        state = self._snapshot()
+        self.snapshots_built += 1
+        self._built_at = self.clock()
+        diff = diff_state(self._state, state)
+        if diff or self.version == 0:
+            self._state, self._diff = state, diff
+            self.version += 1
+            self._notify()
+
+    def _next_due(self) -> float:
+        """Clock time of the next pending rebuild (lock held)."""
+        if self._dirty_since is not None:
+            return self._dirty_since + self.coalesce
+        return self._built_at + self.max_age
+
+    def seconds_until_due(self) -> float:
+        """How long a subscriber may sleep before ``poll()`` could have news."""
+        with self._cond:
+            return max(0.0, self._next_due() - self.clock())
+
+    def frame(self, since: int) -> dict:
+        """What a subscriber at version ``since`` needs to catch up."""
+        with self._cond:
+            if self.version == 0:
+                self._rebuild()
+            if since == self.version - 1 and since > 0:
+                return {"version": self.version, "diff": dict(self._diff)}
+            return {"version": self.version, "state": dict(self._state)}
+
+    def poll(self, since: int) -> Optional[dict]:
+        """Non-blocking ``wait()``: a frame newer than ``since``, or None.
+
+        A ``since`` ahead of this channel (a client reconnecting after a
+        server restart reset the count) gets a full ``state`` frame at once.
+        """
+        with self._cond:
+            if self.version == 0 or self.clock() >= self._next_due():
+                # Pending changes have settled, or time-driven state (homestead
+                # output) is due a re-check nobody marked
+                self._rebuild()
+            if self.version != since:
+                return self.frame(since)
+            return None
+
+    def wait(self, since: int, timeout: float) -> Optional[dict]:
+        """Block until there is a version newer than ``since``; None on timeout."""
+        deadline = self.clock() + timeout
+        with self._cond:
+            while True:
+                frame = self.poll(since)
+                if frame is not None:
+                    return frame
+                now = self.clock()
+                if now >= deadline:
+                    return None
+                self._cond.wait(max(0.0, min(self._next_due(), deadline) - now))
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 
 
@@ -10,7 +10,7 @@ class QuestStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Quest:
     """Represents a sandbox quest/task."""
     id: str
@@ -35,6 +35,10 @@ class Quest:
         return False
 
 
+# Quest definitions by id; saves restore each player's status onto a copy
+QUESTS: Dict[str, Quest] = {}
+
+
 class QuestLog:
     """Tracks quests for a player."""
     def __init__(self):
@@ -0,0 +1,109 @@
+"""Record shell sessions and replay them headlessly.
+
+A recording is JSON lines: a header with everything needed to rebuild the
+starting state (master seed, player name and class, start time), then one
+entry per command with the time the session saw and a digest of its
+output. Replaying feeds the recorded times back through the session clock,
+so lazily evaluated systems (homestead production, event expiry,
+reputation decay) see exactly what the original run saw, with no waiting.
+
+A ``load`` entry also carries the save data it read, random stream
+positions included, so a replay never reads save files: it resumes from
+the recorded state even if the file has since changed or gone.
+"""
+from dataclasses import dataclass, field
+import hashlib
+import json
+import time
+from typing import IO, List, Optional, Tuple
+
+RECORDING_VERSION = 1
+
+
+def output_digest(output: str) -> str:
+    return hashlib.sha256(output.encode("utf-8")).hexdigest()[:16]
+
+
+class ActionRecorder:
+    """Append every command a Session executes to a recording file."""
+    def __init__(self, stream: IO[str], seed, name: str, character_class: str, started: float):
+        self.stream = stream
+        self.count = 0
+        self._write({"recording": RECORDING_VERSION, "seed": seed, "name": name,
+                     "class": character_class, "started": started})
+
+    @classmethod
+    def for_session(cls, stream: IO[str], session) -> "ActionRecorder":
+        """Start recording ``session`` (which must be freshly created)."""
+        player = session.player
+        recorder = cls(stream, session.seed, player.name, player.character_class.id, session.now)
+        session.recorder = recorder
+        return recorder
+
+    def _write(self, entry: dict):
+        self.stream.write(json.dumps(entry) + "\n")
+
+    def record(self, now: float, line: str, output: str, state: Optional[dict] = None):
+        """Log one command; ``state`` is the save data a ``load`` read."""
+        self.count += 1
+        entry = {"t": now, "cmd": line.rstrip("\n"), "out": output_digest(output)}
+        if state is not None:
+            entry["state"] = state
+        self._write(entry)
+
+    def close(self):
+        self.stream.flush()
+
+
+def load_recording(path: str) -> Tuple[dict, List[dict]]:
+    """Return (header, actions) from a recording file."""
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("recording", 0) > RECORDING_VERSION:
+            raise ValueError(f"recording version {header['recording']} is newer than supported")
+        actions = [json.loads(line) for line in f if line.strip()]
+    return header, actions
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of a replay."""
+    session: object
+    commands: int
+    elapsed: float  # wall-clock seconds spent re-simulating
+    mismatches: List[int] = field(default_factory=list)  # indexes whose output differed
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+
+def replay(path: str, stop_on_mismatch: bool = False) -> ReplayResult:
+    """Re-run a recording as fast as possible and compare every output."""
+    from .character_class import get_class_by_id
+    from .session import Session
+
+    header, actions = load_recording(path)
+    clock = _ReplayClock(header["started"])
+    session = Session(seed=header["seed"], clock=clock, name=header["name"],
+                      character_class=get_class_by_id(header["class"]), persist=False)
+    mismatches = []
+    started = time.perf_counter()
+    for i, action in enumerate(actions):
+        clock.now = action["t"]
+        session.loaded_state = action.get("state")
+        if output_digest(session.execute(action["cmd"])) != action["out"]:
+            mismatches.append(i)
+            if stop_on_mismatch:
+                break
+    elapsed = time.perf_counter() - started
+    return ReplayResult(session, len(actions), elapsed, mismatches)
+
+
+class _ReplayClock:
+    """Session clock that returns whatever time the recording says."""
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
@@ -1,6 +1,8 @@
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict
+from typing import Deque, Dict, List, Optional, Tuple
+import time
 
 
 class Faction(Enum):
@@ -11,72 +13,134 @@ class Faction(Enum):
     ROYAL_GUARD = "royal_guard"
 
 
-@dataclass
+HISTORY_SIZE = 16  # changes remembered per faction
+
+
+@dataclass(slots=True)
 class FactionReputation:
-    """Tracks reputation with a single faction."""
+    """Tracks reputation with a single faction.
+
+    ``reputation`` holds the value as of ``last_updated``. Decay toward
+    neutral is applied lazily by ``current()`` from the elapsed time, so an
+    idle faction costs nothing until somebody reads it.
+    """
     faction: Faction
     reputation: int = 0  # -1000 to 1000
-    
-    def is_friendly(self) -> bool:
-        return self.reputation > 200
-    
-    def is_hostile(self) -> bool:
-        return self.reputation < -200
-    
-    def add_reputation(self, amount: int):
+    decay_rate: float = 0.0  # points per second drifted back toward 0
+    last_updated: float = field(default_factory=time.time)
+    history: Deque[Tuple[float, int, int]] = field(
+        default_factory=lambda: deque(maxlen=HISTORY_SIZE)
+    )  # (timestamp, change, resulting value)
+
+    def current(self, now: Optional[float] = None) -> int:
+        """Return reputation as of ``now`` with decay applied."""
+        if not self.decay_rate or not self.reputation:
+            return self.reputation
+        if now is None:
+            now = time.time()
+        decayed = int((now - self.last_updated) * self.decay_rate)
+        if decayed <= 0:
+            return self.reputation
+        if decayed >= abs(self.reputation):
+            return 0
+        return self.reputation - decayed if self.reputation > 0 else self.reputation + decayed
+
+    def settle(self, now: Optional[float] = None):
+        """Fold pending decay into the stored value."""
+        if now is None:
+            now = time.time()
+        value = self.current(now)
+        if value == 0 or not self.decay_rate:
+            self.last_updated = now
+        else:
+            # Only consume the time that produced whole points so the
+            # fractional remainder carries over to the next read.
+            self.last_updated += abs(self.reputation - value) / self.decay_rate
+        self.reputation = value
+
+    def is_friendly(self, now: Optional[float] = None) -> bool:
+        return self.current(now) > 200
+
+    def is_hostile(self, now: Optional[float] = None) -> bool:
+        return self.current(now) < -200
+
+    def add_reputation(self, amount: int, now: Optional[float] = None):
+        if now is None:
+            now = time.time()
+        self.settle(now)
         # Clamp between -1000 and 1000
         self.reputation = max(-1000, min(1000, self.reputation + amount))
+        self.history.append((now, amount, self.reputation))
 
 
 class ReputationSystem:
     """Manages player reputation with all factions."""
-    def __init__(self):
+    def __init__(self, decay_rate: float = 0.0):
         self.factions: Dict[Faction, FactionReputation] = {
-            faction: FactionReputation(faction) for faction in Faction
+            faction: FactionReputation(faction, decay_rate=decay_rate) for faction in Faction
         }
-    
-    def add_reputation(self, faction: Faction, amount: int):
+
+    def set_decay_rate(self, faction: Faction, rate: float, now: Optional[float] = None):
+        """Change how fast a faction drifts back to neutral (points/second)."""
+        if faction in self.factions:
+            rep = self.factions[faction]
+            rep.settle(now)
+            rep.decay_rate = rate
+
+    def add_reputation(self, faction: Faction, amount: int, now: Optional[float] = None):
         """Add reputation points with a faction."""
         if faction in self.factions:
-            self.factions[faction].add_reputation(amount)
-    
-    def get_reputation(self, faction: Faction) -> int:
+            self.factions[faction].add_reputation(amount, now)
+
+    def get_reputation(self, faction: Faction, now: Optional[float] = None) -> int:
         """Get current reputation with faction."""
         if faction in self.factions:
-            return self.factions[faction].reputation
+            return self.factions[faction].current(now)
         return 0
-    
-    def is_friendly_with(self, faction: Faction) -> bool:
+
+    def get_history(self, faction: Faction) -> List[Tuple[float, int, int]]:
+        """Get recent reputation changes, oldest first."""
+        if faction in self.factions:
+            return list(self.factions[faction].history)
+        return []
+
+    def is_friendly_with(self, faction: Faction, now: Optional[float] = None) -> bool:
         """Check if friendly with faction."""
         if faction in self.factions:
-            return self.factions[faction].is_friendly()
+            return self.factions[faction].is_friendly(now)
         return False
-    
-    def is_hostile_with(self, faction: Faction) -> bool:
+
+    def is_hostile_with(self, faction: Faction, now: Optional[float] = None) -> bool:
         """Check if hostile with faction."""
         if faction in self.factions:
-            return self.factions[faction].is_hostile()
+            return self.factions[faction].is_hostile(now)
         return False
-    
-    def get_faction_status(self, faction: Faction) -> str:
+
+    def get_faction_status(self, faction: Faction, now: Optional[float] = None) -> str:
         """Get human-readable faction status."""
-        rep = self.get_reputation(faction)
-        if rep > 500:
-            return "Honored"
-        elif rep > 200:
-            return "Friendly"
-        elif rep > 0:
-            return "Favorable"
-        elif rep > -200:
-            return "Neutral"
-        elif rep > -500:
-            return "Unfavorable"
-        else:
-            return "Hostile"
-    
-    def get_all_reputations(self) -> Dict[str, int]:
+        return reputation_status(self.get_reputation(faction, now))
+
+    def get_all_reputations(self, now: Optional[float] = None) -> Dict[str, int]:
         """Get all faction reputations as dict."""
+        if now is None:
+            now = time.time()
         return {
-            faction.value: rep.reputation 
+            faction.value: rep.current(now)
             for faction, rep in self.factions.items()
         }
+
+
+def reputation_status(rep: int) -> str:
+    """Map a reputation value to its human-readable status."""
+    if rep > 500:
+        return "Honored"
+    elif rep > 200:
+        return "Friendly"
+    elif rep > 0:
+        return "Favorable"
+    elif rep > -200:
+        return "Neutral"
+    elif rep > -500:
+        return "Unfavorable"
+    else:
+        return "Hostile"
@@ -1,5 +1,9 @@
+from dataclasses import replace
 import json
 
+SAVE_VERSION = 1
+
+
 def save_game(path: str, data: dict):
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
@@ -7,3 +11,149 @@ def save_game(path: str, data: dict):
 def load_game(path: str) -> dict:
     with open(path, encoding="utf-8") as f:
         return json.load(f)
+
+
+def _item_to_data(item):
+    """Flyweights save as their id; stateful copies also keep their state."""
+    if hasattr(item, "proto"):
+        return {"id": item.id, "durability": item.durability, "enchantments": item.enchantments}
+    return item.id
+
+
+def _item_from_data(data):
+    from .item import ITEMS
+
+    if isinstance(data, str):
+        return ITEMS.create(data)
+    return ITEMS.create(data["id"], data.get("durability"), data.get("enchantments"))
+
+
+def _items_from_data(entries) -> list:
+    items = [_item_from_data(entry) for entry in entries]
+    return [item for item in items if item is not None]  # ids no longer defined are dropped
+
+
+def player_to_dict(player) -> dict:
+    """Serialize a Player to plain JSON-compatible data."""
+    homes = []
+    for home in player.homesteads.list_homesteads():
+        homes.append({
+            "id": home.id,
+            "name": home.name,
+            "type": home.homestead_type.value,
+            "location": home.location,
+            "position": list(home.position) if home.position is not None else None,
+            "level": home.level,
+            "gold": home.gold_stored,
+            "storage": {item.id: n for item, n in home.storage.stacks()},
+            "storage_instances": [_item_to_data(item) for item in home.storage.instances()],
+            "residents": list(home.npcs_living_here),
+            "jobs": {npc_id: job.value for npc_id, job in home.resident_jobs.items()},
+            "last_produced": home.last_produced,
+            "progress": dict(home.production_progress),
+        })
+    return {
+        "version": SAVE_VERSION,
+        "name": player.name,
+        "class": player.character_class.id,
+        "hp": player.hp,
+        "max_hp": player.max_hp,
+        "gold": player.gold,
+        "position": list(player.position) if player.position is not None else None,
+        "inventory": [_item_to_data(item) for item in player.inventory],
+        "recipes": list(player.crafting.learned_recipes),
+        "quests": {quest_id: q.status.value for quest_id, q in player.quest_log.quests.items()},
+        "reputation": {
+            faction.value: {
+                "value": rep.reputation,
+                "decay_rate": rep.decay_rate,
+                "last_updated": rep.last_updated,
+                "history": [list(entry) for entry in rep.history],
+            }
+            for faction, rep in player.reputation.factions.items()
+        },
+        "homesteads": homes,
+        "active_homestead": player.homesteads.active_homestead_id,
+        "events": [
+            {"type": e.event_type.value, "location": e.location,
+             "position": list(e.position) if e.position is not None else None,
+             "expires_at": e.expires_at}
+            for e in player.events.get_active_events()
+        ],
+    }
+
+
+def player_from_dict(data: dict, quests=None):
+    """Rebuild a Player saved by ``player_to_dict``.
+
+    ``quests`` maps quest ids to Quest definitions; saved quest states are
+    only restored for quests found there, each onto the player's own copy.
+    """
+    from .character_class import get_class_by_id
+    from .crafting import RECIPES
+    from .events import EventType
+    from .homestead import HomesteadType, ResidentJob
+    from .item import ITEMS
+    from .player import Player
+    from .quest import QuestStatus
+    from .reputation import Faction
+
+    if data.get("version", SAVE_VERSION) > SAVE_VERSION:
+        raise ValueError(f"save version {data['version']} is newer than supported ({SAVE_VERSION})")
+
+    character_class = get_class_by_id(data["class"])
+    if character_class is None:
+        raise ValueError(f"unknown class {data['class']!r} (is its content pack loaded?)")
+    player = Player(data["name"], character_class=character_class, max_hp=data["max_hp"])
+    player.hp = data["hp"]
+    player.gold = data["gold"]
+    if data.get("position") is not None:
+        player.position = tuple(data["position"])
+    player.inventory = _items_from_data(data["inventory"])
+
+    for recipe_id in data.get("recipes", []):
+        if recipe_id in RECIPES:
+            player.crafting.register_recipe(RECIPES[recipe_id])
+            player.crafting.learn_recipe(recipe_id)
+
+    for quest_id, status in data.get("quests", {}).items():
+        if quests and quest_id in quests:
+            player.quest_log.add_quest(replace(quests[quest_id], status=QuestStatus(status)))
+
+    for faction_id, entry in data.get("reputation", {}).items():
+        rep = player.reputation.factions[Faction(faction_id)]
+        rep.reputation = entry["value"]
+        rep.decay_rate = entry["decay_rate"]
+        rep.last_updated = entry["last_updated"]
+        rep.history.extend(tuple(h) for h in entry["history"])
+
+    if "homesteads" in data:
+        player.homesteads.homesteads.clear()
+        player.homesteads.active_homestead_id = None
+        for entry in data["homesteads"]:
+            position = entry.get("position")
+            home = player.homesteads.create_homestead(
+                entry["id"], entry["name"], HomesteadType(entry["type"]), entry["location"],
+                position=tuple(position) if position is not None else None
+            )
+            home.level = entry["level"]
+            home.gold_stored = entry["gold"]
+            for item_id, count in entry["storage"].items():
+                item = ITEMS.get(item_id)
+                if item is not None:
+                    home.storage.add(item, count)
+            home.storage.add_many(_items_from_data(entry.get("storage_instances", [])))
+            home.npcs_living_here.extend(entry["residents"])
+            home.resident_jobs.update({npc_id: ResidentJob(job) for npc_id, job in entry["jobs"].items()})
+            home.last_produced = entry["last_produced"]
+            home.production_progress.update(entry["progress"])
+        player.homesteads.set_active_homestead(data.get("active_homestead"))
+
+    for entry in data.get("events", []):
+        position = entry.get("position")
+        player.events.trigger_event(
+            EventType(entry["type"]), entry["location"],
+            position=tuple(position) if position is not None else None,
+            expires_at=entry.get("expires_at")
+        )
+    return player
@@ -0,0 +1,368 @@
+"""Persistent game session for the interactive shell and batch scripts.
+
+A ``Session`` keeps one Player and World alive across commands, so a
+script of thousands of lines runs in a single interpreter. State can be
+written to and resumed from a save file (see ``codexrpg.save``).
+"""
+import inspect
+import shlex
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from .character_class import CharacterClass
+from .crafting import RECIPES, GatheringSystem
+from .events import EventType
+from .homestead import HomesteadType, ResidentJob
+from .item import ITEMS
+from .player import Player
+from .quest import QUESTS
+from .reputation import Faction
+from .rng import RNGService
+from .save import load_game, player_from_dict, player_to_dict, save_game
+from .world import World
+
+# location -> item ids that can be gathered there
+GATHER_SPOTS = {
+    "forest": ("herb_common", "herb_rare", "wood_log"),
+    "village": ("water_pure", "bread"),
+    "mountains": ("ore_iron", "coal", "gem_ruby"),
+    "river": ("water_pure",),
+}
+GATHER_POOL_SIZE = 999  # per item and location
+
+HELP = """Commands:
+  status                         player summary
+  inventory                      list carried items
+  gather [location] [item]       gather a resource (default: forest herb_common)
+  recipes                        list known recipes
+  craft <recipe_id>              craft from carried ingredients
+  reputation                     faction standings
+  events [trigger <type>|resolve <id>]
+  home [info|upgrade|store|take <item> [n]|hire <npc> <job>]
+  homes                          list homesteads
+  build <id> <type> <name...>    build a new homestead
+  map                            print the world grid
+  save [path] / load [path]      persist or resume the session
+  quit                           leave the shell"""
+
+
+class Session:
+    """A player and world kept in memory between commands."""
+    def __init__(self, player: Optional[Player] = None, world: Optional[World] = None,
+                 seed=None, save_path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time, name: str = "Hero",
+                 character_class: Optional[CharacterClass] = None,
+                 recorder=None, persist: bool = True):
+        self.rng = RNGService(seed)
+        self.seed = self.rng.seed
+        self.clock = clock
+        self.now = clock()  # sampled once per command so a replay sees the same times
+        if player is None:
+            player = Player(name, character_class=character_class, rng=self.rng)
+            # Start every lazily-timed system on the session clock, not wall time
+            for home in player.homesteads.list_homesteads():
+                home.last_produced = self.now
+            for rep in player.reputation.factions.values():
+                rep.last_updated = self.now
+        else:
+            player.events.rng = self.rng.stream("events")
+        self.player = player
+        if world is None:
+            world = World()
+            world.generate(rng=self.rng)
+        self.world = world
+        self.save_path = save_path
+        self.recorder = recorder  # replay.ActionRecorder, if the session is being recorded
+        self.persist = persist  # False during replays: never touch save files
+        # Save data read by the last load; a recorder keeps it, and a replay
+        # sets it before each recorded load instead of reading the file
+        self.loaded_state: Optional[dict] = None
+        self.running = True
+        self.commands_run = 0
+        self.gathering = GatheringSystem()
+        for location, item_ids in GATHER_SPOTS.items():
+            for item_id in item_ids:
+                self.gathering.add_resource(location, ITEMS.get(item_id), GATHER_POOL_SIZE)
+        self._learn_recipes()
+        self._handlers: Dict[str, Callable] = {
+            "help": self.cmd_help,
+            "status": self.cmd_status,
+            "inventory": self.cmd_inventory,
+            "gather": self.cmd_gather,
+            "recipes": self.cmd_recipes,
+            "craft": self.cmd_craft,
+            "reputation": self.cmd_reputation,
+            "events": self.cmd_events,
+            "home": self.cmd_home,
+            "homes": self.cmd_homes,
+            "build": self.cmd_build,
+            "map": self.cmd_map,
+            "save": self.cmd_save,
+            "load": self.cmd_load,
+            "quit": self.cmd_quit,
+            "exit": self.cmd_quit,
+        }
+        self._signatures = {name: inspect.signature(fn) for name, fn in self._handlers.items()}
+
+    def _learn_recipes(self):
+        for recipe in RECIPES.values():
+            self.player.crafting.register_recipe(recipe)
+            self.player.crafting.learn_recipe(recipe.id)
+
+    def execute(self, line: str) -> str:
+        """Run one command line and return its output."""
+        if any(c in line for c in "\"'#\\"):
+            try:
+                words = shlex.split(line, comments=True)
+            except ValueError as e:
+                return f"Parse error: {e}"
+        else:
+            words = line.split()  # fast path for the common unquoted case
+        if not words:
+            return ""
+        self.now = self.clock()
+        if self.persist:
+            self.loaded_state = None
+        output = self._dispatch(words)
+        if self.recorder is not None:
+            self.recorder.record(self.now, line, output, self.loaded_state)
+        return output
+
+    def _dispatch(self, words) -> str:
+        name = words[0].lower()
+        handler = self._handlers.get(name)
+        if handler is None:
+            return f"Unknown command '{words[0]}'. Type 'help' for a list."
+        self.commands_run += 1
+        try:
+            self._signatures[name].bind(*words[1:])
+        except TypeError:
+            return f"Bad arguments for '{words[0]}'. Type 'help' for usage."
+        return handler(*words[1:])
+
+    def run_script(self, lines: Iterable[str], echo: bool = False,
+                   out: Optional[Callable[[str], None]] = print) -> int:
+        """Execute lines until they run out or ``quit``; return commands run."""
+        start = self.commands_run
+        for line in lines:
+            output = self.execute(line)
+            if out is not None:
+                if echo and line.strip():
+                    out(f"> {line.rstrip()}")
+                if output:
+                    out(output)
+            if not self.running:
+                break
+        return self.commands_run - start
+
+    def interact(self, read: Callable[[str], str] = input,
+                 out: Callable[[str], None] = print):
+        """Read-eval-print loop; EOF (Ctrl-D) leaves like ``quit``."""
+        out("Type 'help' for commands.")
+        while self.running:
+            try:
+                line = read("> ")
+            except (EOFError, KeyboardInterrupt):
+                out("")
+                break
+            output = self.execute(line)
+            if output:
+                out(output)
+
+    # Persistence
+
+    def to_dict(self) -> dict:
+        return {"seed": self.seed, "width": self.world.width, "height": self.world.height,
+                "player": player_to_dict(self.player), "rng": self.rng.getstate()}
+
+    @classmethod
+    def from_dict(cls, data: dict, save_path: Optional[str] = None, **kwargs) -> "Session":
+        """Rebuild a saved session; random streams continue where they were saved.
+
+        Saves written before stream positions were kept restart every stream
+        from the beginning of its sequence.
+        """
+        world = World(width=data["width"], height=data["height"])
+        world.generate(rng=RNGService(data["seed"]))
+        session = cls(player_from_dict(data["player"], QUESTS), world, seed=data["seed"],
+                      save_path=save_path, **kwargs)
+        session.rng.setstate(data.get("rng", {}))
+        return session
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "Session":
+        return cls.from_dict(load_game(path), save_path=path, **kwargs)
+
+    # Commands
+
+    def cmd_help(self) -> str:
+        return HELP
+
+    def cmd_status(self) -> str:
+        p = self.player
+        self.player.homesteads.catch_up(self.now)
+        return (f"{p.name} the {p.character_class.name} - HP {p.hp}/{p.max_hp}, "
+                f"Gold {p.gold}, Items {len(p.inventory)}, "
+                f"Homesteads {len(p.homesteads.list_homesteads())}, "
+                f"Active events {len(p.events.get_active_events())}")
+
+    def cmd_inventory(self) -> str:
+        if not self.player.inventory:
+            return "Inventory is empty."
+        counts: Dict[str, int] = {}
+        for item in self.player.inventory:
+            counts[item.id] = counts.get(item.id, 0) + 1
+        lines = ["Inventory:"]
+        lines.extend(f"  {item_id} x{n}" for item_id, n in counts.items())
+        return "\n".join(lines)
+
+    def cmd_gather(self, location: str = "forest", item_id: str = "herb_common") -> str:
+        item = self.gathering.gather(location, item_id)
+        if item is None:
+            available = ", ".join(i.id for i in self.gathering.list_resources(location)) or "nothing"
+            return f"No {item_id} to gather at {location} (available: {available})."
+        self.player.add_item(item)
+        return f"Gathered 1x {item.name} at {location}."
+
+    def cmd_recipes(self) -> str:
+        lines = ["Known Recipes:"]
+        for recipe_id in self.player.crafting.learned_recipes:
+            recipe = self.player.crafting.recipes[recipe_id]
+            ingredients = ", ".join(f"{i}({n})" for i, n in recipe.ingredients.items())
+            lines.append(f"  [{recipe.id}] {recipe.result.name} - Ingredients: {ingredients}")
+        return "\n".join(lines)
+
+    def cmd_craft(self, recipe_id: str) -> str:
+        item = self.player.crafting.craft(recipe_id, self.player.inventory)
+        if item is None:
+            return f"Cannot craft {recipe_id}: unknown recipe or missing ingredients."
+        self.player.add_item(item)
+        return f"Crafted {item.name}."
+
+    def cmd_reputation(self) -> str:
+        now = self.now
+        rep = self.player.reputation
+        lines = ["Faction Reputation:"]
+        for faction in Faction:
+            lines.append(f"  {faction.value}: {rep.get_reputation(faction, now)} "
+                         f"[{rep.get_faction_status(faction, now)}]")
+        return "\n".join(lines)
+
+    def cmd_events(self, action: str = "list", arg: Optional[str] = None) -> str:
+        events = self.player.events
+        events.expire_events(self.now)
+        if action == "trigger":
+            if arg is None:
+                event = events.random_event()
+            else:
+                try:
+                    event_type = EventType(arg)
+                except ValueError:
+                    return f"Unknown event type '{arg}'."
+                event = events.trigger_event(event_type)
+            return f"[{event.id}] {event.title} at {event.location}: {event.description}"
+        if action == "resolve":
+            event = events.get_event(arg) if arg else None
+            if event is None or not event.active:
+                return f"No active event '{arg}'."
+            events.resolve_event(event.id)
+            self.player.add_gold(event.reward)
+            return f"Resolved {event.title} (+{event.reward} gold)."
+        active = events.get_active_events()
+        if not active:
+            return "No active world events."
+        lines = ["Active World Events:"]
+        lines.extend(f"  [{e.id}] {e.title} at {e.location} - Reward: {e.reward} gold" for e in active)
+        return "\n".join(lines)
+
+    def cmd_home(self, action: str = "info", *args) -> str:
+        home = self.player.homesteads.get_active_homestead()
+        if home is None:
+            return "You have no homestead."
+        home.catch_up(self.now)
+        if action == "info":
+            info = home.get_info()
+            return (f"Your Homestead:\n  Name: {info['name']}\n  Type: {info['type']}\n"
+                    f"  Location: {info['location']}\n  Level: {info['level']}\n"
+                    f"  Storage: {info['storage_items']} items\n  Gold: {info['gold']}\n"
+                    f"  Residents: {info['residents']}")
+        if action == "upgrade":
+            if home.upgrade(now=self.now):
+                return f"Homestead upgraded to level {home.level}!"
+            return f"Not enough stored gold to upgrade ({home.gold_stored}/500)."
+        if action == "store":
+            moved = self.player.store_inventory()
+            return f"Stored {moved} items in {home.name}."
+        if action == "take":
+            if not args or len(args) > 2 or (len(args) == 2 and not args[1].isdigit()):
+                return "Usage: home take <item> [n]"
+            item_id, quantity = args[0], int(args[1]) if len(args) > 1 else 1
+            taken = self.player.retrieve_from_home(item_id, quantity)
+            return f"Took {taken}x {item_id} from {home.name}."
+        if action == "hire":
+            if len(args) != 2:
+                return "Usage: home hire <npc> <job>"
+            npc_id, job = args
+            try:
+                job = ResidentJob(job)
+            except ValueError:
+                return f"Unknown job '{job}'."
+            home.add_resident(npc_id, job, now=self.now)
+            return f"{npc_id} now works at {home.name} as {job.value}."
+        return f"Unknown home action '{action}'."
+
+    def cmd_homes(self) -> str:
+        lines = ["Your Homesteads:"]
+        for i, home in enumerate(self.player.homesteads.list_homesteads(), 1):
+            lines.append(f"  {i}. {home.name} ({home.homestead_type.value}) @ {home.location}"
+                         f" - Level {home.level}")
+        return "\n".join(lines)
+
+    def cmd_build(self, homestead_id: str, homestead_type: str, *name: str) -> str:
+        if self.player.homesteads.get_homestead(homestead_id):
+            return f"Homestead '{homestead_id}' already exists."
+        try:
+            kind = HomesteadType(homestead_type)
+        except ValueError:
+            return f"Unknown homestead type '{homestead_type}'."
+        home = self.player.homesteads.create_homestead(
+            homestead_id, " ".join(name) or homestead_id, kind
+        )
+        home.last_produced = self.now
+        return f"Built new homestead: {home.name} ({kind.value})"
+
+    def cmd_map(self) -> str:
+        return "\n".join(" ".join(row) for row in self.world.grid)
+
+    def cmd_save(self, path: Optional[str] = None) -> str:
+        path = path or self.save_path or "save.json"
+        if self.persist:
+            try:
+                save_game(path, self.to_dict())
+            except OSError as e:
+                return f"Could not save to {path}: {e.strerror or e}"
+        self.save_path = path
+        return f"Saved to {path}"
+
+    def cmd_load(self, path: Optional[str] = None) -> str:
+        path = path or self.save_path or "save.json"
+        if self.persist:
+            try:
+                self.loaded_state = load_game(path)
+            except OSError as e:
+                return f"Could not load {path}: {e.strerror or e}"
+            except ValueError as e:
+                return f"Could not load {path}: not a valid save ({e})"
+        elif self.loaded_state is None:
+            return f"Could not load {path}: the recording has no saved state for it"
+        try:
+            loaded = Session.from_dict(self.loaded_state, save_path=path, clock=self.clock)
+        except (ValueError, KeyError, TypeError) as e:
+            return f"Could not load {path}: not a valid save ({e})"
+        self.player, self.world, self.seed = loaded.player, loaded.world, loaded.seed
+        self.rng, self.gathering, self.save_path = loaded.rng, loaded.gathering, path
+        return f"Loaded {self.player.name} from {path}"
+
+    def cmd_quit(self) -> str:
+        self.running = False
+        return "Goodbye."
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import List
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Skill:
     """Base skill class with name, description, and effects."""
     id: str
@@ -0,0 +1,104 @@
+"""Uniform-grid spatial index for world entities.
+
+Entities are keyed by id and bucketed into square cells of world tiles, so
+rectangle and radius queries only visit the cells they overlap instead of
+every entity in the world.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+Position = Tuple[int, int]
+
+# Tile coordinates of the named places used as entity locations
+NAMED_LOCATIONS: Dict[str, Position] = {
+    "town": (5, 5),
+    "market_square": (5, 4),
+    "blacksmith_forge": (6, 5),
+    "alchemy_shop": (4, 5),
+    "village": (2, 7),
+    "farm": (1, 8),
+    "forest": (7, 2),
+    "road": (3, 3),
+    "mountains": (8, 1),
+}
+
+
+def resolve_location(location: str, position: Optional[Position] = None) -> Optional[Position]:
+    """Tile for an entity: explicit position first, then a named place.
+
+    Returns None for places with no fixed tile (e.g. "world").
+    """
+    if position is not None:
+        return (int(position[0]), int(position[1]))
+    return NAMED_LOCATIONS.get(location)
+
+
+class SpatialGrid:
+    """Buckets entity ids by tile into ``cell_size`` x ``cell_size`` cells."""
+    def __init__(self, cell_size: int = 8):
+        self.cell_size = cell_size
+        self._cells: Dict[Position, Set[str]] = {}
+        self._positions: Dict[str, Position] = {}
+
+    def _cell(self, x: int, y: int) -> Position:
+        return (x // self.cell_size, y // self.cell_size)
+
+    def insert(self, key: str, x: int, y: int):
+        """Add an entity, or move it if it is already indexed."""
+        if key in self._positions:
+            self.remove(key)
+        self._positions[key] = (x, y)
+        self._cells.setdefault(self._cell(x, y), set()).add(key)
+
+    def remove(self, key: str) -> bool:
+        pos = self._positions.pop(key, None)
+        if pos is None:
+            return False
+        cell = self._cell(*pos)
+        bucket = self._cells[cell]
+        bucket.discard(key)
+        if not bucket:
+            del self._cells[cell]
+        return True
+
+    def position(self, key: str) -> Optional[Position]:
+        return self._positions.get(key)
+
+    def query_rect(self, x0: int, y0: int, x1: int, y1: int) -> List[str]:
+        """Ids of entities with x0 <= x <= x1 and y0 <= y <= y1."""
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            # Huge rectangle over a sparse grid: walk occupied cells instead
+            buckets = [b for (cx, cy), b in self._cells.items()
+                       if cx0 <= cx <= cx1 and cy0 <= cy <= cy1]
+        else:
+            buckets = [self._cells.get((cx, cy)) for cy in range(cy0, cy1 + 1)
+                       for cx in range(cx0, cx1 + 1)]
+        found = []
+        for bucket in buckets:
+            if not bucket:
+                continue
+            for key in bucket:
+                x, y = self._positions[key]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    found.append(key)
+        return found
+
+    def query_radius(self, x: int, y: int, radius: float) -> List[str]:
+        """Ids within ``radius`` tiles of (x, y), nearest first."""
+        r = int(radius)
+        r2 = radius * radius
+        hits = []
+        for key in self.query_rect(x - r, y - r, x + r, y + r):
+            px, py = self._positions[key]
+            d2 = (px - x) ** 2 + (py - y) ** 2
+            if d2 <= r2:
+                hits.append((d2, key))
+        hits.sort()
+        return [key for _, key in hits]
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._positions
@@ -0,0 +1,28 @@
+from typing import Dict, Optional
+
+
+class Cooldowns:
+    """Tracks remaining cooldown time per key (skill id, action, ...)."""
+    def __init__(self):
+        self.remaining: Dict[str, float] = {}
+
+    def start(self, key: str, seconds: float):
+        self.remaining[key] = seconds
+
+    def ready(self, key: str) -> bool:
+        return key not in self.remaining
+
+    def time_left(self, key: str) -> float:
+        return self.remaining.get(key, 0.0)
+
+    def update(self, dt: float, deadline: Optional[float] = None):
+        """Advance all cooldowns by ``dt`` seconds, dropping finished ones."""
+        finished = []
+        for key, left in self.remaining.items():
+            left -= dt
+            if left <= 0:
+                finished.append(key)
+            else:
+                self.remaining[key] = left
+        for key in finished:
+            del self.remaining[key]
@@ -1,3 +1,7 @@
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+from ..item import Item, ItemInstance, ItemType, ItemRarity
+
+
 class Inventory:
     def __init__(self):
         self.items = []
@@ -10,3 +14,152 @@ class Inventory:
 
     def list(self):
         return list(self.items)
+
+
+class StackedInventory:
+    """Item storage kept as counted stacks keyed by item id.
+
+    Insert, lookup and removal are O(1) per stack, and per-type and
+    per-rarity totals are maintained as items come and go. Only shared
+    flyweight ``Item``s are stacked; an ``ItemInstance`` carries its own
+    durability and enchantments, so each is kept as itself.
+    """
+    def __init__(self, items: Iterable[Item] = ()):
+        self._stacks: Dict[str, List] = {}  # item id -> [item, count]
+        self._instances: Dict[str, List[ItemInstance]] = {}  # item id -> instances, oldest first
+        self._size = 0
+        self.type_counts: Dict[ItemType, int] = {}
+        self.rarity_counts: Dict[ItemRarity, int] = {}
+        self.add_many(items)
+
+    def _adjust(self, item: Item, delta: int):
+        self._size += delta
+        self.type_counts[item.item_type] = self.type_counts.get(item.item_type, 0) + delta
+        self.rarity_counts[item.rarity] = self.rarity_counts.get(item.rarity, 0) + delta
+        if not self.type_counts[item.item_type]:
+            del self.type_counts[item.item_type]
+        if not self.rarity_counts[item.rarity]:
+            del self.rarity_counts[item.rarity]
+
+    def add(self, item: Item, quantity: int = 1):
+        """Add ``quantity`` copies of ``item`` to its stack.
+
+        An ``ItemInstance`` is a single object, so it can only be added once.
+        """
+        if quantity <= 0:
+            return
+        if isinstance(item, ItemInstance):
+            if quantity != 1:
+                raise ValueError("an item instance can only be added once")
+            self._instances.setdefault(item.id, []).append(item)
+            self._adjust(item, 1)
+            return
+        stack = self._stacks.get(item.id)
+        if stack is None:
+            self._stacks[item.id] = [item, quantity]
+        else:
+            stack[1] += quantity
+        self._adjust(item, quantity)
+
+    def add_many(self, items: Iterable[Item]) -> int:
+        """Add a batch of items, touching each stack once. Returns count added."""
+        batch: Dict[str, List] = {}
+        added = 0
+        for item in items:
+            if isinstance(item, ItemInstance):
+                self.add(item)
+                added += 1
+                continue
+            entry = batch.get(item.id)
+            if entry is None:
+                batch[item.id] = [item, 1]
+            else:
+                entry[1] += 1
+        for item, quantity in batch.values():
+            self.add(item, quantity)
+            added += quantity
+        return added
+
+    def remove(self, item: Union[Item, str], quantity: int = 1) -> bool:
+        """Remove ``quantity`` of an item (or item id); False if not enough.
+
+        Passing an ``ItemInstance`` removes that exact instance.
+        """
+        if isinstance(item, ItemInstance):
+            instances = self._instances.get(item.id, ())
+            if quantity != 1 or not any(i is item for i in instances):
+                return False
+            self._drop_instances(item.id, [item])
+            return True
+        item_id = item if isinstance(item, str) else item.id
+        if quantity < 1 or self.count(item_id) < quantity:
+            return False
+        self.take(item_id, quantity)
+        return True
+
+    def take(self, item_id: str, quantity: int = 1) -> List[Item]:
+        """Remove up to ``quantity`` of an item and return what was removed.
+
+        Stacked copies are taken before individual instances.
+        """
+        if quantity <= 0:
+            return []
+        taken: List[Item] = []
+        stack = self._stacks.get(item_id)
+        if stack is not None:
+            n = min(quantity, stack[1])
+            stack[1] -= n
+            if not stack[1]:
+                del self._stacks[item_id]
+            self._adjust(stack[0], -n)
+            taken = [stack[0]] * n
+        instances = self._instances.get(item_id)
+        if instances and len(taken) < quantity:
+            picked = instances[:quantity - len(taken)]
+            self._drop_instances(item_id, picked)
+            taken.extend(picked)
+        return taken
+
+    def _drop_instances(self, item_id: str, picked: List[ItemInstance]):
+        ids = {id(i) for i in picked}
+        kept = [i for i in self._instances[item_id] if id(i) not in ids]
+        if kept:
+            self._instances[item_id] = kept
+        else:
+            del self._instances[item_id]
+        for instance in picked:
+            self._adjust(instance, -1)
+
+    def count(self, item_id: str) -> int:
+        stack = self._stacks.get(item_id)
+        return (stack[1] if stack else 0) + len(self._instances.get(item_id, ()))
+
+    def stacks(self) -> List[Tuple[Item, int]]:
+        """Flyweight stacks as (item, count); see ``instances`` for the rest."""
+        return [(item, count) for item, count in self._stacks.values()]
+
+    def instances(self) -> List[ItemInstance]:
+        return [i for group in self._instances.values() for i in group]
+
+    def clear(self):
+        self._stacks.clear()
+        self._instances.clear()
+        self._size = 0
+        self.type_counts.clear()
+        self.rarity_counts.clear()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item: Union[Item, str]) -> bool:
+        if isinstance(item, ItemInstance):
+            return any(i is item for i in self._instances.get(item.id, ()))
+        item_id = item if isinstance(item, str) else item.id
+        return item_id in self._stacks or item_id in self._instances
+
+    def __iter__(self) -> Iterator[Item]:
+        for item, count in self._stacks.values():
+            for _ in range(count):
+                yield item
+        for group in self._instances.values():
+            yield from group
@@ -0,0 +1,82 @@
+from time import perf_counter
+from typing import Callable, Dict, Optional, Tuple
+from ..flowfield import FlowFieldCache
+from ..pathfinding import Point
+
+
+class MovementSystem:
+    """Steps agents tile by tile toward their targets along flow fields.
+
+    Agents sharing a target share one cached field. When given a deadline
+    the system stops early and resumes with the next agent on the
+    following tick, so a crowd never blows the tick budget. Agents skipped
+    that way are owed the time they missed and catch up when next stepped.
+    """
+    def __init__(self, flow_fields: FlowFieldCache, speed: float = 2.0,
+                 on_move: Callable[[str, int, int], None] = None):
+        self.flow_fields = flow_fields
+        self.speed = speed  # tiles per second
+        self.on_move = on_move
+        self.positions: Dict[str, Point] = {}
+        self.targets: Dict[str, Point] = {}
+        self._progress: Dict[str, float] = {}
+        self._stepped_at: Dict[str, float] = {}  # agent -> self._time when last stepped
+        self._time = 0.0
+        self._cursor = 0
+
+    def add_agent(self, agent_id: str, position: Point, target: Point = None):
+        self.positions[agent_id] = position
+        self._progress[agent_id] = 0.0
+        self._stepped_at[agent_id] = self._time
+        if target is not None:
+            self.targets[agent_id] = target
+
+    def remove_agent(self, agent_id: str):
+        self.positions.pop(agent_id, None)
+        self.targets.pop(agent_id, None)
+        self._progress.pop(agent_id, None)
+        self._stepped_at.pop(agent_id, None)
+
+    def set_target(self, agent_id: str, target: Optional[Point]):
+        if target is None:
+            self.targets.pop(agent_id, None)
+        else:
+            if agent_id not in self.targets:
+                self._stepped_at[agent_id] = self._time  # idle time is not travel time
+            self.targets[agent_id] = target
+
+    def update(self, dt: float, deadline: Optional[float] = None):
+        self._time += dt
+        agents = list(self.targets)
+        if not agents:
+            return
+        count = len(agents)
+        start = self._cursor % count
+        for i in range(count):
+            if deadline is not None and i and perf_counter() >= deadline:
+                self._cursor = start + i
+                return
+            self._step(agents[(start + i) % count])
+        self._cursor = 0
+
+    def _step(self, agent_id: str):
+        target = self.targets[agent_id]
+        field = self.flow_fields.get(target)
+        elapsed = self._time - self._stepped_at[agent_id]
+        self._stepped_at[agent_id] = self._time
+        progress = self._progress[agent_id] + elapsed * self.speed
+        x, y = self.positions[agent_id]
+        while progress >= 1.0:
+            nx, ny = field.next_step((x, y))
+            if (nx, ny) == (x, y):
+                progress = 0.0
+                break
+            x, y = nx, ny
+            progress -= 1.0
+        self._progress[agent_id] = progress
+        if (x, y) != self.positions[agent_id]:
+            self.positions[agent_id] = (x, y)
+            if self.on_move:
+                self.on_move(agent_id, x, y)
+        if (x, y) == target:
+            del self.targets[agent_id]
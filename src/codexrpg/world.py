@@ -1,3 +1,4 @@
+import hashlib
 import random
 from .config import DEFAULT_CONFIG
 
@@ -8,9 +9,51 @@ class World:
         self.width = width or cfg["width"]
         self.height = height or cfg["height"]
         self.grid = []
+        self.store = None  # a mapped worldstore.WorldStore backing the grid, if any
+        self._mips = None
+        self._digest = None
 
-    def generate(self, seed=None):
-        rnd = random.Random(seed)
+    @classmethod
+    def from_store(cls, store, load_grid=True):
+        """World over a mapped world file; ``load_grid=False`` keeps huge maps on disk."""
+        world = cls(store.width, store.height)
+        world.store = store
+        if load_grid:
+            world.grid = store.biome_rows()
+        return world
+
+    def region(self, x, y, w, h):
+        """Biome rows of a window, clipped to the map; read from the store when mapped."""
+        if self.store is not None:
+            return self.store.read_region(x, y, w, h)
+        x0, y0 = max(0, x), max(0, y)
+        return [row[x0:max(x0, x + w)] for row in self.grid[y0:max(y0, y + h)]]
+
+    def generate(self, seed=None, rng=None):
+        """Fill the grid; ``rng`` (an RNGService) takes precedence over ``seed``."""
+        rnd = rng.fresh("world") if rng is not None else random.Random(seed)
         biomes = DEFAULT_CONFIG["world"]["biomes"]
         self.grid = [[rnd.choice(biomes) for _ in range(self.width)] for _ in range(self.height)]
+        self._mips = self._digest = None
         return self.grid
+
+    def mips(self):
+        """Level-of-detail pyramid (``lod.MipPyramid``), built on first use."""
+        if self._mips is None:
+            from .lod import MipPyramid
+            self._mips = MipPyramid.from_world(self)
+        return self._mips
+
+    def digest(self):
+        """Hex content hash of the map, computed once (cache key for rendered views)."""
+        if self._digest is None:
+            h = hashlib.sha256(f"{self.width}x{self.height}".encode("utf-8"))
+            if self.store is not None:
+                h.update("\n".join(self.store.palette).encode("utf-8"))
+                h.update(self.store.tiles)
+            else:
+                for row in self.grid:
+                    h.update("\n".join(row).encode("utf-8"))
+                    h.update(b"\0")
+            self._digest = h.hexdigest()
+        return self._digest
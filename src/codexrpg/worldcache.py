@@ -0,0 +1,87 @@
+"""Content-addressed on-disk cache of generated worlds.
+
+A world is a pure function of the generator version and its parameters,
+so the file name is a hash of exactly those. Entries are ``worldstore``
+files, so reading a cached world is an ``mmap`` of the file and nothing
+is copied until a caller asks for a region. Least recently used files
+are evicted once the cache grows past its byte budget.
+"""
+from pathlib import Path
+from typing import List, Optional
+import hashlib
+import os
+
+from .config import cache_dir
+from .worldgen import GENERATOR_VERSION
+from .worldstore import FORMAT_VERSION, WorldStore, write_world
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(params) -> str:
+    """Hex digest identifying a generated world (``params``: jobs.GenerationParams)."""
+    parts = (GENERATOR_VERSION, FORMAT_VERSION, params.seed, params.width, params.height,
+             params.octaves, repr(float(params.persistence)), params.base_freq,
+             params.noise, params.fractal, repr(float(params.warp)), bool(params.climate))
+    return hashlib.sha256("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+
+
+class WorldCache:
+    """Directory of cached worlds with size-bounded LRU eviction.
+
+    Recency is the file's mtime, refreshed on every hit, so it survives
+    restarts and is shared by every process using the directory.
+    """
+    def __init__(self, root: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root) if root is not None else cache_dir() / "worlds"
+        self.max_bytes = max_bytes
+
+    def path_for(self, params) -> Path:
+        return self.root / f"{cache_key(params)}.world"
+
+    def get(self, params) -> Optional[WorldStore]:
+        path = self.path_for(params)
+        try:
+            world = WorldStore(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        os.utime(path)  # mark as recently used
+        return world
+
+    def put(self, params, elevation, biomes) -> Path:
+        """Store a generated world; returns its path."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(params)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        write_world(tmp, elevation, biomes)
+        os.replace(tmp, path)  # readers never see a half-written file
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[Path] = None) -> List[Path]:
+        """Delete least recently used files until under ``max_bytes``."""
+        entries = []
+        for path in self.root.glob("*.world"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # removed by another process
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()  # open mappings stay valid on POSIX
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed.append(path)
+        return removed
+
+    def clear(self):
+        for path in self.root.glob("*.world"):
+            path.unlink(missing_ok=True)
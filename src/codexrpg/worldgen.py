@@ -1,10 +1,31 @@
 """Advanced world generator using layered value-noise.
 
-Produces an elevation map and classifies biomes by thresholds.
+Produces an elevation map and classifies biomes by thresholds, or with
+``climate=True`` by temperature and moisture layers as well (see
+``codexrpg.climate``). The default noise is the original grid-per-octave
+value noise, so existing seeds keep their terrain; ``noise``/``fractal``/
+``warp`` switch to the engines in ``codexrpg.noise``.
 """
-from typing import List, Tuple
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
 import random
 
+from . import climate as climate_tables
+from . import noise as noise_engines
+from .climate import BIOMES, classify_elevation  # noqa: F401 (kept importable from here)
+
+GENERATOR_VERSION = 1  # bump whenever output for the same parameters changes
+CHUNK_ROWS = 16  # progress is reported after each band of this many rows
+
+CLIMATE_OCTAVES = 3  # temperature and moisture vary smoothly; few octaves suffice
+
+# progress(fraction done in [0, 1], stage description)
+ProgressCallback = Callable[[float, str], None]
+# rows(y0, y1) -> elevation rows y0..y1-1
+RowSource = Callable[[int, int], List[List[float]]]
+# rows(y0, y1) -> (temperature rows, moisture rows)
+ClimateSource = Callable[[int, int], Tuple[List[List[int]], List[List[int]]]]
+
 
 def lerp(a: float, b: float, t: float) -> float:
     return a + (b - a) * t
@@ -17,11 +38,12 @@ def bilinear_interp(v00: float, v10: float, v01: float, v11: float, tx: float, t
 
 
 class WorldGenerator:
-    def __init__(self, width: int = 64, height: int = 64, seed: int = None):
+    def __init__(self, width: int = 64, height: int = 64, seed: int = None, rng=None):
         self.width = width
         self.height = height
         self.seed = seed
-        self._rng = random.Random(seed)
+        # An RNGService (codexrpg.rng) gives the generator its own stream
+        self._rng = rng.fresh("worldgen") if rng is not None else random.Random(seed)
 
     def _random_grid(self, gw: int, gh: int) -> List[List[float]]:
         return [[self._rng.random() for _ in range(gw + 1)] for _ in range(gh + 1)]
@@ -38,11 +60,25 @@ class WorldGenerator:
         v11 = grid[iy + 1][ix + 1]
         return bilinear_interp(v00, v10, v01, v11, tx, ty)
 
-    def elevation_map(self, octaves: int = 4, persistence: float = 0.5, base_freq: int = 4) -> List[List[float]]:
+    def elevation_map(self, octaves: int = 4, persistence: float = 0.5, base_freq: int = 4,
+                      progress: Optional[ProgressCallback] = None, noise: str = "value",
+                      fractal: str = "fbm", warp: float = 0.0) -> List[List[float]]:
         """Generate elevation map using layered value noise.
 
-        Returns a 2D list of floats in range [0, 1].
+        Returns a 2D list of floats in range [0, 1]. ``progress`` is called
+        after every chunk of rows in every octave. Other ``noise`` engines,
+        ``fractal="ridged"`` or a ``warp`` strength (in lattice cells) use
+        ``codexrpg.noise``, evaluated a band of rows per batch.
         """
+        if (noise, fractal, warp) != ("value", "fbm", 0.0):
+            rows = self._engine_rows(octaves, persistence, base_freq, noise, fractal, warp)
+            out = []
+            for y0 in range(0, self.height, CHUNK_ROWS):
+                out.extend(rows(y0, min(self.height, y0 + CHUNK_ROWS)))
+                if progress:
+                    progress(len(out) / self.height, f"rows {len(out)}/{self.height}")
+            return out
+
         out = [[0.0 for _ in range(self.width)] for _ in range(self.height)]
         max_amp = 0.0
         amp = 1.0
@@ -58,6 +94,9 @@ class WorldGenerator:
                     sy = (y / self.height) * gh
                     val = self._sample_grid(grid, sx, sy, gw, gh)
                     out[y][x] += val * amp
+                if progress and ((y + 1) % CHUNK_ROWS == 0 or y + 1 == self.height):
+                    progress((o + (y + 1) / self.height) / octaves,
+                             f"octave {o + 1}/{octaves}, rows {y + 1}/{self.height}")
             max_amp += amp
             amp *= persistence
             freq *= 2
@@ -68,30 +107,123 @@ class WorldGenerator:
                 out[y][x] = max(0.0, min(1.0, out[y][x] / max_amp))
         return out
 
+    def _value_rows(self, octaves: int, persistence: float, base_freq: int) -> RowSource:
+        """Band-at-a-time twin of the default ``elevation_map``; identical output."""
+        # Same draw order as elevation_map, so the noise is identical
+        layers = []
+        amp, freq, max_amp = 1.0, base_freq, 0.0
+        for _ in range(octaves):
+            g = max(1, freq)
+            layers.append((self._random_grid(g, g), g, amp))
+            max_amp += amp
+            amp *= persistence
+            freq *= 2
+
+        def rows(y0: int, y1: int) -> List[List[float]]:
+            band = []
+            for y in range(y0, y1):
+                row = [0.0] * self.width
+                for grid, g, layer_amp in layers:
+                    sy = (y / self.height) * g
+                    for x in range(self.width):
+                        row[x] += self._sample_grid(grid, (x / self.width) * g, sy, g, g) * layer_amp
+                band.append([max(0.0, min(1.0, v / max_amp)) for v in row])
+            return band
+
+        return rows
+
+    def _engine_rows(self, octaves: int, persistence: float, base_freq: int,
+                     noise: str, fractal: str, warp: float) -> RowSource:
+        engine = noise_engines.make_engine(noise, self._rng.getrandbits(64))
+        if fractal not in noise_engines.FRACTALS:
+            raise ValueError(f"unknown fractal {fractal!r}")
+        w = self.width
+
+        def rows(y0: int, y1: int) -> List[List[float]]:
+            xs, ys = noise_engines.grid_points(w, self.height, y0, y1, base_freq)
+            values = noise_engines.field(engine, xs, ys, octaves, persistence, fractal, warp)
+            return [values[i:i + w] for i in range(0, len(values), w)]
+
+        return rows
+
     def biome_map(self, elevation: List[List[float]] = None) -> List[List[str]]:
-        """Classify elevation into biomes.
+        """Classify elevation into biomes through a lookup table.
 
         Biomes: water, plains, forest, mountain
         """
         if elevation is None:
             elevation = self.elevation_map()
-        biomes = []
-        for y in range(self.height):
-            row = []
-            for x in range(self.width):
-                e = elevation[y][x]
-                if e < 0.25:
-                    row.append("water")
-                elif e < 0.45:
-                    row.append("plains")
-                elif e < 0.75:
-                    row.append("forest")
-                else:
-                    row.append("mountain")
-            biomes.append(row)
-        return biomes
+        return [climate_tables.elevation_biomes(row) for row in elevation[:self.height]]
 
-    def generate(self, octaves: int = 4, persistence: float = 0.5, base_freq: int = 4) -> Tuple[List[List[float]], List[List[str]]]:
-        elevation = self.elevation_map(octaves=octaves, persistence=persistence, base_freq=base_freq)
-        biomes = self.biome_map(elevation)
+    def climate_map(self, base_freq: int = 4) -> Tuple[List[List[int]], List[List[int]]]:
+        """Temperature and moisture maps as levels (0..climate.CLIMATE_LEVELS - 1).
+
+        Draw them after the elevation map: they take the next values of the
+        generator's random stream.
+        """
+        return self._climate_rows(base_freq)(0, self.height)
+
+    def climate_biome_map(self, elevation: List[List[float]], temperature: List[List[int]],
+                          moisture: List[List[int]]) -> List[List[str]]:
+        """Classify by elevation band and a Whittaker temperature/moisture table."""
+        return [climate_tables.climate_biomes(e, t, m) for e, t, m in zip(elevation, temperature, moisture)]
+
+    def _climate_rows(self, base_freq: int) -> ClimateSource:
+        # Climate varies over larger distances than terrain
+        freq = max(1.0, base_freq / 2)
+        heat = noise_engines.make_engine("simplex", self._rng.getrandbits(64))
+        wet = noise_engines.make_engine("simplex", self._rng.getrandbits(64))
+        w, h = self.width, self.height
+
+        def rows(y0: int, y1: int):
+            xs, ys = noise_engines.grid_points(w, h, y0, y1, freq)
+            t = noise_engines.fbm(heat, xs, ys, CLIMATE_OCTAVES)
+            m = noise_engines.fbm(wet, xs, ys, CLIMATE_OCTAVES)
+            starts = range(0, len(t), w)
+            return ([climate_tables.temperature_levels(t[i:i + w], y0 + i // w, h) for i in starts],
+                    [climate_tables.moisture_levels(m[i:i + w]) for i in starts])
+
+        return rows
+
+    def generate(self, octaves: int = 4, persistence: float = 0.5, base_freq: int = 4,
+                 progress: Optional[ProgressCallback] = None, noise: str = "value", fractal: str = "fbm",
+                 warp: float = 0.0, climate: bool = False) -> Tuple[List[List[float]], List[List[str]]]:
+        elevation = self.elevation_map(octaves=octaves, persistence=persistence, base_freq=base_freq,
+                                       progress=progress, noise=noise, fractal=fractal, warp=warp)
+        if climate:
+            biomes = self.climate_biome_map(elevation, *self.climate_map(base_freq))
+        else:
+            biomes = self.biome_map(elevation)
+        if progress:
+            progress(1.0, "biomes classified")
         return elevation, biomes
+
+    def generate_to(self, path: Path, octaves: int = 4, persistence: float = 0.5, base_freq: int = 4,
+                    progress: Optional[ProgressCallback] = None, noise: str = "value", fractal: str = "fbm",
+                    warp: float = 0.0, climate: bool = False) -> Path:
+        """Generate straight into a world file (see ``worldstore``), one band of rows at a time.
+
+        Output matches ``generate`` for the same seed, but memory use is
+        bounded by the band size, so maps far larger than RAM-friendly
+        nested lists can be produced.
+        """
+        from .worldstore import CHUNK, WorldStore
+
+        if (noise, fractal, warp) == ("value", "fbm", 0.0):
+            rows = self._value_rows(octaves, persistence, base_freq)
+        else:
+            rows = self._engine_rows(octaves, persistence, base_freq, noise, fractal, warp)
+        climate_rows = self._climate_rows(base_freq) if climate else None
+        with WorldStore.create(path, self.width, self.height, climate_tables.palette_for(climate)) as store:
+            for y0 in range(0, self.height, CHUNK):
+                y1 = min(self.height, y0 + CHUNK)
+                band = rows(y0, y1)
+                if climate_rows is not None:
+                    biomes = self.climate_biome_map(band, *climate_rows(y0, y1))
+                else:
+                    biomes = self.biome_map(band)
+                store.write_rows(y0, biomes, band)
+                if progress:
+                    done = y0 + len(band)
+                    progress(done / self.height, f"rows {done}/{self.height}")
+        return Path(path)
@@ -0,0 +1,173 @@
+"""Memory-mapped world files for maps too large for nested lists.
+
+A file is a fixed header and the biome palette followed by two planes:
+one byte per tile (a palette index) and one float32 elevation per tile.
+Both planes are chunk-major: the map is cut into ``chunk`` x ``chunk``
+squares stored contiguously, a row of chunks at a time, so reading a
+viewport touches a few pages instead of one stripe per map row. Edge
+chunks are padded to full size. Files are opened with ``mmap``; nothing
+is read from disk until a region is asked for.
+"""
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+import mmap
+import struct
+import sys
+
+MAGIC = b"CXWS"
+FORMAT_VERSION = 1
+CHUNK = 64  # tiles per chunk side
+# magic, format version, chunk size, width, height, palette size, palette blob length
+HEADER = struct.Struct("<4sHHIIHH")
+
+
+def _align(offset: int, to: int) -> int:
+    return (offset + to - 1) // to * to
+
+
+def _palette_blob(palette: Sequence[str]) -> bytes:
+    if not 0 < len(palette) <= 256:
+        raise ValueError("palette must have between 1 and 256 biomes")
+    return "\n".join(palette).encode("utf-8")
+
+
+class WorldStore:
+    """A world file mapped into memory, read-only unless ``writable``."""
+    def __init__(self, path: Path, writable: bool = False):
+        if sys.byteorder == "big":
+            raise NotImplementedError("world file planes are little-endian")
+        self.path = Path(path)
+        with open(self.path, "r+b" if writable else "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        try:
+            magic, version, self.chunk, self.width, self.height, n_palette, blob_len = \
+                HEADER.unpack_from(self._map)
+        except struct.error:
+            self._map.close()
+            raise ValueError(f"{self.path.name}: not a world file")
+        if magic != MAGIC or version != FORMAT_VERSION or not self.chunk:
+            self._map.close()
+            raise ValueError(f"{self.path.name}: not a world file (version {version})")
+        blob_at = HEADER.size
+        self.palette = bytes(self._map[blob_at:blob_at + blob_len]).decode("utf-8").split("\n")[:n_palette]
+        self._chunks_x = -(-self.width // self.chunk)
+        tiles_at, elev_at, end = self._layout(blob_at + blob_len, self.width, self.height, self.chunk)
+        if len(self._map) < end:
+            self._map.close()
+            raise ValueError(f"{self.path.name}: truncated world file")
+        view = memoryview(self._map)
+        plane = elev_at - tiles_at
+        self.tiles = view[tiles_at:tiles_at + plane]
+        self.elevation = view[elev_at:end].cast("f")
+
+    @staticmethod
+    def _layout(header_len: int, width: int, height: int, chunk: int) -> Tuple[int, int, int]:
+        """Offsets of the tile plane, the elevation plane and the end of file."""
+        plane = -(-width // chunk) * -(-height // chunk) * chunk * chunk
+        tiles_at = _align(header_len, 8)
+        elev_at = _align(tiles_at + plane, 8)
+        return tiles_at, elev_at, elev_at + plane * 4
+
+    @classmethod
+    def create(cls, path: Path, width: int, height: int, palette: Sequence[str],
+               chunk: int = CHUNK) -> "WorldStore":
+        """Create a zero-filled (sparse) file and open it for writing."""
+        blob = _palette_blob(palette)
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, chunk, width, height, len(palette), len(blob)) + blob
+        _, _, end = cls._layout(len(header), width, height, chunk)
+        with open(path, "wb") as f:
+            f.write(header)
+            f.truncate(end)
+        return cls(path, writable=True)
+
+    def _spans(self, x0: int, x1: int, y: int) -> Iterator[Tuple[int, int]]:
+        """(plane index, length) runs covering columns [x0, x1) of row ``y``."""
+        c = self.chunk
+        base = (y // c) * self._chunks_x * c * c + (y % c) * c
+        cx = x0 // c
+        while x0 < x1:
+            end = min(x1, (cx + 1) * c)
+            yield base + cx * c * c + x0 - cx * c, end - x0
+            x0 = end
+            cx += 1
+
+    def _clip(self, x: int, y: int, w: int, h: int) -> Tuple[int, int, int, int]:
+        x0, y0 = max(0, x), max(0, y)
+        return x0, y0, max(x0, min(self.width, x + w)), max(y0, min(self.height, y + h))
+
+    def tile_rows(self, x: int, y: int, w: int, h: int) -> List[bytes]:
+        """Palette indices of a window, one bytes object per row, clipped to the map."""
+        x0, y0, x1, y1 = self._clip(x, y, w, h)
+        tiles = self.tiles
+        return [b"".join([tiles[s:s + n] for s, n in self._spans(x0, x1, row)]) for row in range(y0, y1)]
+
+    def read_region(self, x: int, y: int, w: int, h: int) -> List[List[str]]:
+        """Biome names of a window, clipped to the map."""
+        names = self.palette
+        return [[names[t] for t in row] for row in self.tile_rows(x, y, w, h)]
+
+    def elevation_region(self, x: int, y: int, w: int, h: int) -> List[List[float]]:
+        x0, y0, x1, y1 = self._clip(x, y, w, h)
+        elevation = self.elevation
+        rows = []
+        for row in range(y0, y1):
+            values = []
+            for s, n in self._spans(x0, x1, row):
+                values.extend(elevation[s:s + n].tolist())
+            rows.append(values)
+        return rows
+
+    def write_rows(self, y: int, biomes: Sequence[Sequence[str]], elevation: Sequence[Sequence[float]]):
+        """Store full-width rows starting at row ``y`` (store opened writable)."""
+        index = {name: i for i, name in enumerate(self.palette)}
+        for offset, (biome_row, elev_row) in enumerate(zip(biomes, elevation)):
+            try:
+                codes = bytes([index[b] for b in biome_row])
+            except KeyError as e:
+                raise ValueError(f"biome {e.args[0]!r} is not in the palette") from None
+            values = memoryview(array("f", elev_row))
+            start = 0
+            for s, n in self._spans(0, self.width, y + offset):
+                self.tiles[s:s + n] = codes[start:start + n]
+                self.elevation[s:s + n] = values[start:start + n]
+                start += n
+
+    def biome_at(self, x: int, y: int) -> str:
+        return self.palette[self.tiles[next(self._spans(x, x + 1, y))[0]]]
+
+    def elevation_at(self, x: int, y: int) -> float:
+        return self.elevation[next(self._spans(x, x + 1, y))[0]]
+
+    def biome_rows(self) -> List[List[str]]:
+        """The whole map as nested lists (the shape ``World.grid`` uses)."""
+        return self.read_region(0, 0, self.width, self.height)
+
+    def elevation_rows(self) -> List[List[float]]:
+        return self.elevation_region(0, 0, self.width, self.height)
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        self.tiles.release()
+        self.elevation.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_world(path: Path, elevation: Sequence[Sequence[float]], biomes: Sequence[Sequence[str]],
+                palette: Optional[Sequence[str]] = None, chunk: int = CHUNK) -> Path:
+    """Write in-memory maps (as from ``WorldGenerator.generate``) to ``path``."""
+    height = len(biomes)
+    width = len(biomes[0]) if height else 0
+    if palette is None:
+        palette = list(dict.fromkeys(b for row in biomes for b in row))
+    with WorldStore.create(path, width, height, palette, chunk) as store:
+        store.write_rows(0, biomes, elevation)
+    return Path(path)
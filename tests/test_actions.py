@@ -0,0 +1,40 @@
+import pytest
+
+from codexrpg.actions import ActionError, MAX_BATCH_ACTIONS, perform_action, perform_batch
+from codexrpg.player import Player
+
+
+def test_perform_action():
+    player = Player()
+    assert perform_action(player, 'gather')['gold'] == 10
+    player.hp = 1
+    assert perform_action(player, 'rest') == {'success': True, 'message': 'Fully rested!', 'hp': player.max_hp}
+    with pytest.raises(ActionError):
+        perform_action(player, 'fly')
+
+
+def test_batch_applies_in_order_to_the_live_player():
+    player = Player()
+    results, failed = perform_batch(player, [
+        {'action': 'gather'}, {'action': 'gather'}, {'action': 'store_inventory'}
+    ])
+    assert failed is None
+    assert [r.get('gold') for r in results[:2]] == [10, 20]
+    assert results[2]['stored'] == 2
+    assert player.gold == 20 and not player.inventory
+
+
+def test_batch_is_all_or_nothing():
+    player = Player()
+    results, failed = perform_batch(player, [
+        {'action': 'gather'}, {'action': 'store_inventory', 'homestead_id': 'nope'}, {'action': 'rest'}
+    ])
+    assert failed == 1
+    assert results[1] == {'success': False, 'error': "Unknown homestead 'nope'"}
+    assert len(results) == 2 and not results[0]['success']
+    assert player.gold == 0 and not player.inventory
+
+
+def test_batch_size_is_capped():
+    with pytest.raises(ActionError):
+        perform_batch(Player(), [{'action': 'rest'}] * (MAX_BATCH_ACTIONS + 1))
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "web"))
+import app as web_app  # noqa: E402
+import asgi  # noqa: E402
+
+from codexrpg.player import Player  # noqa: E402
+
+
+def _scope(method, path, query=b"", headers=()):
+    return {"type": "http", "method": method, "path": path, "query_string": query,
+            "headers": list(headers), "http_version": "1.1", "scheme": "http", "root_path": "",
+            "server": ("testserver", 80), "client": ("127.0.0.1", 50000)}
+
+
+async def _call(scope, body=b""):
+    """Drive the ASGI app with one request; returns (status, headers, body)."""
+    inbox = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if inbox:
+            return inbox.pop(0)
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi.application(scope, receive, send)
+    return sent[0]["status"], dict(sent[0]["headers"]), b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def test_views_run_through_the_bridge(monkeypatch):
+    monkeypatch.setitem(web_app.game_state, "player", Player("Ada"))
+    status, headers, body = asyncio.run(_call(_scope("GET", "/api/classes")))
+    assert status == 200 and headers[b"content-type"] == b"application/json"
+    assert "warrior" in [c["id"] for c in json.loads(body)["classes"]]
+
+    payload = json.dumps({"action": "buy", "item_id": "potion_heal", "quantity": -5}).encode()
+    status, _, body = asyncio.run(_call(
+        _scope("POST", "/api/npc/alchemist_zara/trade", headers=[(b"content-type", b"application/json")]),
+        payload))
+    assert status == 400 and b"positive integer" in body
+
+
+def test_long_poll_does_not_block_other_views(monkeypatch):
+    release = threading.Event()
+
+    class SlowJobs:
+        def wait(self, job_id, timeout):
+            release.wait(5)
+            return None
+
+    monkeypatch.setattr(web_app, "get_world_jobs", lambda: SlowJobs())
+
+    async def scenario():
+        long_poll = asyncio.ensure_future(_call(_scope("GET", "/api/world/jobs/abc", b"wait=30")))
+        await asyncio.sleep(0.05)
+        status, _, _ = await asyncio.wait_for(_call(_scope("GET", "/api/classes")), 2)
+        assert status == 200 and not long_poll.done()
+        release.set()
+        status, _, _ = await asyncio.wait_for(long_poll, 2)
+        assert status == 404
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+
+
+def test_stream_sends_state_frame_then_stops_on_disconnect(monkeypatch):
+    monkeypatch.setitem(web_app.game_state, "player", Player("Ada"))
+
+    async def scenario():
+        disconnect = asyncio.Event()
+        sent = []
+
+        async def receive():
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if message.get("body", b"").startswith(b"id: "):
+                disconnect.set()
+
+        await asyncio.wait_for(asgi.application(_scope("GET", "/api/stream"), receive, send), 2)
+        return sent
+
+    sent = asyncio.run(scenario())
+    assert sent[0]["status"] == 200
+    frame = json.loads(sent[1]["body"].decode().split("data: ", 1)[1])
+    assert frame["state"]["name"] == "Ada"
+
+
+def test_lifespan(monkeypatch):
+    monkeypatch.setattr(asgi, "view_executor", ThreadPoolExecutor(1))
+    monkeypatch.setattr(asgi, "stream_executor", ThreadPoolExecutor(1))
+    inbox = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return inbox.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    asyncio.run(asgi.application({"type": "lifespan"}, receive, send))
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+
+def test_generation_flags_parse_strings():
+    assert web_app.generation_params({'climate': 'false'}).climate is False
+    assert web_app.generation_params({'climate': '0'}).climate is False
+    assert web_app.generation_params({'climate': 'true'}).climate is True
+    assert web_app.generation_params({'climate': True}).climate is True
+    with pytest.raises(ValueError):
+        web_app.generation_params({'climate': 'maybe'})
+
+
+def test_game_ticks_on_the_server(monkeypatch):
+    from codexrpg.events import EventType
+
+    monkeypatch.setitem(web_app.game_state, "game", None)
+    monkeypatch.setattr(web_app, "GAME_TICK_RATE", 100.0)
+    dirty = threading.Event()
+    monkeypatch.setattr(web_app.state_channel, "mark_dirty", dirty.set)
+    player = Player("Ada")
+    with web_app.game_lock:
+        web_app.start_game(player)
+        game = web_app.game_state["game"]
+        event = player.events.trigger_event(EventType.FESTIVAL, "town", expires_at=game.sim_time + 0.05)
+    try:
+        assert dirty.wait(2) and not event.active
+        assert game.tick_count > 0
+    finally:
+        with web_app.game_lock:
+            web_app.stop_game()
+    assert not game.running and web_app.game_state["game"] is None
+
+
+def test_radius_must_be_finite_and_non_negative(monkeypatch):
+    monkeypatch.setitem(web_app.game_state, "player", Player("Ada"))
+    client = web_app.app.test_client()
+    for radius in ("inf", "nan", "-1", "wide"):
+        for path in ("/api/npcs", "/api/nearby"):
+            response = client.get(f"{path}?x=5&y=5&radius={radius}")
+            assert response.status_code == 400, (path, radius)
+    assert client.get("/api/nearby?x=5&y=5&radius=2.5").status_code == 200
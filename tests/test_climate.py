@@ -0,0 +1,56 @@
+import random
+
+from codexrpg import climate
+from codexrpg.worldgen import WorldGenerator
+from codexrpg.worldstore import WorldStore
+
+
+def test_elevation_table_matches_thresholds():
+    values = [0.0, 0.2499, 0.25, 0.4499, 0.45, 0.7499, 0.75, 1.0]
+    rnd = random.Random(1)
+    values += [rnd.random() for _ in range(500)]
+    assert climate.elevation_biomes(values) == [climate.classify_elevation(e) for e in values]
+
+
+def test_climate_table_matches_reference_classifier():
+    rnd = random.Random(2)
+    n, levels = climate.CLIMATE_LEVELS, climate.ELEVATION_LEVELS
+    highland = 0
+    for _ in range(2000):
+        e = rnd.random()
+        t, m = rnd.randrange(n), rnd.randrange(n)
+        if e > climate.HIGHLAND:
+            # the table applies the lapse per elevation bin, at the bin's lower edge
+            highland += 1
+            e_ref = int(e * levels) / levels
+        else:
+            e_ref = e
+        assert climate.climate_biomes([e], [t], [m]) == [climate.classify_climate(e_ref, t / n, m / n)]
+    assert highland > 500
+
+
+def test_levels_stay_in_range():
+    noise = [0.0, 0.1, 0.5, 0.9, 1.0]
+    n = climate.CLIMATE_LEVELS
+    assert all(0 <= q < n for q in climate.moisture_levels(noise))
+    for y in (0, 50, 99):
+        assert all(0 <= q < n for q in climate.temperature_levels(noise, y, 100))
+    # the equator is warmer than the poles for the same noise
+    assert climate.temperature_levels([0.5], 50, 101) > climate.temperature_levels([0.5], 0, 101)
+
+
+def test_climate_worlds(tmp_path):
+    plain_elevation, plain = WorldGenerator(64, 64, seed=4).generate(octaves=3)
+    elevation, biomes = WorldGenerator(64, 64, seed=4).generate(octaves=3, climate=True)
+    assert elevation == plain_elevation  # climate layers come after the terrain draws
+    assert (elevation, biomes) == WorldGenerator(64, 64, seed=4).generate(octaves=3, climate=True)
+    found = {b for row in biomes for b in row}
+    assert found <= set(climate.CLIMATE_BIOMES) and len(found) > 4
+    assert all((b == "water") == (e < climate.SEA_LEVEL)
+               for erow, brow in zip(elevation, biomes) for e, b in zip(erow, brow))
+    # opt-in: the default output keeps the original four biomes
+    assert {b for row in plain for b in row} <= set(climate.BIOMES)
+
+    path = WorldGenerator(64, 64, seed=4).generate_to(tmp_path / "c.world", octaves=3, climate=True)
+    with WorldStore(path) as store:
+        assert store.biome_rows() == biomes
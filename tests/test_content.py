@@ -0,0 +1,91 @@
+import json
+import pickle
+
+import pytest
+
+from codexrpg.character_class import CLASSES, get_class_by_id
+from codexrpg.content import ContentError, PACKS_DIR, apply_pack, compile_pack, load_pack
+from codexrpg.crafting import RECIPES
+from codexrpg.events import EVENT_DETAILS, EventSystem, EventType
+from codexrpg import item as item_module
+from codexrpg.item import Item, ItemRegistry, get_item
+from codexrpg.npc import NPCS, NPC_INDEX, get_npc
+
+
+def test_builtin_pack_compiles_and_applies(tmp_path):
+    pack = load_pack(PACKS_DIR / "frontier", cache=tmp_path)
+    saved_events = dict(EVENT_DETAILS)
+    try:
+        apply_pack(pack)
+        ranger = get_class_by_id("ranger")
+        assert [s.id for s in ranger.starting_skills] == ["aimed_shot", "track"]
+        assert RECIPES["craft_leather_armor"].result is get_item("armor_leather")
+        brann = get_npc("hunter_brann")
+        assert brann.sell_to_player("leather") is get_item("leather")
+        event = EventSystem().trigger_event(EventType.MONSTER_SPAWN)
+        assert event.title == "Wolves in the Woods"
+    finally:
+        CLASSES.pop("ranger", None)
+        RECIPES.pop("craft_leather_armor", None)
+        NPCS.pop("hunter_brann", None)
+        NPC_INDEX.remove("hunter_brann")
+        EVENT_DETAILS.clear()
+        EVENT_DETAILS.update(saved_events)
+
+
+def test_compiled_pack_is_cached_by_content_hash(tmp_path):
+    pack_dir = tmp_path / "mod"
+    pack_dir.mkdir()
+    (pack_dir / "events.json").write_text(json.dumps(
+        {"events": [{"type": "festival", "title": "Harvest", "description": "Feast!"}]}))
+    cache = tmp_path / "cache"
+
+    first = load_pack(pack_dir, cache)
+    blobs = list(cache.iterdir())
+    assert len(blobs) == 1 and first.digest in blobs[0].name
+    assert load_pack(pack_dir, cache).events[EventType.FESTIVAL][0] == "Harvest"
+
+    # Editing the pack produces a new digest and a fresh compile
+    (pack_dir / "events.json").write_text(json.dumps(
+        {"events": [{"type": "festival", "title": "Midsummer", "description": "Dance!"}]}))
+    assert load_pack(pack_dir, cache).events[EventType.FESTIVAL][0] == "Midsummer"
+    assert len(list(cache.iterdir())) == 2
+
+
+def test_invalid_pack_reports_every_problem(tmp_path):
+    (tmp_path / "classes.json").write_text(json.dumps(
+        {"classes": [{"id": "bard", "name": "Bard", "starting_skills": ["lute_solo"]}]}))
+    (tmp_path / "npcs.json").write_text(json.dumps(
+        {"npcs": [{"id": "x", "name": "X", "role": "wizard"}, {"id": "y"}]}))
+    with pytest.raises(ContentError) as err:
+        compile_pack(tmp_path)
+    message = str(err.value)
+    assert "lute_solo" in message and "wizard" in message and "missing name, role" in message
+
+
+def test_non_numeric_fields_are_content_errors(tmp_path):
+    (tmp_path / "skills.json").write_text(json.dumps(
+        {"skills": [{"id": "smash", "name": "Smash", "damage_bonus": "lots"}]}))
+    with pytest.raises(ContentError, match="smash has non-numeric damage_bonus 'lots'"):
+        compile_pack(tmp_path)
+
+
+def test_corrupt_blob_is_recompiled(tmp_path):
+    pack_dir = tmp_path / "mod"
+    pack_dir.mkdir()
+    (pack_dir / "events.json").write_text(json.dumps(
+        {"events": [{"type": "festival", "title": "Harvest", "description": "Feast!"}]}))
+    cache = tmp_path / "cache"
+    load_pack(pack_dir, cache)
+    blob, = cache.iterdir()
+    blob.write_bytes(blob.read_bytes()[:20])
+    assert load_pack(pack_dir, cache).events[EventType.FESTIVAL][0] == "Harvest"
+    assert len(blob.read_bytes()) > 20
+
+
+def test_cached_items_resolve_to_the_registry_definition(monkeypatch):
+    stale = pickle.dumps(Item("leather", "Leather", value=1))
+    # A fresh registry, as at startup: items.json not parsed yet
+    monkeypatch.setattr(item_module, "ITEMS", ItemRegistry(item_module.DATA_DIR / "items.json"))
+    assert pickle.loads(stale) is item_module.get_item("leather")
+    assert item_module.get_item("leather").value == 12
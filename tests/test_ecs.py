@@ -0,0 +1,58 @@
+from codexrpg.ecs import Registry, spawn_actor, spawn_monster, write_back, regenerate
+from codexrpg.npc import NPC, NPCRole
+from codexrpg.player import Player
+
+
+def test_players_npcs_and_monsters_share_components():
+    reg = Registry()
+    player = Player("Hero")
+    npc = NPC("guard", "Guard", NPCRole.VILLAGER, location="town")
+    p = spawn_actor(reg, player, "player", position=(1, 1))
+    n = spawn_actor(reg, npc, "npc", position=npc.position)
+    m = spawn_monster(reg, hp=30, damage=5, position=(2, 2))
+
+    assert player.entity_id == p and npc.entity_id == n
+    # NPCs have a position but no health
+    assert sorted(e for e, _ in reg.query("position")) == [p, n, m]
+    assert sorted(e for e, _ in reg.query("position", "health")) == [p, m]
+    assert sorted(reg.entities_in_rect(0, 0, 3, 3)) == [p, m]
+    assert reg.get(m, "stats") == {"damage": 5, "defense": 0}
+
+
+def test_systems_iterate_columns_and_write_back():
+    reg = Registry()
+    player = Player("Hero")
+    p = spawn_actor(reg, player, "player")
+    reg.store("health").set(p, "hp", 10)
+    regenerate(reg, 25)
+    assert reg.get(p, "health")["hp"] == 35
+
+    reg.store("position").set(p, "x", 4)
+    write_back(reg, p)
+    assert player.hp == 35
+    assert player.position == (4, 0)
+
+
+def test_actors_spawn_at_their_own_position():
+    reg = Registry()
+    player = Player("Hero")
+    player.position = (3, 7)
+    p = spawn_actor(reg, player, "player")
+    assert reg.get(p, "position") == {"x": 3, "y": 7}
+    npc = NPC("guard", "Guard", NPCRole.VILLAGER, location="town")
+    n = spawn_actor(reg, npc, "npc", position=(9, 9))
+    assert npc.position == (9, 9)
+    reg.store("position").set(n, "y", 8)
+    write_back(reg, n)
+    assert npc.position == (9, 8)
+
+
+def test_removal_keeps_columns_dense():
+    reg = Registry()
+    ids = [spawn_monster(reg, hp=10 + i, damage=1) for i in range(5)]
+    reg.destroy_entity(ids[1])
+    health = reg.store("health")
+    assert len(health) == 4
+    assert list(health.entities) == [ids[0], ids[4], ids[2], ids[3]]
+    assert reg.get(ids[4], "health")["hp"] == 14
+    assert reg.get(ids[1], "health") is None
@@ -0,0 +1,48 @@
+import random
+
+from codexrpg.flowfield import FlowField, FlowFieldCache
+from codexrpg.worldgen import WorldGenerator
+
+
+def test_flow_field_leads_agents_to_target():
+    _, biomes = WorldGenerator(32, 32, seed=3).generate(octaves=3)
+    cache = FlowFieldCache(biomes)
+    target = next((x, y) for y in range(32) for x in range(32) if cache.passable[y * 32 + x])
+    field = cache.get(target)
+
+    agents = [(x, y) for y in range(32) for x in range(32) if field.distance_at((x, y)) > 0]
+    for _ in range(max(field.distance_at(p) for p in agents)):
+        agents = cache.advance(agents, target)
+    assert set(agents) == {target}
+
+
+def test_flow_field_cache_is_lru():
+    grid = [["plains"] * 8 for _ in range(8)]
+    cache = FlowFieldCache(grid, capacity=2)
+    a = cache.get((0, 0))
+    cache.get((1, 1))
+    assert cache.get((0, 0)) is a
+    cache.get((2, 2))  # evicts (1, 1)
+    assert (0, 0) in cache and (2, 2) in cache and (1, 1) not in cache
+    assert len(cache) == 2
+
+
+def test_incremental_updates_match_full_recompute():
+    rng = random.Random(11)
+    size = 24
+    grid = [["mountain" if rng.random() < 0.25 else "plains" for _ in range(size)] for _ in range(size)]
+    grid[12][12] = "plains"
+    cache = FlowFieldCache(grid)
+    field = cache.get((12, 12))
+
+    for _ in range(200):
+        x, y = rng.randrange(size), rng.randrange(size)
+        cache.set_tile((x, y), "plains" if rng.random() < 0.5 else "mountain")
+        fresh = FlowField(cache.passable, size, size, (12, 12))
+        assert list(field.distance) == list(fresh.distance)
+
+    # Every direction points at a neighbour one step closer
+    for idx, d in enumerate(field.distance):
+        if d > 0:
+            nx, ny = field.next_step((idx % size, idx // size))
+            assert field.distance_at((nx, ny)) == d - 1
@@ -7,3 +7,109 @@ def test_game_start_stop():
     assert g.running is True
     assert g.stop() == "TestWorld stopped"
     assert g.running is False
+
+
+def test_fixed_timestep_and_catch_up_cap():
+    g = Game(tick_rate=8, max_catch_up_ticks=3)
+    calls = []
+    g.add_system("count", lambda dt, deadline: calls.append(dt))
+
+    assert g.update(now=0.0) == 0
+    assert g.update(now=0.3125) == 2  # 0.0625s stays in the accumulator
+    assert g.update(now=0.375) == 1
+    assert g.update(now=10.0) == 3  # fell far behind: capped
+    assert g.dropped_ticks == 74
+    assert calls == [0.125] * 6
+
+
+def test_system_order_interval_and_stats():
+    g = Game(tick_rate=10)
+    order = []
+    g.add_system("b", lambda dt, deadline: order.append("b"))
+    g.add_system("c", lambda dt, deadline: order.append("c"), interval=0.3)
+    g.add_system("a", lambda dt, deadline: order.append("a"), before="b")
+    g.set_order(["c", "a"])
+
+    for _ in range(3):
+        g.tick()
+    assert order == ["a", "b", "a", "b", "c", "a", "b"]
+
+    stats = g.get_stats()
+    assert stats["ticks"] == 3
+    assert stats["systems"]["a"]["calls"] == 3
+    assert stats["systems"]["c"]["calls"] == 1
+
+
+def test_player_systems_run_in_tick():
+    from codexrpg.player import Player
+    from codexrpg.events import EventType
+
+    g = Game(tick_rate=10)
+    player = Player("Ticker")
+    changes = []
+    g.attach_player(player, on_change=lambda: changes.append(g.tick_count))
+    event = player.events.trigger_event(EventType.FESTIVAL, "town", expires_at=g.sim_time + 0.15)
+    player.cooldowns.start("slash", 0.15)
+
+    g.tick()
+    assert event.active and not player.cooldowns.ready("slash")
+    g.tick()
+    g.tick()
+    assert not event.active
+    assert changes == [2]  # only during the third tick, when the event expired
+    assert player.cooldowns.ready("slash")
+    assert [s.name for s in g.systems] == ["events", "homesteads", "cooldowns"]
+
+
+def test_movement_system_respects_budget():
+    from codexrpg.flowfield import FlowFieldCache
+    from codexrpg.systems.movement import MovementSystem
+
+    grid = [["plains"] * 16 for _ in range(16)]
+    moves = []
+    movement = MovementSystem(FlowFieldCache(grid), speed=10.0,
+                              on_move=lambda agent, x, y: moves.append(agent))
+    for i in range(16):
+        movement.add_agent(f"npc_{i}", (i, 15), target=(0, 0))
+
+    # An already-expired deadline still lets one agent move per tick
+    movement.update(0.1, deadline=0.0)
+    assert moves == ["npc_0"]
+    movement.update(0.1, deadline=0.0)
+    assert moves == ["npc_0", "npc_1"]
+
+    movement.update(0.1)
+    assert len(moves) == 2 + 16
+    for _ in range(30):
+        movement.update(0.1)
+    assert set(movement.positions.values()) == {(0, 0)}
+    assert movement.targets == {}
+
+
+def test_sim_time_keeps_pace_when_ticks_are_dropped():
+    g = Game(tick_rate=10, max_catch_up_ticks=2, world_clock=lambda: 1000.0)
+    calls = []
+    g.add_system("count", lambda dt, deadline: calls.append(round(dt, 6)))
+    assert g.sim_time == 1000.0
+
+    g.update(now=0.0)
+    g.update(now=1.0)  # two ticks run, eight dropped
+    assert g.dropped_ticks == 8
+    assert round(g.sim_time, 6) == 1001.0
+    g.tick()
+    assert calls == [0.1, 0.1, 0.9]
+
+
+def test_movement_carries_time_for_skipped_agents():
+    from codexrpg.flowfield import FlowFieldCache
+    from codexrpg.systems.movement import MovementSystem
+
+    grid = [["plains"] * 16 for _ in range(16)]
+    movement = MovementSystem(FlowFieldCache(grid), speed=10.0)
+    movement.add_agent("a", (15, 0), target=(0, 0))
+    movement.add_agent("b", (15, 1), target=(0, 1))
+
+    movement.update(0.1, deadline=0.0)  # only "a" steps
+    movement.update(0.1, deadline=0.0)  # only "b" steps, owed both ticks
+    assert movement.positions["a"] == (14, 0)
+    assert movement.positions["b"] == (13, 1)
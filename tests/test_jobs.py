@@ -0,0 +1,82 @@
+import queue as queue_module
+
+import pytest
+
+from codexrpg.jobs import GenerationParams, JobStatus, WorldGenQueue
+from codexrpg.worldgen import WorldGenerator
+
+
+@pytest.fixture(scope="module")
+def queue():
+    q = WorldGenQueue(max_workers=2)
+    yield q
+    q.shutdown()
+
+
+def test_job_runs_in_background_and_matches_direct_generation(queue):
+    params = GenerationParams(seed=3, width=24, height=40, octaves=2)
+    done = []
+    job = queue.submit(params, on_done=done.append)
+    assert job.status in (JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.DONE)
+    assert queue.wait(job.id, timeout=30) is job
+    assert job.status is JobStatus.DONE and job.progress == 1.0
+    assert job.result == WorldGenerator(24, 40, seed=3).generate(octaves=2)
+    assert done == [job]
+
+
+def test_identical_requests_share_a_job(queue):
+    params = GenerationParams(seed=4, width=16, height=16)
+    first = queue.submit(params)
+    assert queue.submit(GenerationParams(seed=4, width=16, height=16)) is first
+    assert queue.submit(GenerationParams(seed=5, width=16, height=16)) is not first
+    queue.wait(first.id, timeout=30)
+    # Finished jobs still dedup, and late subscribers are called at once
+    late = []
+    assert queue.submit(params, on_done=late.append) is first
+    assert late == [first]
+
+
+def test_worker_reports_progress_per_octave_and_chunk():
+    from codexrpg import jobs
+
+    messages = queue_module.Queue()
+    jobs._init_worker(messages)
+    jobs._run_generation("job_x", GenerationParams(seed=6, width=8, height=40, octaves=2))
+    updates = []
+    while not messages.empty():
+        updates.append(messages.get())
+    assert all(job_id == "job_x" for job_id, _, _ in updates)
+    fractions = [f for _, f, _ in updates]
+    assert fractions == sorted(fractions) and fractions[0] == 0.0 and fractions[-1] == 1.0
+    # 3 row chunks per octave, 2 octaves, plus start and classification
+    assert len(updates) == 8
+    assert updates[1][2] == "octave 1/2, rows 16/40"
+    jobs._init_worker(None)
+
+
+def test_dead_worker_fails_its_job_and_the_pool_is_replaced():
+    import os
+    import signal
+
+    q = WorldGenQueue(max_workers=1)
+    try:
+        job = q.submit(GenerationParams(seed=8, width=512, height=512, octaves=8))
+        while job.status is JobStatus.QUEUED:
+            q.wait(job.id, timeout=0.05)
+        for process in list(q._pool._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+        assert q.wait(job.id, timeout=30).status is JobStatus.FAILED
+
+        retry = q.submit(GenerationParams(seed=9, width=8, height=8, octaves=1))
+        assert q.wait(retry.id, timeout=30).status is JobStatus.DONE
+    finally:
+        q.shutdown()
+
+
+def test_shutdown_fails_cancelled_jobs():
+    q = WorldGenQueue(max_workers=1)
+    jobs = [q.submit(GenerationParams(seed=seed, width=64, height=64, octaves=2)) for seed in range(10, 16)]
+    q.shutdown(wait=False)
+    for job in jobs:
+        assert q.wait(job.id, timeout=30).finished
+    assert any(job.status is JobStatus.FAILED and job.error == "cancelled" for job in jobs)
@@ -0,0 +1,38 @@
+from codexrpg.lod import MipPyramid, downsample, halve_rows
+from codexrpg.world import World
+from codexrpg.worldgen import WorldGenerator
+from codexrpg.worldstore import WorldStore, write_world
+
+
+def test_halving_takes_the_majority_child():
+    # blocks: [0 0 / 0 1] -> 0, [1 2 / 2 3] -> 2, [1 2 / 3 0] -> 1 (no majority: top-left)
+    assert halve_rows(bytes([0, 0, 1, 2, 1, 2]), bytes([0, 1, 2, 3, 3, 0])) == bytes([0, 2, 1])
+    # odd width and height pad with the edge
+    assert list(downsample([bytes([4, 4, 5]), bytes([4, 4, 5]), bytes([6, 6, 6])])) == [
+        bytes([4, 5]), bytes([6, 6])]
+
+
+def test_levels_shrink_to_one_cell():
+    world = World(37, 20)
+    world.generate(seed=5)
+    mips = world.mips()
+    assert mips is world.mips()  # built once per world
+    assert mips.levels == 6 and mips.level_size(6) == (1, 1)
+    assert [len(mips.tile_rows(n, 0, 0, 99, 99)) for n in range(7)] == [20, 10, 5, 3, 2, 1, 1]
+    assert [len(mips.tile_rows(n, 0, 0, 99, 99)[0]) for n in range(7)] == [37, 19, 10, 5, 3, 2, 1]
+    names = [[mips.palette[t] for t in row] for row in mips.tile_rows(0, 2, 3, 4, 5)]
+    assert names == world.region(2, 3, 4, 5)
+
+
+def test_coarse_cells_follow_the_map(tmp_path):
+    elevation, biomes = WorldGenerator(64, 64, seed=2).generate(octaves=2)
+    with WorldStore(write_world(tmp_path / "w.world", elevation, biomes, chunk=16)) as store:
+        mips = World.from_store(store, load_grid=False).mips()
+        assert mips.tile_rows(1, 0, 0, 32, 32) == list(downsample(store.tile_rows(0, 0, 64, 64)))
+    # a mostly-forest 8x8 block with scattered water stays forest at lod 3
+    world = World(16, 8)
+    world.grid = [["water"] * 8 + ["forest"] * 8 for _ in range(8)]
+    for x, y in ((9, 1), (12, 4), (14, 6), (10, 7)):
+        world.grid[y][x] = "water"
+    mips = world.mips()
+    assert [mips.palette[t] for t in mips.tile_rows(3, 0, 0, 2, 1)[0]] == ["water", "forest"]
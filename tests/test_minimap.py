@@ -0,0 +1,63 @@
+import struct
+import zlib
+
+import pytest
+
+from codexrpg.minimap import BIOME_COLORS, MinimapCache, encode_png, render_minimap, scale_rows
+from codexrpg.world import World
+
+
+def read_png(data):
+    """Minimal decoder for the unfiltered palette PNGs we write."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    chunks, at = {}, 8
+    while at < len(data):
+        length, = struct.unpack(">I", data[at:at + 4])
+        kind, body = data[at + 4:at + 8], data[at + 8:at + 8 + length]
+        assert struct.unpack(">I", data[at + 8 + length:at + 12 + length])[0] == zlib.crc32(kind + body)
+        chunks[kind] = chunks.get(kind, b"") + body
+        at += 12 + length
+    width, height, depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    assert (depth, color_type) == (8, 3)
+    raw = zlib.decompress(chunks[b"IDAT"])
+    rows = [raw[y * (width + 1):(y + 1) * (width + 1)] for y in range(height)]
+    assert all(row[0] == 0 for row in rows)
+    plte = chunks[b"PLTE"]
+    palette = [tuple(plte[i:i + 3]) for i in range(0, len(plte), 3)]
+    return [[palette[i] for i in row[1:]] for row in rows]
+
+
+def test_encode_png_round_trip():
+    pixels = read_png(encode_png([bytes([0, 1, 1]), bytes([1, 0, 0])], 3, [(1, 2, 3), (4, 5, 6)]))
+    assert pixels == [[(1, 2, 3), (4, 5, 6), (4, 5, 6)], [(4, 5, 6), (1, 2, 3), (1, 2, 3)]]
+
+
+def test_scale_rows_repeats_cells():
+    assert scale_rows([bytes([1, 2])], 2) == [bytes([1, 1, 2, 2])] * 2
+
+
+def test_minimap_matches_biomes():
+    world = World(5, 3)
+    world.grid = [["water", "plains", "forest", "mountain", "water"]] * 3
+    pixels = read_png(render_minimap(world.mips(), scale=2))
+    assert len(pixels) == 6 and len(pixels[0]) == 10
+    assert pixels[5][6] == BIOME_COLORS["mountain"] and pixels[0][0] == BIOME_COLORS["water"]
+    coarse = read_png(render_minimap(world.mips(), lod=1))
+    assert len(coarse) == 2 and len(coarse[0]) == 3
+
+
+def test_cache_keys_on_world_content():
+    cache = MinimapCache(size=2)
+    world = World(8, 8)
+    world.generate(seed=1)
+    etag, png = cache.get(world, scale=2)
+    assert cache.get(world, scale=2) == (etag, png)
+    assert cache.get(world, scale=1)[0] != etag
+    other = World(8, 8)
+    other.generate(seed=2)
+    assert cache.get(other, scale=2)[0] != etag
+    same = World(8, 8)
+    same.generate(seed=1)
+    assert MinimapCache.etag(same, 0, 2) == etag
+    with pytest.raises(ValueError):
+        cache.get(world, scale=0)
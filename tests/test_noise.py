@@ -0,0 +1,50 @@
+import pytest
+
+from codexrpg import noise
+from codexrpg.worldgen import WorldGenerator
+from codexrpg.worldstore import WorldStore
+
+XS, YS = noise.grid_points(24, 16, 0, 16, 3)
+
+
+@pytest.mark.parametrize("name", sorted(noise.ENGINES))
+def test_engines_are_seeded_and_smooth(name):
+    first = noise.make_engine(name, 7).sample(XS, YS)
+    assert first == noise.make_engine(name, 7).sample(XS, YS)
+    assert first != noise.make_engine(name, 8).sample(XS, YS)
+    assert all(-1.5 <= v <= 1.5 for v in first)
+    # nearby points give nearby values (no per-point discontinuities)
+    engine = noise.make_engine(name, 7)
+    near = engine.sample([x + 1e-4 for x in XS], YS)
+    assert max(abs(a - b) for a, b in zip(first, near)) < 0.01
+
+
+def test_gradient_noise_vanishes_on_the_lattice():
+    engine = noise.make_engine("gradient", 3)
+    assert engine.sample([0.0, 1.0, 5.0, -3.0], [0.0, 2.0, 7.0, 4.0]) == [0.0] * 4
+
+
+@pytest.mark.parametrize("fractal", noise.FRACTALS)
+@pytest.mark.parametrize("warp", [0.0, 1.5])
+def test_fields_stay_in_unit_range(fractal, warp):
+    values = noise.field(noise.make_engine("simplex", 1), XS, YS, 5, fractal=fractal, warp_strength=warp)
+    assert len(values) == len(XS)
+    assert all(0.0 <= v <= 1.0 for v in values)
+    assert max(values) - min(values) > 0.2
+
+
+def test_unknown_names_are_rejected():
+    with pytest.raises(ValueError):
+        noise.make_engine("perlin++")
+    with pytest.raises(ValueError):
+        WorldGenerator(4, 4, seed=1).elevation_map(noise="gradient", fractal="billow")
+
+
+def test_generator_engines_are_deterministic(tmp_path):
+    settings = dict(octaves=3, noise="simplex", fractal="ridged", warp=1.0)
+    elevation, biomes = WorldGenerator(40, 30, seed=5).generate(**settings)
+    assert (elevation, biomes) == WorldGenerator(40, 30, seed=5).generate(**settings)
+    assert elevation != WorldGenerator(40, 30, seed=5).generate(octaves=3)[0]
+    path = WorldGenerator(40, 30, seed=5).generate_to(tmp_path / "w.world", **settings)
+    with WorldStore(path) as store:
+        assert store.biome_rows() == biomes
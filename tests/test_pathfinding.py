@@ -0,0 +1,77 @@
+from codexrpg.pathfinding import Pathfinder
+from codexrpg.world import World
+from codexrpg.worldgen import WorldGenerator
+from codexrpg.worldstore import WorldStore, write_world
+
+
+GRID = [
+    "..........",
+    ".########.",
+    ".#......#.",
+    ".#.####.#.",
+    ".#.#..#.#.",
+    ".#.#..#.#.",
+    ".#.####.#.",
+    ".#......#.",
+    ".########.",
+    "..........",
+]
+
+
+def _grid(rows):
+    return [["mountain" if c == "#" else "plains" for c in row] for row in rows]
+
+
+def test_find_path_around_walls():
+    pf = Pathfinder(_grid(GRID))
+    path = pf.find_path((0, 0), (9, 9))
+    assert path[0] == (0, 0) and path[-1] == (9, 9)
+    assert len(path) == 19
+    for (ax, ay), (bx, by) in zip(path, path[1:]):
+        assert abs(ax - bx) + abs(ay - by) == 1
+        assert pf.is_passable((bx, by))
+
+
+def test_unreachable_goal_is_rejected_without_search():
+    pf = Pathfinder(_grid(GRID))
+    # The inner room (4,4) is sealed off from the outer ring
+    assert not pf.reachable((0, 0), (4, 4))
+    assert pf.find_path((0, 0), (4, 4)) is None
+    assert pf.find_path((0, 0), (1, 1)) is None  # goal is a wall
+    assert len(pf.find_path((4, 4), (5, 5))) == 3
+
+
+def test_set_tile_updates_connectivity():
+    pf = Pathfinder(_grid(GRID))
+    pf.set_tile((3, 4), "plains")
+    pf.set_tile((1, 4), "plains")
+    assert pf.reachable((0, 4), (4, 4))
+    assert pf.find_path((0, 4), (4, 4)) == [(0, 4), (1, 4), (2, 4), (3, 4), (4, 4)]
+
+
+def test_hierarchical_path_is_valid():
+    _, biomes = WorldGenerator(48, 48, seed=7).generate(octaves=3)
+    pf = Pathfinder(biomes, chunk_size=8)
+    open_tiles = [(x, y) for y in range(48) for x in range(48) if pf.is_passable((x, y))]
+    start = open_tiles[0]
+    goals = [p for p in open_tiles if pf.reachable(start, p)]
+    goal = goals[-1]
+
+    exact = pf.find_path(start, goal)
+    path = pf.find_path(start, goal, hierarchical=True)
+    assert path[0] == start and path[-1] == goal
+    assert len(path) >= len(exact)
+    for (ax, ay), (bx, by) in zip(path, path[1:]):
+        assert abs(ax - bx) + abs(ay - by) == 1
+        assert pf.is_passable((bx, by))
+
+
+def test_mapped_world_matches_grid(tmp_path):
+    biomes = _grid(GRID)
+    elevation = [[0.0] * len(row) for row in biomes]
+    with WorldStore(write_world(tmp_path / "w.world", elevation, biomes, chunk=4)) as store:
+        world = World.from_store(store, load_grid=False)
+        pf = Pathfinder.from_world(world)
+    assert world.grid == []
+    assert bytes(pf.passable) == bytes(Pathfinder(biomes).passable)
+    assert len(pf.find_path((0, 0), (9, 9))) == 19
@@ -0,0 +1,86 @@
+import threading
+
+from codexrpg.player import Player
+from codexrpg.push import StateChannel, diff_state
+
+
+def test_diff_state():
+    assert diff_state({"a": 1, "b": 2}, {"a": 1, "b": 3, "c": 4}) == {"b": 3, "c": 4}
+    assert diff_state({"a": 1}, {}) == {"a": None}
+    assert diff_state({"a": 1}, {"a": 1}) == {}
+
+
+def test_first_frame_is_full_then_diffs():
+    player = Player("Ada")
+    channel = StateChannel(player.get_info, coalesce=0.0)
+    first = channel.wait(0, timeout=0)
+    assert first["version"] == 1 and first["state"]["gold"] == 0
+
+    player.add_gold(25)
+    channel.mark_dirty()
+    frame = channel.wait(1, timeout=1)
+    assert frame == {"version": 2, "diff": {"gold": 25}}
+    # A client that fell further behind gets the whole state
+    assert "state" in channel.frame(0)
+
+
+def test_client_ahead_of_restarted_channel_gets_full_state():
+    player = Player("Ada")
+    channel = StateChannel(player.get_info, coalesce=0.0)  # fresh after a restart
+    frame = channel.poll(57)  # browser resends its Last-Event-ID from the old server
+    assert frame["version"] == 1 and frame["state"]["name"] == "Ada"
+    assert channel.poll(1) is None
+
+
+def test_rapid_changes_coalesce_into_one_frame():
+    player = Player()
+    channel = StateChannel(player.get_info, coalesce=0.02)
+    channel.wait(0, timeout=0)
+    for _ in range(50):
+        player.add_gold(1)
+        channel.mark_dirty()
+    frame = channel.wait(1, timeout=1)
+    assert frame == {"version": 2, "diff": {"gold": 50}}
+    assert channel.snapshots_built == 2
+
+
+def test_idle_and_unchanged_send_nothing():
+    player = Player()
+    channel = StateChannel(player.get_info, coalesce=0.0)
+    channel.wait(0, timeout=0)
+    assert channel.wait(1, timeout=0.01) is None
+    channel.mark_dirty()  # marked, but nothing actually changed
+    assert channel.wait(1, timeout=0.01) is None
+    assert channel.version == 1
+
+
+def test_waiter_wakes_on_change_from_another_thread():
+    player = Player()
+    channel = StateChannel(player.get_info, coalesce=0.0)
+    channel.wait(0, timeout=0)
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(channel.wait(1, timeout=5)))
+    waiter.start()
+    player.hp -= 10
+    channel.mark_dirty()
+    waiter.join(timeout=5)
+    assert results and results[0]["diff"] == {"hp": player.hp}
+
+
+def test_poll_and_listeners_for_non_blocking_subscribers():
+    player = Player()
+    channel = StateChannel(player.get_info, coalesce=0.0)
+    calls = []
+    listener = lambda: calls.append(1)
+    channel.add_listener(listener)
+    assert channel.poll(0)["version"] == 1
+    assert channel.poll(1) is None
+    player.add_gold(5)
+    channel.mark_dirty()
+    assert calls  # woken without blocking a thread
+    assert channel.poll(1) == {"version": 2, "diff": {"gold": 5}}
+    seen = len(calls)
+    channel.remove_listener(listener)
+    channel.mark_dirty()
+    assert len(calls) == seen
+    assert channel.seconds_until_due() == 0.0
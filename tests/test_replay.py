@@ -0,0 +1,101 @@
+import io
+import json
+
+from codexrpg.events import EventSystem
+from codexrpg.replay import ActionRecorder, replay
+from codexrpg.rng import RNGService, derive_seed
+from codexrpg.save import player_to_dict
+from codexrpg.session import Session
+from codexrpg.world import World
+from codexrpg.worldgen import WorldGenerator
+
+SCRIPT = [
+    "gather", "gather", "gather village water_pure",
+    "home hire npc_farmer farmer",
+    "events trigger", "events trigger",
+    "craft craft_healing_potion",
+    "home info", "status", "inventory", "events",
+]
+
+
+def test_streams_are_named_and_independent():
+    a, b = RNGService(42), RNGService(42)
+    assert a.stream("events").random() == b.stream("events").random()
+    assert derive_seed(42, "events") != derive_seed(42, "world")
+    # Drawing from one stream never shifts another
+    first = a.stream("world").random()
+    for _ in range(100):
+        b.stream("loot").random()
+    assert b.stream("world").random() == first
+    assert RNGService().seed is not None
+
+
+def test_world_and_events_reproducible_from_seed():
+    w1, w2 = World(8, 8), World(8, 8)
+    assert w1.generate(rng=RNGService(5)) == w2.generate(rng=RNGService(5))
+    g1 = WorldGenerator(16, 16, rng=RNGService(5)).generate()
+    g2 = WorldGenerator(16, 16, rng=RNGService(5)).generate()
+    assert g1 == g2
+    e1 = EventSystem(RNGService(5).stream("events"))
+    e2 = EventSystem(RNGService(5).stream("events"))
+    assert [e1.random_event().event_type for _ in range(10)] == \
+           [e2.random_event().event_type for _ in range(10)]
+
+
+def _record(tmp_path):
+    times = iter(range(0, 10**6, 1800))  # half an hour between commands
+    session = Session(seed=9, clock=lambda: float(next(times)))
+    path = tmp_path / "run.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        ActionRecorder.for_session(f, session)
+        session.run_script(SCRIPT, out=None)
+    session.recorder = None
+    return session, path
+
+
+def test_replay_reproduces_session(tmp_path):
+    original, path = _record(tmp_path)
+    result = replay(str(path))
+    assert result.ok and result.commands == len(SCRIPT)
+    assert player_to_dict(result.session.player) == player_to_dict(original.player)
+    assert [e.event_type for e in result.session.player.events.get_active_events()] == \
+           [e.event_type for e in original.player.events.get_active_events()]
+
+
+def test_replay_reports_divergence(tmp_path):
+    _, path = _record(tmp_path)
+    lines = path.read_text().splitlines()
+    entry = json.loads(lines[3])
+    entry["cmd"] = "gather mountains coal"
+    lines[3] = json.dumps(entry)
+    path.write_text("\n".join(lines) + "\n")
+    result = replay(str(path))
+    assert not result.ok
+    assert result.mismatches[0] == 2
+
+
+def test_replay_uses_recorded_load_state(tmp_path):
+    save = tmp_path / "r.json"
+    times = iter(range(0, 10**6, 60))
+    session = Session(seed=3, clock=lambda: float(next(times)))
+    path = tmp_path / "load.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        ActionRecorder.for_session(f, session)
+        session.run_script(["events trigger", f"save {save}", "gather", f"load {save}",
+                            "events trigger", "status"], out=None)
+    session.recorder = None
+
+    save.unlink()
+    result = replay(str(path))
+    assert result.ok
+    assert player_to_dict(result.session.player) == player_to_dict(session.player)
+
+
+def test_load_continues_random_streams_from_the_save(tmp_path):
+    save = tmp_path / "s.json"
+    session = Session(seed=11)
+    session.execute("events trigger")
+    session.execute(f"save {save}")
+    after_save = session.execute("events trigger")
+    session.execute(f"load {save}")
+    assert session.execute("events trigger") == after_save
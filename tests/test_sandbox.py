@@ -1,7 +1,12 @@
+import pytest
+
 from codexrpg.quest import Quest, QuestLog, QuestStatus
 from codexrpg.npc import NPC, NPCRole, get_npc, list_npcs
-from codexrpg.crafting import CraftingSystem, Recipe, GatheringSystem, HEALING_RECIPE, HEALING_POTION
+from codexrpg.crafting import CraftingSystem, Recipe, GatheringSystem, HEALING_RECIPE, HEALING_POTION, COMMON_HERB
 from codexrpg.item import Item, ItemType, ItemRarity
+from codexrpg.economy import MerchantEconomy
+from codexrpg.reputation import Faction, ReputationSystem
+from codexrpg.player import Player
 
 
 def test_quest_lifecycle():
@@ -47,6 +52,10 @@ def test_npc_merchants():
     assert npc.buy_from_player("herb_common") == 15
     assert npc.buy_from_player("unknown") == -1
     assert npc.sell_to_player("potion_heal") == HEALING_POTION
+    # Edits that keep the list's length are seen too
+    npc.sell_inventory[0] = COMMON_HERB
+    assert npc.sell_to_player("potion_heal") is None
+    assert npc.sell_to_player("herb_common") is COMMON_HERB
 
 
 def test_crafting_system():
@@ -101,3 +110,152 @@ def test_default_npcs_exist():
     
     blacksmith = get_npc("blacksmith_oak")
     assert blacksmith.role == NPCRole.BLACKSMITH
+
+
+def test_merchant_stock_restocks_lazily():
+    economy = MerchantEconomy()
+    economy.add_stock(HEALING_POTION, quantity=4, restock_amount=2, restock_interval=100, now=0.0)
+    assert economy.take_stock("potion_heal", 4, now=0.0)
+    assert economy.get_stock("potion_heal", now=50.0) == 0
+    assert economy.get_stock("potion_heal", now=250.0) == 4
+    assert economy.get_stock("potion_heal", now=10000.0) == 4  # capped
+    assert not economy.take_stock("missing", now=0.0)
+
+
+def test_merchant_prices_react_to_sales_and_reputation():
+    npc = NPC("trader", "Trader", NPCRole.MERCHANT, buy_prices={"herb_common": 20},
+              faction=Faction.MERCHANTS_GUILD)
+    herb = Item("herb_common", "Common Herb")
+    rock = Item("rock", "Rock")
+
+    quotes = npc.quote_inventory([herb, herb, rock, herb], now=0.0)
+    assert quotes["rock"]["unit_price"] == -1
+    assert quotes["herb_common"]["quantity"] == 3
+    assert quotes["herb_common"]["unit_price"] == 20
+    assert quotes["herb_common"]["total"] < 60  # each unit sold lowers the next
+
+    npc.economy.record_player_sale("herb_common", 10, now=0.0)
+    assert npc.buy_from_player("herb_common", now=0.0) == 13
+    # Pressure halves every recovery half-life
+    assert npc.buy_from_player("herb_common", now=3600.0) == 16
+
+    rep = ReputationSystem()
+    rep.add_reputation(Faction.MERCHANTS_GUILD, 600)
+    npc.stock_item(HEALING_POTION, quantity=5)
+    assert npc.quote_price("potion_heal", rep) < npc.quote_price("potion_heal")
+
+
+def test_player_trades_with_merchant():
+    npc = NPC("trader", "Trader", NPCRole.MERCHANT, buy_prices={"herb_common": 10})
+    npc.stock_item(HEALING_POTION, quantity=1)
+    player = Player("Buyer")
+    player.add_gold(200)
+
+    assert npc.sell_item(player, "potion_heal")
+    assert player.inventory == [HEALING_POTION]
+    assert not npc.sell_item(player, "potion_heal")  # sold out
+
+    player.add_item(Item("herb_common", "Common Herb"))
+    gold = player.gold
+    assert npc.buy_item(player, "herb_common") == 10
+    assert player.gold == gold + 10
+    assert player.inventory == [HEALING_POTION]
+
+
+def test_negative_trade_quantities_are_rejected():
+    npc = NPC("trader", "Trader", NPCRole.MERCHANT, buy_prices={"herb_common": 10})
+    npc.stock_item(HEALING_POTION, quantity=3)
+    player = Player("Cheat")
+    player.add_item(Item("herb_common", "Common Herb"))
+
+    assert not npc.sell_item(player, "potion_heal", -5)
+    assert not npc.sell_item(player, "potion_heal", 0)
+    assert npc.buy_item(player, "herb_common", -1) == 0
+    assert player.gold == 0
+    assert npc.economy.get_stock("potion_heal") == 3
+    assert len(player.inventory) == 1
+
+
+def test_high_volume_objects_are_slotted_and_interned():
+    from codexrpg.events import WorldEvent, EventType
+    from codexrpg.item import intern_item
+    from codexrpg.skills import Skill
+
+    herb = Item("herb_common", "Common Herb")
+    assert not hasattr(herb, "__dict__")
+    assert not hasattr(WorldEvent("e", EventType.FESTIVAL, "t", "d", "town"), "__dict__")
+    assert not hasattr(Skill("s", "S"), "__dict__")
+
+    # Prototypes are immutable and shared
+    with pytest.raises(AttributeError):
+        HEALING_POTION.value = 1
+    assert intern_item(Item("potion_heal", "Another Potion")) is HEALING_POTION
+    assert HEALING_RECIPE.result is HEALING_POTION
+
+
+def test_item_registry_loads_lazily_and_shares_instances(tmp_path):
+    import copy
+    import json
+    from codexrpg.item import ItemRegistry, ItemInstance, get_item
+
+    path = tmp_path / "items.json"
+    path.write_text(json.dumps({"items": [
+        {"id": "herb_common", "name": "File Herb"},
+        {"id": "axe", "name": "Axe", "type": "weapon", "max_durability": 50},
+    ]}))
+    registry = ItemRegistry(path)
+    registry.register(HEALING_POTION)
+    assert registry.get("potion_heal") is HEALING_POTION
+    assert not registry._loaded  # known ids never touch the file
+
+    herb = registry.get("herb_common")
+    assert registry._loaded and herb.name == "File Herb"
+    assert registry.create("herb_common") is herb
+    assert registry.get("missing") is None
+
+    axe = registry.create("axe")
+    assert isinstance(axe, ItemInstance)
+    assert axe.name == "Axe" and axe.item_type == ItemType.WEAPON
+    assert axe.wear(49) and not axe.wear(5)
+    assert axe.proto is registry.get("axe")
+    axe_copy = copy.deepcopy(axe)
+    assert axe_copy.durability == 0 and axe_copy.proto is axe.proto
+
+    # The packaged data file is valid and ids map to shared objects
+    assert get_item("resource_gathered") is get_item("resource_gathered")
+
+
+def test_item_registry_load_is_retried_and_thread_safe(tmp_path, monkeypatch):
+    import json
+    import threading
+    from codexrpg import item as item_module
+    from codexrpg.item import ItemRegistry
+
+    path = tmp_path / "items.json"
+    path.write_text("{broken")
+    registry = ItemRegistry(path)
+    with pytest.raises(ValueError):
+        registry.get("herb_common")
+    assert not registry._loaded
+
+    path.write_text(json.dumps({"items": [{"id": "herb_common", "name": "File Herb"}]}))
+    parsing = threading.Event()
+    release = threading.Event()
+    real_from_dict = item_module.item_from_dict
+
+    def slow_from_dict(entry):
+        parsing.set()
+        release.wait(5)
+        return real_from_dict(entry)
+
+    monkeypatch.setattr(item_module, "item_from_dict", slow_from_dict)
+    first = threading.Thread(target=registry.get, args=("herb_common",))
+    first.start()
+    assert parsing.wait(5)
+    seen = []
+    second = threading.Thread(target=lambda: seen.append(registry.get("herb_common")))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert seen[0] is not None and seen[0].name == "File Herb"
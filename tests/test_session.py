@@ -0,0 +1,173 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from codexrpg.events import EventType
+from codexrpg.item import ITEMS
+from codexrpg.player import Player
+from codexrpg.quest import QUESTS, Quest, QuestStatus
+from codexrpg.reputation import Faction
+from codexrpg.save import player_from_dict, player_to_dict
+from codexrpg.session import Session
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def make_session(**kwargs):
+    return Session(seed=7, clock=lambda: 1000.0, **kwargs)
+
+
+def test_state_persists_between_commands():
+    s = make_session()
+    s.run_script(["gather forest herb_common", "gather forest herb_common",
+                  "gather village water_pure"], out=None)
+    assert len(s.player.inventory) == 3
+    assert s.execute("craft craft_healing_potion") == "Crafted Healing Potion."
+    assert [i.id for i in s.player.inventory] == ["potion_heal"]
+    assert "Cannot craft" in s.execute("craft craft_healing_potion")
+
+
+def test_bad_input_reports_instead_of_raising():
+    s = make_session()
+    assert "Unknown command" in s.execute("fly away")
+    assert "Bad arguments" in s.execute("craft")
+    assert "Usage" in s.execute("home take")
+    assert "Unknown event type" in s.execute("events trigger nope")
+    assert s.execute("# just a comment") == ""
+
+
+def test_bad_save_paths_report_instead_of_raising(tmp_path):
+    s = make_session()
+    s.execute("gather")
+    assert s.execute(f"load {tmp_path / 'nonexistent.json'}").startswith("Could not load")
+    assert s.execute(f"save {tmp_path / 'missing_dir' / 'x.json'}").startswith("Could not save")
+    (tmp_path / "junk.json").write_text("{}")
+    assert "not a valid save" in s.execute(f"load {tmp_path / 'junk.json'}")
+    assert len(s.player.inventory) == 1
+
+
+def test_unknown_saved_class_is_an_error():
+    data = player_to_dict(Player("Ada"))
+    data["class"] = "bard"
+    with pytest.raises(ValueError, match="unknown class 'bard'"):
+        player_from_dict(data)
+
+
+def test_events_resolve_pays_reward():
+    s = make_session()
+    out = s.execute("events trigger treasure_found")
+    event_id = out[1:out.index("]")]
+    assert s.execute(f"events resolve {event_id}") == "Resolved Hidden Treasure (+200 gold)."
+    assert s.player.gold == 200
+
+
+def test_script_stops_at_quit():
+    s = make_session()
+    lines = io.StringIO("gather\nquit\ngather\n")
+    assert s.run_script(lines, out=None) == 2
+    assert len(s.player.inventory) == 1
+
+
+def test_player_round_trip():
+    p = Player("Ada")
+    p.add_item(ITEMS.get("herb_common"))
+    p.add_item(ITEMS.create("dagger_steel", durability=12))
+    p.gold = 55
+    p.position = (12, 3)
+    p.reputation.add_reputation(Faction.ROYAL_GUARD, 300, now=10.0)
+    home = p.homesteads.get_active_homestead()
+    home.add_storage_item(ITEMS.get("coal"), 4)
+    home.add_resident("npc_1", None)
+    p.events.trigger_event(EventType.FESTIVAL, "forest")
+
+    q = player_from_dict(player_to_dict(p))
+    assert (q.name, q.gold, q.character_class.id) == ("Ada", 55, p.character_class.id)
+    assert q.position == (12, 3)
+    assert q.inventory[0] is ITEMS.get("herb_common")
+    assert q.inventory[1].durability == 12
+    assert q.reputation.get_reputation(Faction.ROYAL_GUARD, now=10.0) == 300
+    assert q.reputation.get_history(Faction.ROYAL_GUARD) == [(10.0, 300, 300)]
+    qhome = q.homesteads.get_active_homestead()
+    assert qhome.storage.count("coal") == 4
+    assert qhome.npcs_living_here == ["npc_1"]
+    assert len(q.events.get_active_events("forest")) == 1
+
+
+def test_stored_item_instances_keep_their_state():
+    p = Player("Smith")
+    home = p.homesteads.get_active_homestead()
+    worn = ITEMS.create("dagger_steel", durability=5, enchantments=["fire"])
+    home.deposit_items([ITEMS.create("dagger_steel"), worn])
+    assert home.storage.count("dagger_steel") == 2
+
+    qhome = player_from_dict(player_to_dict(p)).homesteads.get_active_homestead()
+    first, second = qhome.withdraw_items("dagger_steel", 2)
+    assert first is not second
+    assert (first.durability, first.enchantments) == (80, None)
+    assert (second.durability, second.enchantments) == (5, ["fire"])
+
+
+def test_save_and_resume(tmp_path):
+    path = str(tmp_path / "save.json")
+    s = make_session()
+    s.run_script(["gather mountains ore_iron", "build tower_1 tower Mountain Tower",
+                  f"save {path}"], out=None)
+    resumed = Session.load(path)
+    assert [i.id for i in resumed.player.inventory] == ["ore_iron"]
+    assert resumed.player.homesteads.get_homestead("tower_1").name == "Mountain Tower"
+    assert resumed.world.grid == s.world.grid
+
+
+def test_quests_resume_on_private_copies(tmp_path, monkeypatch):
+    herbs = Quest("fetch_herbs", "Gather Herbs", "Collect 5 herbs", "npc_1", "Bring 5 herbs")
+    monkeypatch.setitem(QUESTS, herbs.id, herbs)
+    path = str(tmp_path / "save.json")
+    s = make_session()
+    s.player.quest_log.add_quest(Quest("fetch_herbs", "Gather Herbs", "Collect 5 herbs", "npc_1", "Bring 5 herbs"))
+    s.player.quest_log.accept_quest("fetch_herbs")
+    s.run_script([f"save {path}"], out=None)
+
+    resumed = Session.load(path)
+    quest = resumed.player.quest_log.get_quest("fetch_herbs")
+    assert quest.status is QuestStatus.ACTIVE and quest.title == "Gather Herbs"
+    assert quest is not herbs and herbs.status is QuestStatus.AVAILABLE
+    other = Session.load(path).player.quest_log.get_quest("fetch_herbs")
+    quest.complete()
+    assert other.status is QuestStatus.ACTIVE
+
+
+def test_cli_shell_reports_unreadable_saves(tmp_path):
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_text("{not json")
+    env = dict(os.environ, PYTHONPATH=SRC, CODEXRPG_CACHE_DIR=str(tmp_path))
+    for path in (tmp_path / "missing.json", corrupt):
+        proc = subprocess.run([sys.executable, "-m", "codexrpg.cli", "shell", "--load", str(path)],
+                              input="", capture_output=True, text=True, env=env)
+        assert proc.returncode == 2 and f"could not load {path}" in proc.stderr
+        assert "Traceback" not in proc.stderr
+
+
+def test_cli_shell_runs_script_from_stdin(tmp_path):
+    save = tmp_path / "out.json"
+    script = "gather\n" * 50 + "inventory\n"
+    env = dict(os.environ, PYTHONPATH=SRC)
+    proc = subprocess.run(
+        [sys.executable, "-m", "codexrpg.cli", "shell", "--seed", "1", "--script", "-",
+         "--quiet", "--save", str(save)],
+        input=script, capture_output=True, text=True, env=env, check=True
+    )
+    assert "Ran 51 commands" in proc.stdout
+    assert Session.load(str(save)).player.inventory.count(ITEMS.get("herb_common")) == 50
+
+
+def test_cli_accepts_content_pack_classes(tmp_path):
+    env = dict(os.environ, PYTHONPATH=SRC, CODEXRPG_CACHE_DIR=str(tmp_path))
+    proc = subprocess.run([sys.executable, "-m", "codexrpg.cli", "create-player", "Bob", "--class", "ranger"],
+                          capture_output=True, text=True, env=env, check=True)
+    assert "Player created: Bob" in proc.stdout
+    bad = subprocess.run([sys.executable, "-m", "codexrpg.cli", "create-player", "--class", "bard"],
+                         capture_output=True, text=True, env=env)
+    assert bad.returncode == 2 and "unknown class 'bard'" in bad.stderr
@@ -0,0 +1,67 @@
+from codexrpg.spatial import SpatialGrid, resolve_location
+from codexrpg.events import EventSystem, EventType
+from codexrpg.npc import NPC, NPCRole, list_npcs, register_npc, move_npc, NPCS, NPC_INDEX
+from codexrpg.homestead import HomesteadSystem, HomesteadType
+
+
+def test_spatial_grid_queries():
+    grid = SpatialGrid(cell_size=4)
+    grid.insert("a", 0, 0)
+    grid.insert("b", 3, 4)
+    grid.insert("c", 40, 40)
+
+    assert sorted(grid.query_rect(0, 0, 10, 10)) == ["a", "b"]
+    assert grid.query_radius(0, 0, 5) == ["a", "b"]
+    assert grid.query_radius(0, 0, 4.9) == ["a"]
+
+    grid.insert("a", 39, 41)  # move
+    assert grid.query_radius(40, 40, 2) == ["c", "a"]
+    assert grid.remove("c")
+    assert not grid.remove("c")
+    assert len(grid) == 2
+    assert sorted(grid.query_rect(-1000, -1000, 1000, 1000)) == ["a", "b"]
+
+
+def test_resolve_location():
+    assert resolve_location("village") == (2, 7)
+    assert resolve_location("village", (9, 9)) == (9, 9)
+    assert resolve_location("world") is None
+
+
+def test_events_near_and_by_location():
+    events = EventSystem()
+    forest = events.trigger_event(EventType.TREASURE_FOUND, "forest")
+    road = events.trigger_event(EventType.BANDIT_ENCOUNTER, "road")
+    far = events.trigger_event(EventType.FESTIVAL, "camp", position=(90, 90))
+    events.trigger_event(EventType.WEATHER_CHANGE)  # world-wide, no tile
+
+    assert events.events_near(3, 3, 1) == [road]
+    assert {e.id for e in events.events_in_rect(0, 0, 10, 10)} == {forest.id, road.id}
+    assert events.events_near(90, 90, 0) == [far]
+    assert events.get_active_events("forest") == [forest]
+
+    events.resolve_event(road.id)
+    assert events.events_near(3, 3, 1) == []
+    assert events.get_active_events("road") == []
+
+
+def test_npcs_near():
+    nearby = list_npcs(near=(5, 5), radius=1)
+    assert set(nearby) == {"blacksmith_oak", "merchant_tudor", "alchemist_zara"}
+
+    hermit = NPC("hermit", "Hermit", NPCRole.VILLAGER, location="cave", position=(30, 30))
+    register_npc(hermit)
+    try:
+        assert list(list_npcs(near=(31, 30), radius=2)) == ["hermit"]
+        move_npc("hermit", 0, 0)
+        assert list_npcs(near=(31, 30), radius=2) == {}
+    finally:
+        NPCS.pop("hermit")
+        NPC_INDEX.remove("hermit")
+
+
+def test_homesteads_near():
+    homes = HomesteadSystem()
+    homes.create_homestead("h1", "Cottage", HomesteadType.COTTAGE, "village")
+    homes.create_homestead("h2", "Tower", HomesteadType.TOWER, "mountains")
+    assert [h.id for h in homes.homesteads_near(2, 6, 2)] == ["h1"]
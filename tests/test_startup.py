@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+# Regression threshold for the package's own import work (microseconds).
+# Measured around 6ms; generous headroom for slow CI machines.
+CLI_IMPORT_BUDGET_US = 30_000
+
+HEAVY_MODULES = {
+    "codexrpg.game", "codexrpg.player", "codexrpg.world", "codexrpg.worldgen",
+    "codexrpg.crafting", "codexrpg.reputation", "codexrpg.events",
+    "codexrpg.homestead", "codexrpg.npc", "codexrpg.quest",
+}
+
+
+def _importtime(code: str):
+    """Run ``code`` under -X importtime; return ({module: self_us}, stdout)."""
+    env = dict(os.environ, PYTHONPATH=SRC)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, env=env, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_us)
+    return times, proc.stdout
+
+
+def test_cli_import_is_lazy_and_fast():
+    best = None
+    for _ in range(3):
+        times, _ = _importtime("import codexrpg.cli")
+        own = sum(us for name, us in times.items() if name.startswith("codexrpg"))
+        best = own if best is None else min(best, own)
+    assert not HEAVY_MODULES & set(times), sorted(HEAVY_MODULES & set(times))
+    assert best < CLI_IMPORT_BUDGET_US, f"codexrpg import work took {best}us"
+
+
+def test_package_attributes_load_on_demand():
+    _, out = _importtime(
+        "import sys, codexrpg\n"
+        "print('codexrpg.game' in sys.modules)\n"
+        "codexrpg.Game\n"
+        "print('codexrpg.game' in sys.modules)"
+    )
+    assert out.split() == ["False", "True"]
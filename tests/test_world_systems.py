@@ -1,9 +1,9 @@
 from codexrpg.reputation import ReputationSystem, Faction
 from codexrpg.events import EventSystem, EventType
-from codexrpg.homestead import HomesteadSystem, HomesteadType, Homestead
+from codexrpg.homestead import HomesteadSystem, HomesteadType, Homestead, ResidentJob
 from codexrpg.player import Player
 from codexrpg.character_class import get_class_by_id
-from codexrpg.item import Item, ItemType
+from codexrpg.item import Item, ItemType, ItemRarity
 
 
 def test_reputation_system():
@@ -129,3 +129,132 @@ def test_homestead_info():
     assert info["level"] == 3
     assert info["gold"] == 250
     assert info["residents"] == 1
+
+
+def test_reputation_decay_is_lazy():
+    rep = ReputationSystem(decay_rate=0.5)
+    rep.add_reputation(Faction.MERCHANTS_GUILD, 300, now=1000.0)
+    rep.add_reputation(Faction.ROYAL_GUARD, -300, now=1000.0)
+
+    # Stored value is untouched until something writes; reads see decay
+    assert rep.get_reputation(Faction.MERCHANTS_GUILD, now=1100.0) == 250
+    assert rep.get_reputation(Faction.ROYAL_GUARD, now=1100.0) == -250
+    assert rep.factions[Faction.MERCHANTS_GUILD].reputation == 300
+
+    # Decay stops at neutral
+    assert rep.get_reputation(Faction.MERCHANTS_GUILD, now=5000.0) == 0
+
+    # Fractional progress survives a write in between
+    rep.add_reputation(Faction.MERCHANTS_GUILD, 0, now=1001.5)
+    assert rep.get_reputation(Faction.MERCHANTS_GUILD, now=1002.0) == 299
+
+
+def test_reputation_history_ring_buffer():
+    rep = ReputationSystem()
+    for i in range(40):
+        rep.add_reputation(Faction.NATURE_DRUIDS, 10, now=float(i))
+
+    history = rep.get_history(Faction.NATURE_DRUIDS)
+    assert len(history) == 16
+    assert history[-1] == (39.0, 10, 400)
+    assert rep.get_history(Faction.ROYAL_GUARD) == []
+
+
+def test_homestead_offline_production():
+    home = Homestead("farm", "Farmstead", HomesteadType.COTTAGE, last_produced=0.0)
+    home.add_resident("villager_mae")
+    home.add_resident("miner_bob")
+    home.resident_jobs = {"villager_mae": ResidentJob.FARMER, "miner_bob": ResidentJob.TRADER}
+
+    # Ten hours away: 10 * (2 + 12) gold and 10 * 3 herbs
+    produced = home.catch_up(now=36000.0)
+    assert produced == {"gold": 140, "herb_common": 30}
+    assert home.gold_stored == 140
+    assert len(home.storage) == 30
+
+    # A week away is capped by storage and gold capacity
+    home.catch_up(now=36000.0 + 7 * 24 * 3600)
+    assert home.gold_stored == home.gold_capacity
+    assert len(home.storage) == home.storage_capacity
+
+
+def test_homestead_system_catch_up_scales_with_level_and_type():
+    homes = HomesteadSystem()
+    cottage = homes.create_homestead("h1", "Cottage", HomesteadType.COTTAGE)
+    estate = homes.create_homestead("h2", "Estate", HomesteadType.ESTATE)
+    for home in (cottage, estate):
+        home.last_produced = 0.0
+        home.add_resident("worker")
+        home.resident_jobs["worker"] = ResidentJob.TRADER
+    estate.level = 3
+
+    totals = homes.catch_up(now=3600.0)
+    # cottage: 12/h, estate: 12 * 2.0 * 2.0 = 48/h
+    assert cottage.gold_stored == 12
+    assert estate.gold_stored == 48
+    assert totals["gold"] == 60
+
+
+def test_homestead_storage_stacks():
+    home = Homestead("vault", "Vault", HomesteadType.TOWER)
+    herb = Item("herb_common", "Common Herb")
+    gem = Item("gem", "Ruby", rarity=ItemRarity.RARE)
+    home.deposit_items([herb, herb, gem, herb])
+
+    assert len(home.storage) == 4
+    assert home.storage.count("herb_common") == 3
+    info = home.get_info()
+    assert info["storage_by_type"] == {"ingredient": 4}
+    assert info["storage_by_rarity"] == {"common": 3, "rare": 1}
+
+    assert home.remove_storage_item(gem)
+    assert not home.remove_storage_item(gem)
+    assert home.withdraw_items("herb_common", 5) == [herb, herb, herb]
+    assert len(home.storage) == 0
+    assert home.get_info()["storage_by_rarity"] == {}
+
+
+def test_player_moves_inventory_home():
+    player = Player("Hauler")
+    for i in range(10):
+        player.add_item(Item(f"ore_{i % 2}", "Ore"))
+
+    assert player.store_inventory() == 10
+    assert player.inventory == []
+    home = player.homesteads.get_active_homestead()
+    assert home.storage.count("ore_0") == 5
+
+    assert player.retrieve_from_home("ore_1", 2) == 2
+    assert len(player.inventory) == 2
+    assert home.storage.count("ore_1") == 3
+
+
+def test_storage_rejects_bad_quantities_and_respects_capacity():
+    player = Player("Hoarder")
+    home = player.homesteads.get_active_homestead()
+    ore = Item("ore_iron", "Iron Ore")
+    home.add_storage_item(ore, 2)
+    assert not home.remove_storage_item(ore, -3)
+    assert not home.remove_storage_item(ore, 0)
+    assert home.storage.count("ore_iron") == 2
+
+    for _ in range(home.storage_capacity):
+        player.add_item(ore)
+    assert player.store_inventory() == home.storage_capacity - 2
+    assert len(home.storage) == home.storage_capacity
+    assert len(player.inventory) == 2
+
+
+def test_storage_keeps_item_instances_apart():
+    from codexrpg.item import ItemInstance
+
+    home = Homestead("armory", "Armory", HomesteadType.TOWER)
+    proto = Item("dagger_steel", "Steel Dagger", max_durability=80)
+    fresh, worn = ItemInstance(proto), ItemInstance(proto, 5, ["fire"])
+    home.deposit_items([fresh, worn])
+
+    assert len(home.storage) == 2
+    assert not home.remove_storage_item(ItemInstance(proto))  # equal state, different object
+    assert home.remove_storage_item(worn)
+    assert home.withdraw_items("dagger_steel", 5) == [fresh]
+    assert len(home.storage) == 0
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from codexrpg.jobs import GenerationParams, WorldGenQueue
+from codexrpg.worldcache import WorldCache, cache_key
+from codexrpg.worldstore import WorldStore
+from codexrpg.worldgen import WorldGenerator
+
+
+def generate(params):
+    return WorldGenerator(params.width, params.height, seed=params.seed).generate(
+        octaves=params.octaves, persistence=params.persistence, base_freq=params.base_freq)
+
+
+def test_key_covers_every_parameter():
+    base = GenerationParams(seed=1, width=8, height=8)
+    variants = [GenerationParams(seed=2, width=8, height=8), GenerationParams(seed=1, width=9, height=8),
+                GenerationParams(seed=1, width=8, height=8, octaves=3),
+                GenerationParams(seed=1, width=8, height=8, persistence=0.6),
+                GenerationParams(seed=1, width=8, height=8, base_freq=2),
+                GenerationParams(seed=1, width=8, height=8, noise="simplex", warp=1.0)]
+    assert cache_key(base) == cache_key(GenerationParams(seed=1, width=8, height=8))
+    assert len({cache_key(base)} | {cache_key(v) for v in variants}) == 7
+
+
+def test_round_trip_through_mmap(tmp_path):
+    cache = WorldCache(tmp_path)
+    params = GenerationParams(seed=7, width=13, height=9, octaves=3)
+    elevation, biomes = generate(params)
+    assert cache.get(params) is None
+    cache.put(params, elevation, biomes)
+
+    world = cache.get(params)
+    assert (world.width, world.height) == (13, 9)
+    assert world.biome_rows() == biomes
+    assert world.biome_at(12, 8) == biomes[8][12]
+    assert world.elevation_at(3, 4) == pytest.approx(elevation[4][3], abs=1e-6)
+    world.close()
+
+
+def test_corrupt_files_are_misses(tmp_path):
+    cache = WorldCache(tmp_path)
+    params = GenerationParams(seed=1, width=4, height=4)
+    cache.put(params, *generate(params))
+    path = cache.path_for(params)
+    path.write_bytes(path.read_bytes()[:40])
+    assert cache.get(params) is None
+    with pytest.raises(ValueError):
+        WorldStore(path)
+
+
+def test_lru_eviction_keeps_recent_files(tmp_path):
+    params = [GenerationParams(seed=s, width=16, height=16) for s in range(4)]
+    cache = WorldCache(tmp_path, max_bytes=10**9)
+    for i, p in enumerate(params):
+        cache.put(p, *generate(p))
+        os.utime(cache.path_for(p), (1000 + i, 1000 + i))
+    size = cache.path_for(params[0]).stat().st_size
+    cache.get(params[0]).close()  # a hit makes seed 0 the most recent
+    cache.max_bytes = size * 2
+    cache.evict()
+    remaining = {p.seed for p in params if cache.path_for(p).exists()}
+    assert remaining == {0, 3}
+
+
+def test_queue_serves_repeats_from_cache(tmp_path):
+    queue = WorldGenQueue(max_workers=1, cache=WorldCache(tmp_path))
+    try:
+        params = GenerationParams(seed=11, width=20, height=20, octaves=2)
+        job = queue.wait(queue.submit(params).id, timeout=30)
+        assert job.stage == "done" and isinstance(job.result, WorldStore)
+        assert job.biomes() == generate(params)[1]
+    finally:
+        queue.shutdown()
+    # A fresh queue (e.g. after a restart) never touches the pool
+    queue = WorldGenQueue(max_workers=1, cache=WorldCache(tmp_path))
+    try:
+        again = queue.submit(params)
+        assert again.stage == "cached" and again.biomes() == job.biomes()
+    finally:
+        queue.shutdown()
@@ -0,0 +1,56 @@
+from array import array
+
+import pytest
+
+from codexrpg.world import World
+from codexrpg.worldgen import WorldGenerator
+from codexrpg.worldstore import WorldStore, write_world
+
+
+def float32(rows):
+    return [array("f", row).tolist() for row in rows]
+
+
+def test_regions_read_across_chunk_borders(tmp_path):
+    elevation, biomes = WorldGenerator(50, 37, seed=8).generate(octaves=3)
+    path = write_world(tmp_path / "w.world", elevation, biomes, chunk=16)
+    with WorldStore(path) as store:
+        assert (store.width, store.height, store.chunk) == (50, 37, 16)
+        assert store.biome_rows() == biomes
+        assert store.elevation_rows() == float32(elevation)
+        assert store.read_region(10, 5, 30, 20) == [row[10:40] for row in biomes[5:25]]
+        # Windows hanging off the map are clipped
+        assert store.read_region(-4, 30, 10, 20) == [row[:6] for row in biomes[30:]]
+        assert store.read_region(60, 0, 5, 5) == [[] for _ in range(5)]
+        assert store.biome_at(49, 36) == biomes[36][49]
+        assert store.elevation_at(17, 16) == pytest.approx(elevation[16][17], abs=1e-6)
+
+
+def test_generate_to_matches_in_memory_generation(tmp_path):
+    elevation, biomes = WorldGenerator(70, 90, seed="big").generate(octaves=2)
+    updates = []
+    path = WorldGenerator(70, 90, seed="big").generate_to(tmp_path / "g.world", octaves=2,
+                                                          progress=lambda f, s: updates.append(f))
+    with WorldStore(path) as store:
+        assert store.biome_rows() == biomes
+        assert store.elevation_rows() == float32(elevation)
+    assert updates == sorted(updates) and updates[-1] == 1.0
+
+
+def test_world_region_reads_from_store(tmp_path):
+    elevation, biomes = WorldGenerator(20, 20, seed=1).generate(octaves=2)
+    with WorldStore(write_world(tmp_path / "w.world", elevation, biomes)) as store:
+        world = World.from_store(store, load_grid=False)
+        assert world.grid == [] and (world.width, world.height) == (20, 20)
+        assert world.region(3, 4, 5, 2) == [row[3:8] for row in biomes[4:6]]
+    plain = World(20, 20)
+    plain.grid = biomes
+    assert plain.region(3, 4, 5, 2) == [row[3:8] for row in biomes[4:6]]
+    assert plain.region(18, -1, 5, 2) == [row[18:] for row in biomes[:1]]
+
+
+def test_rejects_foreign_files(tmp_path):
+    bad = tmp_path / "bad.world"
+    bad.write_bytes(b"not a world file at all")
+    with pytest.raises(ValueError):
+        WorldStore(bad)
@@ -1,17 +1,32 @@
 import sys
 import os
+import json
+import math
+import threading
+import time
+from functools import wraps
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from flask_cors import CORS
 from codexrpg.player import Player
+from codexrpg.game import Game
 from codexrpg.character_class import get_class_by_id, list_classes
 from codexrpg.world import World
+from codexrpg.pathfinding import Pathfinder
+from codexrpg.content import load_content_packs
 from codexrpg.npc import list_npcs, get_npc
 from codexrpg.quest import Quest
 from codexrpg.events import EventType
-from codexrpg.reputation import Faction
-from codexrpg.item import Item, ItemType
+from codexrpg.reputation import Faction, reputation_status
+from codexrpg.item import Item, ItemType, get_item
+from codexrpg.push import StateChannel
+from codexrpg.actions import ActionError, perform_action, perform_batch
+from codexrpg.jobs import GenerationParams, JobStatus, WorldGenQueue
+from codexrpg.worldcache import WorldCache
+from codexrpg.worldstore import WorldStore
+from codexrpg.minimap import MinimapCache
+from codexrpg.noise import ENGINES as NOISE_ENGINES, FRACTALS
 
 app = Flask(__name__, 
             template_folder='templates',
@@ -19,12 +34,171 @@ app = Flask(__name__,
             static_url_path='/static')
 CORS(app)
 
+# Built-in and modder content packs (compiled form is cached between starts)
+load_content_packs()
+
 # Global game state (in production use database)
 game_state = {
     'player': None,
-    'world': None
+    'world': None,
+    'world_job': None,  # id of the generation job the current world comes from
+    'pathfinder': None,
+    'game': None  # server-side tick loop for the current player
 }
 
+MAX_WORLD_SIZE = 1024
+MAX_REGION_CELLS = 256 * 256  # per /api/world/region response; ask for a coarser lod beyond this
+minimaps = MinimapCache()
+_world_jobs = None
+
+
+def get_world_jobs():
+    """Process-pool generation queue backed by the on-disk world cache, started on first use."""
+    global _world_jobs
+    if _world_jobs is None:
+        _world_jobs = WorldGenQueue(cache=WorldCache())
+    return _world_jobs
+
+
+def parse_flag(value):
+    """Boolean from JSON or a query string ("false" and "0" are False); raises ValueError otherwise."""
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in ('1', 'true', 'yes', 'on'):
+        return True
+    if text in ('', '0', 'false', 'no', 'off'):
+        return False
+    raise ValueError(f'expected a boolean, got {value!r}')
+
+
+def generation_params(data):
+    """GenerationParams from request JSON; raises ValueError on bad input."""
+    params = GenerationParams(
+        seed=int(data.get('seed', 42)),
+        width=int(data.get('width', 10)),
+        height=int(data.get('height', 10)),
+        octaves=int(data.get('octaves', 4)),
+        persistence=float(data.get('persistence', 0.5)),
+        base_freq=int(data.get('base_freq', 4)),
+        noise=str(data.get('noise', 'value')),
+        fractal=str(data.get('fractal', 'fbm')),
+        warp=float(data.get('warp', 0.0)),
+        climate=parse_flag(data.get('climate', False))
+    )
+    if not (1 <= params.width <= MAX_WORLD_SIZE and 1 <= params.height <= MAX_WORLD_SIZE):
+        raise ValueError(f'width and height must be between 1 and {MAX_WORLD_SIZE}')
+    if not 1 <= params.octaves <= 12:
+        raise ValueError('octaves must be between 1 and 12')
+    if params.noise not in NOISE_ENGINES or params.fractal not in FRACTALS:
+        raise ValueError(f"noise must be one of {', '.join(NOISE_ENGINES)} and fractal one of {', '.join(FRACTALS)}")
+    if not 0.0 <= params.warp <= 8.0:
+        raise ValueError('warp must be between 0 and 8')
+    return params
+
+
+def start_world_job(params):
+    """Generate the current world in the background."""
+    jobs = get_world_jobs()
+    job = jobs.submit(params)
+    game_state['world_job'] = job.id
+    jobs.on_done(job, install_world)
+    return job
+
+
+def install_world(job):
+    """Make a finished job's map the current world, unless a newer one was requested."""
+    if job.status is not JobStatus.DONE:
+        return
+    if isinstance(job.result, WorldStore):
+        # Keep the map on disk: views, mips and paths read windows from the mapped file
+        world = World.from_store(job.result, load_grid=False)
+    else:
+        world = World(job.params.width, job.params.height)
+        world.grid = job.biomes()
+    world.mips()  # build LOD levels now, outside the game lock, rather than on the first pan
+    with game_lock:
+        if game_state['world_job'] != job.id:
+            return
+        game_state['world'] = world
+        game_state['pathfinder'] = None
+
+
+# Game logic is synchronous: one request at a time touches the session,
+# whichever server (threaded dev server or the ASGI adapter) runs the view.
+game_lock = threading.RLock()
+
+
+def with_game_lock(view):
+    @wraps(view)
+    def locked(*args, **kwargs):
+        with game_lock:
+            return view(*args, **kwargs)
+    return locked
+
+
+def player_snapshot():
+    """Player state as pushed to clients over /api/stream."""
+    with game_lock:
+        player = game_state['player']
+        if not player:
+            return {}
+        player.homesteads.catch_up()
+        return player.get_info()
+
+
+# One snapshot per change, shared by every connected client
+state_channel = StateChannel(player_snapshot)
+STREAM_KEEPALIVE_SECONDS = 15
+
+
+@app.after_request
+def push_state_changes(response):
+    # Any successful write may have touched the player; the channel
+    # coalesces these and only sends a frame if the snapshot differs.
+    if request.method == 'POST' and response.status_code < 400:
+        state_channel.mark_dirty()
+    return response
+
+
+GAME_TICK_RATE = 10.0  # server-side simulation steps per second
+
+
+def run_game(game, changes):
+    """Ticker thread: advance ``game`` under the game lock until it is stopped."""
+    while game.running:
+        with game_lock:
+            if game.running:
+                game.update()
+        if changes:
+            changes.clear()
+            state_channel.mark_dirty()  # outside the game lock: snapshots take it
+        time.sleep(game.dt)
+
+
+def start_game(player):
+    """Run ``player``'s world systems on the server, replacing the previous player's loop."""
+    stop_game()
+    changes = []
+    game = Game(tick_rate=GAME_TICK_RATE).attach_player(player, on_change=lambda: changes.append(True))
+    game.start()
+    game_state['game'] = game
+    threading.Thread(target=run_game, args=(game, changes), daemon=True, name='game-ticker').start()
+
+
+def stop_game():
+    game = game_state['game']
+    if game is not None:
+        game.stop()
+        game_state['game'] = None
+
+
+def get_pathfinder():
+    """Pathfinder for the current world, built on first use."""
+    if game_state['pathfinder'] is None and game_state['world']:
+        game_state['pathfinder'] = Pathfinder.from_world(game_state['world'])
+    return game_state['pathfinder']
+
 
 @app.route('/')
 def index():
@@ -51,35 +225,68 @@ def get_classes():
 
 
 @app.route('/api/player/create', methods=['POST'])
+@with_game_lock
 def create_player():
     data = request.json
     name = data.get('name', 'Hero')
     class_id = data.get('class', 'warrior')
+    try:
+        params = generation_params(data.get('world', {}))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
     
     char_class = get_class_by_id(class_id)
     player = Player(name, character_class=char_class)
     game_state['player'] = player
+    start_game(player)
     
-    # Generate world for this player
-    game_state['world'] = World(10, 10)
-    game_state['world'].generate(seed=42)
+    # The world is generated in the background; poll /api/world/jobs/<id>
+    game_state['world'] = None
+    game_state['pathfinder'] = None
+    job = start_world_job(params)
     
     return jsonify({
         'success': True,
-        'player': player.get_info()
+        'player': player.get_info(),
+        'world_job': job.get_info()
     })
 
 
 @app.route('/api/player/info', methods=['GET'])
+@with_game_lock
 def player_info():
     if not game_state['player']:
         return jsonify({'error': 'No player created'}), 400
     
     player = game_state['player']
+    player.homesteads.catch_up()
     return jsonify(player.get_info())
 
 
+@app.route('/api/stream', methods=['GET'])
+def stream():
+    """Server-Sent Events: player-state frames, sent only when state changes."""
+    if not game_state['player']:
+        return jsonify({'error': 'No player created'}), 400
+    
+    # EventSource resends the last id on reconnect, so it resumes with a diff
+    since = request.headers.get('Last-Event-ID', 0, type=int)
+    
+    def events(version):
+        while True:
+            frame = state_channel.wait(version, timeout=STREAM_KEEPALIVE_SECONDS)
+            if frame is None:
+                yield ': keepalive\n\n'
+                continue
+            version = frame['version']
+            yield f"id: {version}\ndata: {json.dumps(frame)}\n\n"
+    
+    return Response(events(since), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 @app.route('/api/player/action', methods=['POST'])
+@with_game_lock
 def player_action():
     if not game_state['player']:
         return jsonify({'error': 'No player created'}), 400
@@ -88,46 +295,208 @@ def player_action():
     action = data.get('action')
     player = game_state['player']
     
-    if action == 'gather':
-        player.add_gold(10)
-        item = Item(f"resource_{player.gold}", "Gathered Resource")
-        player.add_item(item)
-        return jsonify({'success': True, 'message': 'Gathered resources!', 'gold': player.gold})
+    try:
+        return jsonify(perform_action(player, action, data))
+    except ActionError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/player/actions', methods=['POST'])
+@with_game_lock
+def player_actions():
+    """Apply an ordered list of actions in one round trip, all or nothing."""
+    if not game_state['player']:
+        return jsonify({'error': 'No player created'}), 400
     
-    elif action == 'rest':
-        player.hp = player.max_hp
-        return jsonify({'success': True, 'message': 'Fully rested!', 'hp': player.hp})
+    actions = (request.json or {}).get('actions')
+    if not isinstance(actions, list):
+        return jsonify({'error': 'actions must be a list'}), 400
+    player = game_state['player']
+    try:
+        results, failed = perform_batch(player, actions)
+    except ActionError as e:
+        return jsonify({'error': str(e)}), 400
     
-    elif action == 'trigger_event':
-        event = player.events.random_event()
+    if failed is not None:
         return jsonify({
-            'success': True,
-            'event': {
-                'title': event.title,
-                'description': event.description,
-                'reward': event.reward
-            }
-        })
-    
-    return jsonify({'error': 'Unknown action'}), 400
+            'success': False,
+            'failed_index': failed,
+            'results': results,
+            'player': player.get_info()
+        }), 400
+    return jsonify({'success': True, 'results': results, 'player': player.get_info()})
 
 
 @app.route('/api/world/info', methods=['GET'])
+@with_game_lock
 def world_info():
     if not game_state['world']:
+        job = game_state['world_job'] and get_world_jobs().get(game_state['world_job'])
+        if job and not job.finished:
+            return jsonify({'pending': True, 'job': job.get_info()}), 202
         return jsonify({'error': 'No world generated'}), 400
     
     world = game_state['world']
+    if not any(key in request.args for key in ('x', 'y', 'w', 'h')):
+        return jsonify({
+            'width': world.width,
+            'height': world.height,
+            'grid': world.region(0, 0, world.width, world.height)
+        })
+    # Viewport window: ?x=&y=&w=&h= (clipped to the map)
+    try:
+        x, y = int(request.args.get('x', 0)), int(request.args.get('y', 0))
+        w = int(request.args.get('w', world.width))
+        h = int(request.args.get('h', world.height))
+    except ValueError:
+        return jsonify({'error': 'x, y, w and h must be integers'}), 400
+    if w < 0 or h < 0:
+        return jsonify({'error': 'w and h must not be negative'}), 400
+    x0, y0 = max(0, x), max(0, y)
+    grid = world.region(x, y, w, h)
     return jsonify({
         'width': world.width,
         'height': world.height,
-        'grid': world.grid
+        'x': x0,
+        'y': y0,
+        'grid': grid
+    })
+
+
+@app.route('/api/world/region', methods=['GET'])
+@with_game_lock
+def world_region():
+    """Visible window of the map: ?x&y&w&h in world tiles, lod=n for one cell per 2**n tiles."""
+    world = game_state['world']
+    if not world:
+        return jsonify({'error': 'No world generated'}), 400
+    try:
+        x, y = int(request.args.get('x', 0)), int(request.args.get('y', 0))
+        w = int(request.args.get('w', world.width))
+        h = int(request.args.get('h', world.height))
+        lod = int(request.args.get('lod', 0))
+    except ValueError:
+        return jsonify({'error': 'x, y, w, h and lod must be integers'}), 400
+    mips = world.mips()
+    if w < 0 or h < 0 or not 0 <= lod <= mips.levels:
+        return jsonify({'error': f'w and h must not be negative and lod must be between 0 and {mips.levels}'}), 400
+    scale = 1 << lod
+    # Cells of the level that overlap the requested tiles
+    cx, cy = max(0, x) // scale, max(0, y) // scale
+    cw, ch = -(-(x + w) // scale) - cx, -(-(y + h) // scale) - cy
+    if max(0, cw) * max(0, ch) > MAX_REGION_CELLS:
+        return jsonify({'error': f'window exceeds {MAX_REGION_CELLS} cells at lod {lod}; use a coarser lod'}), 400
+    rows = mips.tile_rows(lod, cx, cy, cw, ch)
+    return jsonify({
+        'width': world.width,
+        'height': world.height,
+        'lod': lod,
+        'levels': mips.levels,
+        'scale': scale,
+        'x': cx * scale,
+        'y': cy * scale,
+        'palette': mips.palette,
+        'tiles': [list(row) for row in rows]
+    })
+
+
+@app.route('/api/world/minimap.png', methods=['GET'])
+def world_minimap():
+    """Whole-map PNG: ?scale= pixels per cell, lod= cells of 2**lod tiles. Revalidate with ETags."""
+    with game_lock:
+        world = game_state['world']
+    if not world:
+        return jsonify({'error': 'No world generated'}), 400
+    try:
+        scale = int(request.args.get('scale', 1))
+        lod = int(request.args.get('lod', 0))
+    except ValueError:
+        return jsonify({'error': 'scale and lod must be integers'}), 400
+    if not 0 <= lod <= world.mips().levels:
+        return jsonify({'error': f'lod must be between 0 and {world.mips().levels}'}), 400
+    etag = MinimapCache.etag(world, lod, scale)
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={'ETag': f'"{etag}"'})
+    # Rendered outside the game lock: a world is never modified once installed
+    try:
+        etag, png = minimaps.get(world, lod, scale)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    response = Response(png, mimetype='image/png')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # always revalidate; a new world changes the ETag
+    return response
+
+
+@app.route('/api/world/generate', methods=['POST'])
+@with_game_lock
+def world_generate():
+    """Queue a world generation; identical requests share one job."""
+    data = request.json or {}
+    try:
+        params = generation_params(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if data.get('activate'):
+        job = start_world_job(params)
+    else:
+        job = get_world_jobs().submit(params)
+    return jsonify(job.get_info()), 202
+
+
+@app.route('/api/world/jobs/<job_id>', methods=['GET'])
+def world_job(job_id):
+    """Job status; ?wait=N blocks up to N seconds for completion."""
+    wait = min(request.args.get('wait', 0, type=float), 30.0)
+    jobs = get_world_jobs()
+    job = jobs.wait(job_id, timeout=wait) if wait > 0 else jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.get_info())
+
+
+@app.route('/api/world/path', methods=['GET'])
+@with_game_lock
+def world_path():
+    pathfinder = get_pathfinder()
+    if not pathfinder:
+        return jsonify({'error': 'No world generated'}), 400
+    
+    try:
+        start = (int(request.args['sx']), int(request.args['sy']))
+        goal = (int(request.args['gx']), int(request.args['gy']))
+    except (KeyError, ValueError):
+        return jsonify({'error': 'sx, sy, gx and gy are required'}), 400
+    
+    hierarchical = request.args.get('hierarchical', '0') in ('1', 'true')
+    path = pathfinder.find_path(start, goal, hierarchical=hierarchical)
+    return jsonify({
+        'reachable': path is not None,
+        'path': [{'x': x, 'y': y} for x, y in path] if path else []
     })
 
 
+def parse_radius(args, default=5.0):
+    """?radius= as a finite, non-negative number of tiles; raises ValueError otherwise."""
+    radius = float(args.get('radius', default))
+    if not math.isfinite(radius) or radius < 0:
+        raise ValueError(f'bad radius {radius}')
+    return radius
+
+
 @app.route('/api/npcs', methods=['GET'])
+@with_game_lock
 def get_npcs_list():
-    npcs = list_npcs()
+    # Optional ?x=&y=&radius= narrows the list to NPCs near a tile
+    near = None
+    try:
+        if 'x' in request.args and 'y' in request.args:
+            near = (int(request.args['x']), int(request.args['y']))
+        radius = parse_radius(request.args)
+    except ValueError:
+        return jsonify({'error': 'x and y must be integers and radius a non-negative number'}), 400
+    npcs = list_npcs(near=near, radius=radius)
     return jsonify({
         'npcs': [
             {
@@ -135,6 +504,7 @@ def get_npcs_list():
                 'name': n.name,
                 'role': n.role.value,
                 'location': n.location,
+                'position': n.position,
                 'dialogue': n.dialogue
             }
             for nid, n in npcs.items()
@@ -142,7 +512,34 @@ def get_npcs_list():
     })
 
 
+@app.route('/api/nearby', methods=['GET'])
+@with_game_lock
+def nearby():
+    if not game_state['player']:
+        return jsonify({'error': 'No player created'}), 400
+    
+    player = game_state['player']
+    try:
+        x = int(request.args.get('x', 0))
+        y = int(request.args.get('y', 0))
+        radius = parse_radius(request.args)
+    except ValueError:
+        return jsonify({'error': 'x and y must be integers and radius a non-negative number'}), 400
+    return jsonify({
+        'npcs': list(list_npcs(near=(x, y), radius=radius)),
+        'events': [
+            {'id': e.id, 'title': e.title, 'position': e.position}
+            for e in player.events.events_near(x, y, radius)
+        ],
+        'homesteads': [
+            {'id': h.id, 'name': h.name, 'position': h.position}
+            for h in player.homesteads.homesteads_near(x, y, radius)
+        ]
+    })
+
+
 @app.route('/api/npc/<npc_id>', methods=['GET'])
+@with_game_lock
 def npc_info(npc_id):
     npc = get_npc(npc_id)
     if not npc:
@@ -157,6 +554,75 @@ def npc_info(npc_id):
     })
 
 
+@app.route('/api/npc/<npc_id>/shop', methods=['GET'])
+@with_game_lock
+def npc_shop(npc_id):
+    npc = get_npc(npc_id)
+    if not npc:
+        return jsonify({'error': 'NPC not found'}), 404
+    
+    player = game_state['player']
+    reputation = player.reputation if player else None
+    now = time.time()
+    return jsonify({
+        'id': npc_id,
+        'for_sale': [
+            {
+                'id': item.id,
+                'name': item.name,
+                'price': npc.quote_price(item.id, reputation, now),
+                'stock': npc.economy.get_stock(item.id, now)
+            }
+            for item in npc.list_for_sale()
+        ]
+    })
+
+
+@app.route('/api/npc/<npc_id>/quote', methods=['GET'])
+@with_game_lock
+def npc_quote(npc_id):
+    if not game_state['player']:
+        return jsonify({'error': 'No player created'}), 400
+    npc = get_npc(npc_id)
+    if not npc:
+        return jsonify({'error': 'NPC not found'}), 404
+    
+    player = game_state['player']
+    return jsonify({
+        'id': npc_id,
+        'quotes': npc.quote_inventory(player.inventory, player.reputation)
+    })
+
+
+@app.route('/api/npc/<npc_id>/trade', methods=['POST'])
+@with_game_lock
+def npc_trade(npc_id):
+    if not game_state['player']:
+        return jsonify({'error': 'No player created'}), 400
+    npc = get_npc(npc_id)
+    if not npc:
+        return jsonify({'error': 'NPC not found'}), 404
+    
+    data = request.json
+    player = game_state['player']
+    item_id = data.get('item_id')
+    quantity = data.get('quantity', 1)
+    if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity < 1:
+        return jsonify({'error': 'quantity must be a positive integer'}), 400
+    
+    if data.get('action') == 'buy':
+        if not npc.sell_item(player, item_id, quantity):
+            return jsonify({'error': 'Cannot buy item'}), 400
+        return jsonify({'success': True, 'gold': player.gold})
+    elif data.get('action') == 'sell':
+        paid = npc.buy_item(player, item_id, quantity)
+        if not paid:
+            return jsonify({'error': 'Merchant will not buy item'}), 400
+        return jsonify({'success': True, 'paid': paid, 'gold': player.gold})
+    
+    return jsonify({'error': 'Unknown trade action'}), 400
+
+
 @app.route('/api/quests', methods=['GET'])
 def quests_list():
     return jsonify({
@@ -169,18 +635,24 @@ def quests_list():
 
 
 @app.route('/api/reputation', methods=['GET'])
+@with_game_lock
 def get_reputation():
     if not game_state['player']:
         return jsonify({'error': 'No player created'}), 400
     
     player = game_state['player']
-    reps = player.reputation.get_all_reputations()
+    # Decay is lazy: evaluate every faction against the same instant.
+    reps = player.reputation.get_all_reputations(now=time.time())
     
     return jsonify({
         'reputation': {
             faction: {
                 'value': rep,
-                'status': player.reputation.get_faction_status(Faction[faction.upper()])
+                'status': reputation_status(rep),
+                'history': [
+                    {'time': ts, 'change': change, 'value': value}
+                    for ts, change, value in player.reputation.get_history(Faction(faction))
+                ]
             }
             for faction, rep in reps.items()
         }
@@ -188,6 +660,7 @@ def get_reputation():
 
 
 @app.route('/api/homestead', methods=['GET'])
+@with_game_lock
 def homestead_info():
     if not game_state['player']:
         return jsonify({'error': 'No player created'}), 400
@@ -198,15 +671,18 @@ def homestead_info():
     if not home:
         return jsonify({'error': 'No homestead'}), 400
     
+    home.catch_up()
     return jsonify(home.get_info())
 
 
 @app.route('/api/homesteads', methods=['GET'])
+@with_game_lock
 def homesteads_list():
     if not game_state['player']:
         return jsonify({'error': 'No player created'}), 400
     
     player = game_state['player']
+    player.homesteads.catch_up()
     homes = player.homesteads.list_homesteads()
     
     return jsonify({
@@ -215,4 +691,5 @@ def homesteads_list():
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server; see web/asgi.py and web/gunicorn.conf.py for production
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
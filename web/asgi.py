@@ -0,0 +1,195 @@
+"""ASGI entry point for serving many push clients from one process.
+
+Flask views run through a small WSGI bridge on a sized thread pool, so
+synchronous game logic (including world generation on
+/api/player/create) never runs on the event loop and stays serialized by
+``app.game_lock``, while a long-poll such as /api/world/jobs/<id>?wait=30
+only ties up one pool thread. Only /api/stream is served natively: an idle
+push connection is just a parked coroutine, not a thread, so one process
+can hold thousands of them.
+
+    CODEXRPG_ASGI=1 gunicorn -c web/gunicorn.conf.py
+    uvicorn asgi:application --app-dir web --port 5000
+"""
+import asyncio
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import app as flask_app, game_lock, game_state, state_channel, stop_game, STREAM_KEEPALIVE_SECONDS
+
+# Threads that run Flask views (and therefore world generation)
+WORKER_THREADS = int(os.environ.get('CODEXRPG_WORKER_THREADS', '16'))
+# Threads for stream polls, kept apart so slow views cannot starve pushes
+STREAM_THREADS = int(os.environ.get('CODEXRPG_STREAM_THREADS', '4'))
+
+view_executor = ThreadPoolExecutor(WORKER_THREADS, thread_name_prefix='codexrpg-view')
+stream_executor = ThreadPoolExecutor(STREAM_THREADS, thread_name_prefix='codexrpg-stream')
+
+SSE_HEADERS = [
+    (b'content-type', b'text/event-stream'),
+    (b'cache-control', b'no-cache'),
+    (b'x-accel-buffering', b'no'),
+]
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+    elif scope['type'] == 'http' and scope['path'] == '/api/stream' and scope['method'] == 'GET':
+        await stream(scope, receive, send)
+    elif scope['type'] == 'http':
+        await wsgi(scope, receive, send)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            with game_lock:
+                stop_game()
+            view_executor.shutdown(wait=False, cancel_futures=True)
+            stream_executor.shutdown(wait=False, cancel_futures=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+def _environ(scope, body: bytes) -> dict:
+    """PEP 3333 environ for an ASGI http scope."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else 'HTTP_' + name
+        value = value.decode('latin-1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    environ['CONTENT_LENGTH'] = str(len(body))  # the body is already buffered, chunked or not
+    return environ
+
+
+def _run_view(environ):
+    """Call the Flask app and drain its response (on a view thread)."""
+    response = {}
+    chunks = []
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers]
+        return chunks.append
+
+    result = flask_app(environ, start_response)
+    try:
+        chunks.extend(result)
+    finally:
+        close = getattr(result, 'close', None)
+        if close is not None:
+            close()
+    return response['status'], response['headers'], b''.join(chunks)
+
+
+async def wsgi(scope, receive, send):
+    """Run one request through the Flask app on ``view_executor``.
+
+    asgiref's WsgiToAsgi runs every view on one shared thread, so a single
+    slow view or long-poll would stall the whole API; here each request
+    gets its own pool thread.
+    """
+    body = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+        body.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    loop = asyncio.get_running_loop()
+    status, headers, data = await loop.run_in_executor(
+        view_executor, _run_view, _environ(scope, b''.join(body)))
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': data})
+
+
+def _poll(version):
+    # Runs off the loop: poll() may rebuild the snapshot under the game lock
+    return state_channel.poll(version), state_channel.seconds_until_due()
+
+
+async def _json_error(send, status, message):
+    body = json.dumps({'error': message}).encode('utf-8')
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _until_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def stream(scope, receive, send):
+    """Async twin of app.stream(): same frames, no thread per client."""
+    if not game_state['player']:
+        await _json_error(send, 400, 'No player created')
+        return
+    headers = dict(scope['headers'])
+    try:
+        version = int(headers.get(b'last-event-id', b'0'))
+    except ValueError:
+        version = 0
+
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+
+    def listener():
+        loop.call_soon_threadsafe(wake.set)
+
+    state_channel.add_listener(listener)
+    disconnected = asyncio.ensure_future(_until_disconnect(receive))
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': SSE_HEADERS})
+        last_sent = loop.time()
+        while not disconnected.done():
+            wake.clear()
+            frame, due_in = await loop.run_in_executor(stream_executor, _poll, version)
+            if frame is not None:
+                version = frame['version']
+                data = f"id: {version}\ndata: {json.dumps(frame)}\n\n"
+                await send({'type': 'http.response.body', 'body': data.encode('utf-8'), 'more_body': True})
+                last_sent = loop.time()
+                continue
+            keepalive_in = STREAM_KEEPALIVE_SECONDS - (loop.time() - last_sent)
+            woken = asyncio.ensure_future(wake.wait())
+            await asyncio.wait({woken, disconnected}, timeout=max(0.0, min(due_in, keepalive_in)),
+                               return_when=asyncio.FIRST_COMPLETED)
+            woken.cancel()
+            if not disconnected.done() and loop.time() - last_sent >= STREAM_KEEPALIVE_SECONDS:
+                await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+                last_sent = loop.time()
+    except OSError:
+        pass  # client went away mid-send
+    finally:
+        state_channel.remove_listener(listener)
+        disconnected.cancel()
@@ -0,0 +1,28 @@
+"""Production server config: gunicorn -c web/gunicorn.conf.py
+
+Game state lives in process memory, so run a single worker. By default it
+is a threaded WSGI worker serving the Flask app directly: each request,
+push stream or long-poll holds one of ``CODEXRPG_WORKER_THREADS`` threads.
+With ``CODEXRPG_ASGI=1`` the worker is uvicorn running asgi.py instead,
+which serves /api/stream as coroutines so idle push clients cost no thread.
+"""
+import os
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+workers = 1
+bind = os.environ.get("CODEXRPG_BIND", "0.0.0.0:5000")
+
+if os.environ.get("CODEXRPG_ASGI") == "1":
+    wsgi_app = "asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "app:app"
+    worker_class = "gthread"
+    threads = int(os.environ.get("CODEXRPG_WORKER_THREADS", "16"))
+
+graceful_timeout = 10
+keepalive = 75  # seconds an idle HTTP keep-alive socket stays open
+
+accesslog = "-"
+errorlog = "-"
+raw_env = ["PYTHONPATH=" + os.path.join(chdir, "..", "src")]
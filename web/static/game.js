@@ -6,7 +6,17 @@ const API_URL = (typeof window !== 'undefined' && window.location && window.loca
 
 let gameActive = false;
 let currentPlayer = null;
-let canvas, ctx, tileSize = 60, worldGrid = null, animFrame = null;
+let canvas, ctx, tileSize = 60, animFrame = null;
+const MIN_TILE_SIZE = 16;
+const MAX_TILE_SIZE = 60;
+// The map is never downloaded whole: only the window around the viewport is
+// fetched from /api/world/region, at a coarser lod when zoomed out.
+let worldSize = null;  // {width, height} in tiles
+let worldLevels = 0;   // coarsest lod the server has
+let view = null;       // loaded window: {x, y, lod, scale, cols, rows, palette, tiles}
+let viewLoading = false;
+const VIEW_MARGIN = 0.5;  // extra viewport fraction fetched on each side, so small pans need no request
+const VIEW_RETRY_MS = 1000;
 // Camera and player movement
 let camera = { x: 0, y: 0 };
 let playerWorldPos = { x: 0, y: 0 }; // in tile coords (float)
@@ -97,7 +107,8 @@ async function createPlayer() {
             document.getElementById('screen-game').classList.add('active');
             
             // Update UI
-            updatePlayerUI();
+            renderPlayer(currentPlayer);
+            connectStateStream();
             loadNPCs();
             loadQuests();
             loadWorld();
@@ -113,29 +124,32 @@ async function createPlayer() {
 async function updatePlayerUI() {
     try {
         const response = await fetch(`${API_URL}/player/info`);
-        const player = await response.json();
-        currentPlayer = player;
-        
-        // Update display
-        document.getElementById('player-name-display').textContent = player.name;
-        document.getElementById('player-class-display').textContent = player.class;
-        document.getElementById('hp-value').textContent = `${player.hp}/${player.max_hp}`;
-        document.getElementById('hp-bar').style.width = `${(player.hp / player.max_hp) * 100}%`;
-        document.getElementById('gold-value').textContent = player.gold;
-        document.getElementById('damage-value').textContent = player.damage;
-        document.getElementById('defense-value').textContent = player.defense;
-        document.getElementById('inventory-count').textContent = `Items: ${player.inventory_size}`;
-        
-        // Update skills
-        const skillsList = document.getElementById('skills-list');
-        skillsList.innerHTML = player.skills.map(skill => 
-            `<div class="skill-item">⚔ ${skill}</div>`
-        ).join('');
+        renderPlayer(await response.json());
     } catch (error) {
         console.error('Error updating player UI:', error);
     }
 }
 
+function renderPlayer(player) {
+    currentPlayer = player;
+    
+    // Update display
+    document.getElementById('player-name-display').textContent = player.name;
+    document.getElementById('player-class-display').textContent = player.class;
+    document.getElementById('hp-value').textContent = `${player.hp}/${player.max_hp}`;
+    document.getElementById('hp-bar').style.width = `${(player.hp / player.max_hp) * 100}%`;
+    document.getElementById('gold-value').textContent = player.gold;
+    document.getElementById('damage-value').textContent = player.damage;
+    document.getElementById('defense-value').textContent = player.defense;
+    document.getElementById('inventory-count').textContent = `Items: ${player.inventory_size}`;
+    
+    // Update skills
+    const skillsList = document.getElementById('skills-list');
+    skillsList.innerHTML = player.skills.map(skill => 
+        `<div class="skill-item">⚔ ${skill}</div>`
+    ).join('');
+}
+
 // Player action
 async function playerAction(action) {
     try {
@@ -154,8 +168,8 @@ async function playerAction(action) {
             resultBox.style.display = 'block';
             setTimeout(() => { resultBox.style.display = 'none'; }, 3000);
             
-            // Update UI
-            updatePlayerUI();
+            // Update UI (the state stream pushes the change when connected)
+            if (!stateStream) updatePlayerUI();
             
             // Log event if trigger_event
             if (action === 'trigger_event' && data.event) {
@@ -190,11 +204,22 @@ function switchTab(tabName) {
 // Load world
 async function loadWorld() {
     try {
-        const response = await fetch(`${API_URL}/world/info`);
+        // An empty window: just the map size, no tiles
+        const infoUrl = `${API_URL}/world/info?x=0&y=0&w=0&h=0`;
+        let response = await fetch(infoUrl);
+        // 202: still generating in the background; long-poll the job until done
+        while (response.status === 202) {
+            const pending = await response.json();
+            const job = await (await fetch(`${API_URL}/world/jobs/${pending.job.id}?wait=10`)).json();
+            if (job.status === 'failed') throw new Error(job.error);
+            response = await fetch(infoUrl);
+        }
         const world = await response.json();
 
-        // initialize canvas on first load
-        worldGrid = world.grid;
+        // initialize canvas on first load; tiles arrive with the first draw
+        worldSize = { width: world.width, height: world.height };
+        worldLevels = 0;
+        view = null;
         initWorldCanvas();
         drawWorldCanvas();
     } catch (error) {
@@ -207,11 +232,10 @@ function initWorldCanvas() {
     if (!canvas) return;
     ctx = canvas.getContext('2d');
 
-    // compute tile size based on canvas size and grid
-    const rows = worldGrid.length;
-    const cols = worldGrid[0].length;
-    const size = Math.min(Math.floor(canvas.width / cols), Math.floor(canvas.height / rows));
-    tileSize = size;
+    // compute tile size based on canvas size and map size
+    // big maps scroll instead of shrinking tiles below MIN_TILE_SIZE (the wheel zooms out further)
+    const size = Math.min(Math.floor(canvas.width / worldSize.width), Math.floor(canvas.height / worldSize.height));
+    tileSize = Math.min(MAX_TILE_SIZE, Math.max(MIN_TILE_SIZE, size));
 
     // text style for NPC labels
     ctx.font = '12px sans-serif';
@@ -221,11 +245,12 @@ function initWorldCanvas() {
 
     // Attach input handlers
     canvas.addEventListener('click', onCanvasClick);
+    canvas.addEventListener('wheel', onCanvasWheel, { passive: false });
     window.addEventListener('keydown', onKeyDown);
 
     // initialize player world pos at center
-    playerWorldPos.x = Math.floor(worldGrid[0].length / 2);
-    playerWorldPos.y = Math.floor(worldGrid.length / 2);
+    playerWorldPos.x = Math.floor(worldSize.width / 2);
+    playerWorldPos.y = Math.floor(worldSize.height / 2);
 
     // center camera on player
     camera.x = playerWorldPos.x * tileSize - canvas.width/2 + tileSize/2;
@@ -241,22 +266,104 @@ function initWorldCanvas() {
     try { document.getElementById('sound-volume').value = soundVolume; } catch(e){}
 }
 
+// Tiles inside the viewport, clipped to the map
+function visibleTiles() {
+    return {
+        x0: Math.max(0, Math.floor(camera.x / tileSize)),
+        y0: Math.max(0, Math.floor(camera.y / tileSize)),
+        x1: Math.min(worldSize.width, Math.ceil((camera.x + canvas.width) / tileSize)),
+        y1: Math.min(worldSize.height, Math.ceil((camera.y + canvas.height) / tileSize))
+    };
+}
+
+// Coarsest level whose cells still draw at least MIN_TILE_SIZE pixels wide
+function lodForTileSize(size) {
+    let lod = 0;
+    while (lod < worldLevels && size * (1 << (lod + 1)) <= MIN_TILE_SIZE) lod++;
+    return lod;
+}
+
+// Fetch a new window when the loaded one no longer covers the viewport at the wanted lod.
+// The old window keeps being drawn until the new one arrives.
+function ensureViewLoaded() {
+    if (viewLoading || !worldSize) return;
+    const lod = lodForTileSize(tileSize);
+    const vis = visibleTiles();
+    if (view && view.lod === lod && vis.x0 >= view.x && vis.y0 >= view.y &&
+        vis.x1 <= view.x + view.cols * view.scale && vis.y1 <= view.y + view.rows * view.scale) return;
+    const mx = Math.ceil((vis.x1 - vis.x0) * VIEW_MARGIN);
+    const my = Math.ceil((vis.y1 - vis.y0) * VIEW_MARGIN);
+    const w = vis.x1 - vis.x0 + 2 * mx;
+    const h = vis.y1 - vis.y0 + 2 * my;
+    viewLoading = true;
+    fetch(`${API_URL}/world/region?x=${vis.x0 - mx}&y=${vis.y0 - my}&w=${w}&h=${h}&lod=${lod}`)
+        .then(response => {
+            if (!response.ok) throw new Error(`region request failed (${response.status})`);
+            return response.json();
+        })
+        .then(data => {
+            worldLevels = data.levels;
+            view = {
+                x: data.x, y: data.y, lod: data.lod, scale: data.scale,
+                rows: data.tiles.length, cols: data.tiles.length ? data.tiles[0].length : 0,
+                palette: data.palette, tiles: data.tiles
+            };
+            viewLoading = false;
+        })
+        .catch(error => {
+            console.error('Error loading map window:', error);
+            setTimeout(() => { viewLoading = false; }, VIEW_RETRY_MS);
+        });
+}
+
+// Biome at a tile from the loaded window (a coarse cell's majority when zoomed out); null if not loaded
+function tileAt(x, y) {
+    if (!view) return null;
+    const c = Math.floor((x - view.x) / view.scale);
+    const r = Math.floor((y - view.y) / view.scale);
+    if (r < 0 || r >= view.rows || c < 0 || c >= view.cols) return null;
+    return view.palette[view.tiles[r][c]];
+}
+
+function onCanvasWheel(ev) {
+    if (!worldSize) return;
+    ev.preventDefault();
+    // zoom out as far as the whole map fitting the canvas, in as far as MAX_TILE_SIZE
+    const fit = Math.min(canvas.width / worldSize.width, canvas.height / worldSize.height);
+    const minSize = Math.min(MIN_TILE_SIZE, fit);
+    const size = Math.max(minSize, Math.min(MAX_TILE_SIZE, tileSize * (ev.deltaY < 0 ? 1.25 : 0.8)));
+    // keep the point at the centre of the canvas fixed
+    const cx = camera.x + canvas.width / 2;
+    const cy = camera.y + canvas.height / 2;
+    camera.x = cx * size / tileSize - canvas.width / 2;
+    camera.y = cy * size / tileSize - canvas.height / 2;
+    tileSize = size;
+}
+
 function drawWorldCanvas() {
-    if (!ctx || !worldGrid) return;
-    const rows = worldGrid.length;
-    const cols = worldGrid[0].length;
+    if (!ctx || !worldSize) return;
 
     // clear and draw parallax background
     ctx.clearRect(0,0,canvas.width,canvas.height);
     drawParallaxBackground();
 
-    // draw tiles relative to camera
-    for (let r=0; r<rows; r++) {
-        for (let c=0; c<cols; c++) {
-            const biome = worldGrid[r][c];
-            const x = c * tileSize - camera.x;
-            const y = r * tileSize - camera.y;
-            drawTile(biome, x, y, tileSize);
+    // draw only the cells of the loaded window inside the viewport, relative to camera
+    ensureViewLoaded();
+    if (view) {
+        const s = view.scale;
+        const cell = tileSize * s;
+        const vis = visibleTiles();
+        const c0 = Math.max(0, Math.floor((vis.x0 - view.x) / s));
+        const r0 = Math.max(0, Math.floor((vis.y0 - view.y) / s));
+        const c1 = Math.min(view.cols, Math.ceil((vis.x1 - view.x) / s));
+        const r1 = Math.min(view.rows, Math.ceil((vis.y1 - view.y) / s));
+        for (let r=r0; r<r1; r++) {
+            for (let c=c0; c<c1; c++) {
+                const biome = view.palette[view.tiles[r][c]];
+                const x = (view.x + c * s) * tileSize - camera.x;
+                const y = (view.y + r * s) * tileSize - camera.y;
+                drawTile(biome, x, y, cell);
+            }
         }
     }
 
@@ -322,6 +429,17 @@ function drawParallaxBackground() {
     }
 }
 
+// Gradient stops for the biomes of climate worlds (flat colours in minimap.py)
+const CLIMATE_TILE_COLORS = {
+    snow: ['#f7fafc', '#d9e2e8'],
+    tundra: ['#bcc6ad', '#96a087'],
+    taiga: ['#3d7360', '#214836'],
+    swamp: ['#5d7248', '#394a2c'],
+    desert: ['#f0dba0', '#d6bb74'],
+    savanna: ['#d8d07e', '#b8b056'],
+    rainforest: ['#137a3a', '#053f1c'],
+};
+
 function drawTile(biome, x, y, size) {
     // Modern stylized tiles with gradient and soft shading
     const pad = 1;
@@ -343,13 +461,26 @@ function drawTile(biome, x, y, size) {
             // peak highlight
             ctx.fillStyle = '#cfd6dc'; ctx.beginPath(); ctx.moveTo(gx+gs*0.15, gy+gs*0.78); ctx.lineTo(gx+gs*0.5, gy+gs*0.12); ctx.lineTo(gx+gs*0.85, gy+gs*0.78); ctx.closePath(); ctx.fill();
             break; }
-        case 'lake': {
+        case 'lake':
+        case 'water': {
             const g = ctx.createLinearGradient(gx, gy, gx, gy+gs);
             g.addColorStop(0, '#0b3b66'); g.addColorStop(1, '#063052');
             ctx.fillStyle = g; ctx.fillRect(gx, gy, gs, gs);
             // inner shimmer
             ctx.fillStyle = 'rgba(255,255,255,0.06)'; ctx.fillRect(gx+gs*0.08, gy+gs*0.12, gs*0.84, gs*0.6);
             break; }
+        case 'snow':
+        case 'tundra':
+        case 'taiga':
+        case 'swamp':
+        case 'desert':
+        case 'savanna':
+        case 'rainforest': {
+            const [top, bottom] = CLIMATE_TILE_COLORS[biome];
+            const g = ctx.createLinearGradient(gx, gy, gx, gy+gs);
+            g.addColorStop(0, top); g.addColorStop(1, bottom);
+            ctx.fillStyle = g; ctx.fillRect(gx, gy, gs, gs);
+            break; }
         default: {
             const g = ctx.createLinearGradient(gx, gy, gx, gy+gs);
             g.addColorStop(0, '#b9e6a3'); g.addColorStop(1, '#73c058');
@@ -544,8 +675,8 @@ function onKeyDown(ev) {
     if (key === 'd' || key === 'arrowright') nx += 1;
     if (nx !== Math.round(playerWorldPos.x) || ny !== Math.round(playerWorldPos.y)) {
         // clamp
-        nx = Math.max(0, Math.min(worldGrid[0].length-1, nx));
-        ny = Math.max(0, Math.min(worldGrid.length-1, ny));
+        nx = Math.max(0, Math.min(worldSize.width-1, nx));
+        ny = Math.max(0, Math.min(worldSize.height-1, ny));
         playerTarget = { x: nx, y: ny };
     }
 }
@@ -729,10 +860,10 @@ function generateSineWavBase64(freq=440, duration=0.1, sampleRate=44100) {
     return btoa(binary);
 }
 
-// Simple A* pathfinding on tile grid (4-directional)
+// Simple A* pathfinding on tile grid (4-directional), within the loaded window
 function findPath(start, goal) {
-    if (!worldGrid) return null;
-    const rows = worldGrid.length; const cols = worldGrid[0].length;
+    if (!worldSize) return null;
+    const rows = worldSize.height; const cols = worldSize.width;
     function inBounds(p){ return p.x >=0 && p.x < cols && p.y >=0 && p.y < rows; }
     function key(p){ return p.x + ',' + p.y; }
 
@@ -791,9 +922,9 @@ function findPath(start, goal) {
         for (const o of offs) {
             const np = { x: p.x + o.x, y: p.y + o.y };
             if (!inBounds(np)) continue;
-            // terrain passability: block lakes and mountains
-            const biome = worldGrid[np.y][np.x];
-            if (biome === 'lake' || biome === 'mountain') continue;
+            // terrain passability: block lakes and mountains, and tiles not loaded yet
+            const biome = tileAt(np.x, np.y);
+            if (biome === null || biome === 'lake' || biome === 'water' || biome === 'mountain') continue;
             out.push(np);
         }
         return out;
@@ -803,8 +934,8 @@ function findPath(start, goal) {
 }
 
 function pickNearbyTile(cx, cy, radius) {
-    if (!worldGrid) return null;
-    const rows = worldGrid.length; const cols = worldGrid[0].length;
+    if (!worldSize) return null;
+    const rows = worldSize.height; const cols = worldSize.width;
     for (let attempt=0; attempt<12; attempt++) {
         const rx = Math.max(0, Math.min(cols-1, cx + Math.floor((Math.random()*2*radius)-radius)));
         const ry = Math.max(0, Math.min(rows-1, cy + Math.floor((Math.random()*2*radius)-radius)));
@@ -890,13 +1021,13 @@ async function loadNPCs() {
             `;
             npcsList.appendChild(npcCard);
         });
-            // populate in-world NPCs with positions (near center)
+            // populate in-world NPCs at their server tile (near center if unplaced)
             npcs = data.npcs.map((n, idx) => ({
             id: n.id || idx,
             name: n.name,
             role: n.role,
-            x: Math.floor(worldGrid[0].length/2 + (idx%3) - 1),
-            y: Math.floor(worldGrid.length/2 + Math.floor(idx/3) - 1)
+            x: n.position ? n.position[0] : Math.floor(worldSize.width/2 + (idx%3) - 1),
+            y: n.position ? n.position[1] : Math.floor(worldSize.height/2 + Math.floor(idx/3) - 1)
         }));
             // clear paths
             npcs.forEach(n => { n.path = null; n.pathIndex = 0; });
@@ -1015,6 +1146,7 @@ function resetGame() {
     if (confirm('Create a new character? (Current progress will be lost)')) {
         gameActive = false;
         currentPlayer = null;
+        disconnectStateStream();
         
         // Reset form
         document.getElementById('player-name').value = 'Adventurer';
@@ -1028,9 +1160,34 @@ function resetGame() {
     }
 }
 
-// Periodically update player info
-setInterval(() => {
-    if (gameActive) {
-        updatePlayerUI();
+// Server push: the server sends a frame only when player state changes.
+// Browsers without EventSource fall back to the old 5 second poll.
+let stateStream = null;
+let pollTimer = null;
+
+function connectStateStream() {
+    if (stateStream || pollTimer) return;
+    if (typeof EventSource === 'undefined') {
+        pollTimer = setInterval(() => {
+            if (gameActive) updatePlayerUI();
+        }, 5000);
+        return;
     }
-}, 5000);
+    stateStream = new EventSource(`${API_URL}/stream`);
+    stateStream.onmessage = (event) => {
+        const frame = JSON.parse(event.data);
+        if (frame.state) {
+            renderPlayer(frame.state);
+        } else if (frame.diff && currentPlayer) {
+            renderPlayer({ ...currentPlayer, ...frame.diff });
+        }
+    };
+    // EventSource reconnects by itself and resumes from the last frame id
+}
+
+function disconnectStateStream() {
+    if (stateStream) stateStream.close();
+    if (pollTimer) clearInterval(pollTimer);
+    stateStream = null;
+    pollTimer = null;
+}
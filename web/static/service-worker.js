@@ -41,6 +41,11 @@ self.addEventListener('fetch', event => {
     return;
   }
 
+  // Event stream is long-lived: never proxy or cache it
+  if (request.url.includes('/api/stream')) {
+    return;
+  }
+
   // API calls: Always try network
   if (request.url.includes('/api/')) {
     event.respondWith(